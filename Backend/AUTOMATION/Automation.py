@@ -5,7 +5,7 @@ from pywhatkit import search, playonyt # Import functions for Google search and
 from dotenv import dotenv_values # Import dotenv_values to manage environment variables.
 from bs4 import BeautifulSoup # Import BeautifulSoup for parsing HTML content.
 from rich import print # Import rich print for enhanced console output.
-from groq import Groq # Import Groq for AI chat functionality.
+from Backend.CLIENTS.ClientRegistry import GroqClient, RequestsSession, ApiTimeout # Import the shared, pooled HTTP clients.
 import webbrowser # Import webbrowser for opening URLs.
 import subprocess # Import subprocess for interacting with the system.
 import requests # Import requests for making HTTP requests.
@@ -15,7 +15,9 @@ import os # Import os for operating system interactions.
 from pathlib import Path # Import Path to resolve project root reliably.
 import json
 import re # Import re for normalizing/cleaning commands
-from Backend.TEXT_TO_SPEECH.TextToSpeech import TextToSpeech
+from Backend.TEXT_TO_SPEECH.TextToSpeech import Speak # Import the non-blocking speech queue.
+from .LinkIndex import Links # Import the precompiled site-name index.
+from .Scheduler import PlanCommands, RunPlan # Import the concurrent command scheduler.
 from .utils import extract_title_from_command
 import pyautogui  # For hover/mouse move without clicking
 
@@ -44,8 +46,8 @@ classes = ["zCubwf", "hgKElc", "LTKOO sY7ric", "Z0LcW", "gsrt vk_bk FzvWSb YwPhn
 # Define a user-agent for making web requests.
 useragent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.75 Safari/537.36'
 
-# Initialize the Groq client with the API key.
-client = Groq(api_key=GroqAPIKey)
+# Get the shared Groq client (pooled keep-alive connections) for the API key.
+client = GroqClient(GroqAPIKey)
 
 # Predefined professional responses for user interactions.
 professional_responses = [
@@ -53,6 +55,32 @@ professional_responses = [
     "I'm at your service for any additional questions or support you many need-don't hesitate to ask.",
 ]
 
+# Fixed phrases spoken by the automation handlers; pre-synthesized at startup (see TextToSpeech.PrewarmSpeech).
+SpokenPhrases = [
+    "Screen monitor activated",
+    "Screen monitor testing disabled and deactivated",
+    "Screen monitor testing enabled",
+    "Screen monitor debug enabled",
+    "Screen monitor testing disabled",
+    "Screen monitor debug disabled",
+    "Screen monitor is not running",
+    "Please say the title to focus",
+    "Cannot locate that title to focus",
+    "Home",
+    "Home not found",
+    "History opened",
+    "History not found",
+    "Opening Watch later",
+    "Watch later not found",
+    "Please say the video title to add to Watch later",
+    "Cannot locate that video title",
+    "Added to Watch later",
+    "Watch later option not found",
+    "Save button not visible yet",
+    "Screen-monitor: command not recognized",
+    "Command not recognized",
+]
+
 # List to store chatbot messages.
 messages = []
 
@@ -129,208 +157,14 @@ def PlayYouTube(query):
     return True # Indicate success.
 
 # Function to open an application or a relevant webpage.
-def OpenApp(app, sess=requests.session()):
-    
-    # Quick direct-URL handling for popular sites to avoid search result pages
-    app_key = app.strip().lower()
-    website_keywords = {
-        "instagram": "https://www.instagram.com/",
-        "instagram.com": "https://www.instagram.com/",
-        "insta": "https://www.instagram.com/",
-        "facebook": "https://www.facebook.com/",
-        "facebook.com": "https://www.facebook.com/",
-        "fb": "https://www.facebook.com/",
-        "youtube": "https://www.youtube.com/",
-        "youtube.com": "https://www.youtube.com/",
-        "yt": "https://www.youtube.com/",
-        "google": "https://www.google.com/",
-        "google.com": "https://www.google.com/",
-        "g": "https://www.google.com/",
-        "gmail": "https://mail.google.com/",
-        "gmail.com": "https://mail.google.com/",
-        "mail": "https://mail.google.com/",
-        "whatsapp": "https://web.whatsapp.com/",
-        "whatsapp.com": "https://web.whatsapp.com/",
-        "wh": "https://web.whatsapp.com/",
-        "twitter": "https://twitter.com/",
-        "twitter.com": "https://twitter.com/",
-        "tw": "https://twitter.com/",
-        "linkedin": "https://www.linkedin.com/",
-        "linkedin.com": "https://www.linkedin.com/",
-        "ln": "https://www.linkedin.com/",
-        "telegram": "https://web.telegram.org/",
-        "telegram.com": "https://web.telegram.org/",
-        "tg": "https://web.telegram.org/",
-        "snapchat": "https://www.snapchat.com/",
-        "snapchat.com": "https://www.snapchat.com/",
-        "snap": "https://www.snapchat.com/",
-        "github": "https://github.com/",
-        "github.com": "https://github.com/",
-        "git": "https://github.com/",
-        "cohere": "https://cohere.com/",
-        "cohere.com": "https://cohere.com/",
-        "co": "https://cohere.com/",
-        "chatgpt": "https://chat.openai.com/",
-        "chatgpt.com": "https://chat.openai.com/",
-        "aisaver": "https://aisaver.com/",
-        "aisaver.com": "https://aisaver.com/",
-        "magichour": "https://magichour.com/",
-        "magichour.com": "https://magichour.com/",
-        'google': 'https://www.google.com',
-        'youtube': 'https://www.youtube.com',
-        'facebook': 'https://www.facebook.com',
-        'twitter': 'https://www.twitter.com',
-        'instagram': 'https://www.instagram.com',
-        'linkedin': 'https://www.linkedin.com',
-        'github': 'https://www.github.com',
-        'stackoverflow': 'https://stackoverflow.com',
-        'reddit': 'https://www.reddit.com',
-        'wikipedia': 'https://www.wikipedia.org',
-        'quora': 'https://www.quora.com',
-        'amazon': 'https://www.amazon.com',
-        'flipkart': 'https://www.flipkart.com',
-        'snapdeal': 'https://www.snapdeal.com',
-        'myntra': 'https://www.myntra.com',
-        'udemy': 'https://www.udemy.com',
-        'coursera': 'https://www.coursera.org',
-        'edx': 'https://www.edx.org',
-        'khanacademy': 'https://www.khanacademy.org',
-        'medium': 'https://medium.com',
-        'netflix': 'https://www.netflix.com',
-        'hotstar': 'https://www.hotstar.com',
-        'primevideo': 'https://www.primevideo.com',
-        'zomato': 'https://www.zomato.com',
-        'swiggy': 'https://www.swiggy.com',
-        'canva': 'https://www.canva.com',
-        'notion': 'https://www.notion.so',
-        'gmail': 'https://mail.google.com',
-        'yahoo': 'https://www.yahoo.com',
-        'duckduckgo': 'https://www.duckduckgo.com',
-        'bing': 'https://www.bing.com',
-        'zoho': 'https://www.zoho.com',
-        'pixabay': 'https://www.pixabay.com',
-        'pexels': 'https://www.pexels.com',
-        'unsplash': 'https://www.unsplash.com',
-        'wordpress': 'https://www.wordpress.com',
-        'blogger': 'https://www.blogger.com',
-        'tumblr': 'https://www.tumblr.com',
-        'trello': 'https://www.trello.com',
-        'dropbox': 'https://www.dropbox.com',
-        'drive': 'https://drive.google.com',
-        'skype': 'https://www.skype.com',
-        'zoom': 'https://zoom.us',
-        'meet': 'https://meet.google.com',
-        'figma': 'https://www.figma.com',
-        'codepen': 'https://codepen.io',
-        'replit': 'https://replit.com',
-        'w3schools': 'https://www.w3schools.com',
-        'geeksforgeeks': 'https://www.geeksforgeeks.org',
-        'tutorialspoint': 'https://www.tutorialspoint.com',
-        'udacity': 'https://www.udacity.com',
-        'futurelearn': 'https://www.futurelearn.com',
-        'javatpoint': 'https://www.javatpoint.com',
-        'crunchyroll': 'https://www.crunchyroll.com',
-        'openai': 'https://www.openai.com',
-        'codeacademy': 'https://www.codecademy.com',
-        'freecodecamp': 'https://www.freecodecamp.org',
-        'codeforces': 'https://codeforces.com',
-        'atcoder': 'https://atcoder.jp',
-        'leetcode': 'https://leetcode.com',
-        'hackerank': 'https://www.hackerrank.com',
-        'hackernews': 'https://news.ycombinator.com',
-        'producthunt': 'https://www.producthunt.com',
-        'techcrunch': 'https://techcrunch.com',
-        'thenextweb': 'https://thenextweb.com',
-        'wired': 'https://www.wired.com',
-        'cnn': 'https://www.cnn.com',
-        'bbc': 'https://www.bbc.com',
-        'ndtv': 'https://www.ndtv.com',
-        'indiatimes': 'https://www.indiatimes.com',
-        'moneycontrol': 'https://www.moneycontrol.com',
-        'groww': 'https://www.groww.in',
-        'zerodha': 'https://www.zerodha.com',
-        'coinmarketcap': 'https://coinmarketcap.com',
-        'tradingview': 'https://www.tradingview.com',
-        'spotify': 'https://www.spotify.com',
-        'soundcloud': 'https://soundcloud.com',
-        'gaana': 'https://gaana.com',
-        'wynk': 'https://wynk.in',
-        'jiosaavn': 'https://www.jiosaavn.com',
-        'telegram': 'https://web.telegram.org',
-        'whatsapp': 'https://web.whatsapp.com',
-        'discord': 'https://discord.com',
-        'tiktok': 'https://www.tiktok.com',
-        'snapchat': 'https://www.snapchat.com',
-        'glassdoor': 'https://www.glassdoor.com',
-        'naukri': 'https://www.naukri.com',
-        'indeed': 'https://www.indeed.com',
-        'monster': 'https://www.monster.com',
-        'internshala': 'https://internshala.com',
-        'timesjobs': 'https://www.timesjobs.com',
-        'freelancer': 'https://www.freelancer.com',
-        'fiverr': 'https://www.fiverr.com',
-        'upwork': 'https://www.upwork.com',
-        'behance': 'https://www.behance.net',
-        'dribbble': 'https://dribbble.com',
-        'envato': 'https://www.envato.com',
-        'themeforest': 'https://themeforest.net',
-        'githubpages': 'https://pages.github.com',
-        'netlify': 'https://www.netlify.com',
-        'vercel': 'https://vercel.com',
-        'cloudflare': 'https://www.cloudflare.com',
-        'aws': 'https://aws.amazon.com',
-        'azure': 'https://azure.microsoft.com',
-        'gcp': 'https://cloud.google.com',
-    }
-
-    # Merge with user-defined links from Data/WebLinks.json (non-breaking)
-    try:
-        data_dir = PROJECT_ROOT / "Data"
-        data_dir.mkdir(parents=True, exist_ok=True)
-        wl_path = data_dir / "WebLinks.json"
-        user_links = []
-        if wl_path.exists():
-            try:
-                with open(wl_path, 'r', encoding='utf-8') as f:
-                    user_links = json.load(f) or []
-                    if not isinstance(user_links, list):
-                        user_links = []
-            except Exception:
-                user_links = []
-        # If file missing or empty, seed from defaults (use simple names only)
-        if not user_links:
-            seed = []
-            seen = set()
-            for k, u in website_keywords.items():
-                # avoid duplicating dot-variants and duplicates
-                if '.' in k:
-                    continue
-                if k in seen:
-                    continue
-                seen.add(k)
-                seed.append({'name': k, 'url': u})
-            try:
-                with open(wl_path, 'w', encoding='utf-8') as f:
-                    json.dump(seed, f, ensure_ascii=False, indent=2)
-            except Exception:
-                pass
-            user_links = seed
-        # Merge user-defined names, overriding defaults if same key
-        for item in user_links:
-            try:
-                name = str(item.get('name', '')).strip().lower()
-                url  = str(item.get('url', '')).strip()
-                if name and (url.startswith('http://') or url.startswith('https://')):
-                    website_keywords[name] = url
-            except Exception:
-                continue
-    except Exception:
-        pass
-    for kw, url in website_keywords.items():
-        if kw in app_key:
-            webopen(url)
-            return True
+def OpenApp(app, sess=RequestsSession()):
     
+    # Quick direct-URL handling for popular sites (and Data/WebLinks.json) to avoid search result pages
+    url = Links.resolve(app)
+    if url:
+        webopen(url)
+        return True
+
     try:
         appopen(app, match_closest=False, output=True, throw_error=True) # Attempt to open the application without nearest-match.
         return True # Indicate success.
@@ -364,7 +198,7 @@ def OpenApp(app, sess=requests.session()):
         def search_google(query):
             url = f"https://www.google.com/search?q={query.replace(' ', '+')}" # Construct the Google search URL with URL-encoded spaces.
             headers = { "User-Agent" :useragent}
-            response = sess.get(url, headers=headers)
+            response = sess.get(url, headers=headers, timeout=ApiTimeout)
 
             if response.status_code == 200:
                 return response.text
@@ -424,464 +258,423 @@ def System(command):
 
     return True
 
-# Asynchronous function to translate and execute user commands.
-async def TranslateAndExecute(commands: list[str]):
+# Asynchronous function to execute a single automation command; returns the handler's result.
+async def ExecuteCommand(command: str):
 
-    funcs = [] # List to store asynchronous tasks.
-    
-    for command in commands:
-        handled = False
-        # Normalize the command to be more tolerant: lowercase and strip punctuation
-        if command.lower().startswith("automation "):
-            command = command[len("automation "):].strip()
+    # Normalize the command to be more tolerant: lowercase and strip punctuation
+    if command.lower().startswith("automation "):
+        command = command[len("automation "):].strip()
 
-        norm = re.sub(r"[^a-z0-9 ]+", "", command.lower())
-        try:
-            print(f"[Automation] Received command: '{command}' | norm='{norm}'")
-        except Exception:
-            pass
-
-        # (Removed early URL-opening navigation handler per user request)
-
-        # Early handling for 'open ...' to avoid being swallowed by screen-monitor block
-        if norm.startswith("open "):
-            # If screen monitor is running, prefer clicking an on-screen title match (e.g., YouTube video)
-            mon_try = get_screen_monitor()
-            query = command.removeprefix("open ").strip()
-            if mon_try and mon_try.running and query:
-                # Build prioritized short variants to avoid matching huge OCR lines
-                stop = {"the","a","an","to","and","or","of","on","for","with","your","my","in","at","by"}
-                q_trim = query.rstrip(" .!?\t\n")
-                q_clean = re.sub(r"[^a-z0-9 ]+", " ", q_trim.lower()).strip()
-                tokens = [t for t in q_clean.split() if t and t not in stop]
-                variants = []
-                for n in (6,5,4,3):
-                    if tokens:
-                        v = " ".join(tokens[:n])
-                        if v and v not in variants:
-                            variants.append(v)
-                # Also try original trim and clean at the end
-                for v in (q_trim, q_clean):
+    norm = re.sub(r"[^a-z0-9 ]+", "", command.lower())
+    try:
+        print(f"[Automation] Received command: '{command}' | norm='{norm}'")
+    except Exception:
+        pass
+
+    # (Removed early URL-opening navigation handler per user request)
+
+    # Background actions that do not touch the screen monitor.
+    if command.startswith("close "):
+        return await asyncio.to_thread(CloseApp, command.removeprefix("close "))
+    if command.startswith("play "):
+        return await asyncio.to_thread(PlayYouTube, command.removeprefix("play "))
+    if command.startswith("content "):
+        return await asyncio.to_thread(Content, command.removeprefix("content "))
+    if command.startswith("google search "):
+        return await asyncio.to_thread(GoogleSearch, command.removeprefix("google search "))
+    if command.startswith("youtube search "):
+        return await asyncio.to_thread(YouTubeSearch, command.removeprefix("youtube search "))
+    if command.startswith("system "):
+        return await asyncio.to_thread(System, command.removeprefix("system "))
+
+    # Early handling for 'open ...' to avoid being swallowed by screen-monitor block
+    if norm.startswith("open "):
+        # If screen monitor is running, prefer clicking an on-screen title match (e.g., YouTube video)
+        mon_try = get_screen_monitor()
+        query = command.removeprefix("open ").strip()
+        if mon_try and mon_try.running and query:
+            # Build prioritized short variants to avoid matching huge OCR lines
+            stop = {"the","a","an","to","and","or","of","on","for","with","your","my","in","at","by"}
+            q_trim = query.rstrip(" .!?\t\n")
+            q_clean = re.sub(r"[^a-z0-9 ]+", " ", q_trim.lower()).strip()
+            tokens = [t for t in q_clean.split() if t and t not in stop]
+            variants = []
+            for n in (6,5,4,3):
+                if tokens:
+                    v = " ".join(tokens[:n])
                     if v and v not in variants:
                         variants.append(v)
-                box = None
-                used = ""
-                # Get screen size for location heuristics
-                try:
-                    sw, sh = pyautogui.size()
-                except Exception:
-                    sw, sh = (1920, 1080)
-                for v in variants:
-                    candidate = mon_try.find_text(v)
-                    if not candidate:
-                        continue
-                    cx, cy = candidate.get('x'), candidate.get('y')
-                    # Heuristics: avoid top nav (y<120), avoid extreme edges (x<100 or x>sw-120)
-                    if cy is not None and cx is not None and cy >= 120 and 100 <= cx <= max(100, sw-120):
-                        box = candidate
-                        used = v
-                        break
-                if box:
-                    try:
-                        print(f"[Automation][Open] Clicking on-screen match for '{used}' (from '{query}') at ({box['x']},{box['y']})")
-                    except Exception:
-                        pass
-                    mon_try.click_at(box['x'], box['y'])
-                    handled = True
+            # Also try original trim and clean at the end
+            for v in (q_trim, q_clean):
+                if v and v not in variants:
+                    variants.append(v)
+            box = None
+            used = ""
+            # Get screen size for location heuristics
+            try:
+                sw, sh = pyautogui.size()
+            except Exception:
+                sw, sh = (1920, 1080)
+            for v in variants:
+                candidate = mon_try.find_text(v, zone="content")
+                if not candidate:
                     continue
-            # Otherwise, fallback to original OpenApp behavior
-            if "open it" in norm or norm == "open file":
-                handled = True
-                continue
-            funcs.append(asyncio.to_thread(OpenApp, command.removeprefix("open ")))
-            handled = True
-            continue
-
-        # Screen monitor toggles
-        if "screen monitor on" in norm:
-            start_screen_monitor()
-            await asyncio.to_thread(TextToSpeech, "Screen monitor activated")
-            handled = True
-            continue
-
-        if (
-            "screen monitor off" in norm or
-            "screen monitor of" in norm or
-            "screen monitor testing off" in norm or
-            "screen monitor testing of" in norm or
-            "exit screen monitor" in norm
-        ):
-            mon = get_screen_monitor()
-            if mon:
+                cx, cy = candidate.get('x'), candidate.get('y')
+                # Heuristics: avoid top nav (y<120), avoid extreme edges (x<100 or x>sw-120)
+                if cy is not None and cx is not None and cy >= 120 and 100 <= cx <= max(100, sw-120):
+                    box = candidate
+                    used = v
+                    break
+            if box:
                 try:
-                    mon.set_debug(False)
+                    print(f"[Automation][Open] Clicking on-screen match for '{used}' (from '{query}') at ({box['x']},{box['y']})")
                 except Exception:
                     pass
-            stop_screen_monitor()
-            await asyncio.to_thread(TextToSpeech, "Screen monitor testing disabled and deactivated")
-            handled = True
-            continue
-
-        if "screen monitor debug on" in norm or "screen monitor testing on" in norm:
-            mon = get_screen_monitor()
-            if mon:
-                mon.set_debug(True)
-                await asyncio.to_thread(TextToSpeech, "Screen monitor testing enabled" if "testing on" in norm else "Screen monitor debug enabled")
-            else:
-                await asyncio.to_thread(TextToSpeech, "Screen monitor is not running")
-            handled = True
-            continue
-
-        if (
-            "screen monitor debug off" in norm or
-            "screen monitor testing off" in norm or
-            "screen monitor debug of" in norm or
-            "screen monitor testing of" in norm
-        ):
-            mon = get_screen_monitor()
-            if mon:
+                mon_try.click_at(box['x'], box['y'])
+                return True
+        # Otherwise, fallback to original OpenApp behavior
+        if "open it" in norm or norm == "open file":
+            return True
+        return await asyncio.to_thread(OpenApp, command.removeprefix("open "))
+
+    # Screen monitor toggles
+    if "screen monitor on" in norm:
+        start_screen_monitor()
+        Speak("Screen monitor activated")
+        return True
+
+    if (
+        "screen monitor off" in norm or
+        "screen monitor of" in norm or
+        "screen monitor testing off" in norm or
+        "screen monitor testing of" in norm or
+        "exit screen monitor" in norm
+    ):
+        mon = get_screen_monitor()
+        if mon:
+            try:
                 mon.set_debug(False)
-                await asyncio.to_thread(TextToSpeech, "Screen monitor testing disabled" if "testing off" in norm else "Screen monitor debug disabled")
-            else:
-                await asyncio.to_thread(TextToSpeech, "Screen monitor is not running")
-            handled = True
-            continue
-
-        # On-screen actions (monitor must be running)
-        monitor = get_screen_monitor()
-        if monitor and monitor.running:
-
-            def _find_title_box(raw_title: str):
-                t = (raw_title or "").strip()
-                t_trim = t.rstrip(" .!?\t\n")
-                t_clean = re.sub(r"[^a-z0-9 ]+", " ", t_trim.lower()).strip()
-                stop = {"the","a","an","to","and","or","of","on","for","with","your","my","in","at","by"}
-                tokens = [tok for tok in (t_clean.split() if t_clean else []) if tok and tok not in stop]
-                variants: list[str] = []
-                # Prefer short, distinctive heads first
-                for n in (6,5,4,3):
-                    if tokens:
-                        v = " ".join(tokens[:n])
-                        if v and v not in variants:
-                            variants.append(v)
-                # Then try original raw/trim/clean
-                for v in (t, t_trim, t_clean):
+            except Exception:
+                pass
+        stop_screen_monitor()
+        Speak("Screen monitor testing disabled and deactivated")
+        return True
+
+    if "screen monitor debug on" in norm or "screen monitor testing on" in norm:
+        mon = get_screen_monitor()
+        if mon:
+            mon.set_debug(True)
+            Speak("Screen monitor testing enabled" if "testing on" in norm else "Screen monitor debug enabled")
+        else:
+            Speak("Screen monitor is not running")
+        return True
+
+    if (
+        "screen monitor debug off" in norm or
+        "screen monitor testing off" in norm or
+        "screen monitor debug of" in norm or
+        "screen monitor testing of" in norm
+    ):
+        mon = get_screen_monitor()
+        if mon:
+            mon.set_debug(False)
+            Speak("Screen monitor testing disabled" if "testing off" in norm else "Screen monitor debug disabled")
+        else:
+            Speak("Screen monitor is not running")
+        return True
+
+    # On-screen actions (monitor must be running)
+    monitor = get_screen_monitor()
+    if monitor and monitor.running:
+
+        def _find_title_box(raw_title: str):
+            t = (raw_title or "").strip()
+            t_trim = t.rstrip(" .!?\t\n")
+            t_clean = re.sub(r"[^a-z0-9 ]+", " ", t_trim.lower()).strip()
+            stop = {"the","a","an","to","and","or","of","on","for","with","your","my","in","at","by"}
+            tokens = [tok for tok in (t_clean.split() if t_clean else []) if tok and tok not in stop]
+            variants: list[str] = []
+            # Prefer short, distinctive heads first
+            for n in (6,5,4,3):
+                if tokens:
+                    v = " ".join(tokens[:n])
                     if v and v not in variants:
                         variants.append(v)
-                box = None
-                # Get screen size for location heuristics
-                try:
-                    sw, sh = pyautogui.size()
-                except Exception:
-                    sw, sh = (1920, 1080)
-                for v in variants:
-                    candidate = monitor.find_text(v)
-                    if not candidate:
-                        continue
-                    cx, cy = candidate.get('x'), candidate.get('y')
-                    # Heuristics: ignore header/top chrome area and extreme edges
-                    if cy is not None and cx is not None and cy >= 120 and 100 <= cx <= max(100, sw-120):
-                        box = candidate
-                        break
-                return box
-
-            # Focus/Pointer handler to visually verify OCR match
-            if (
-                norm.startswith("cursor title ") or
-                norm.startswith("cursor ") or
-                norm.startswith("focus title ") or
-                norm.startswith("focus on ") or
-                norm.startswith("pointer title ") or
-                norm.startswith("point to ") or
-                norm.startswith("show pointer ")
-            ):
-                try:
-                    print("[Automation][Focus] Handler matched")
-                except Exception:
-                    pass
-                lower_cmd = command.lower()
-                keys = [
-                    "cursor title ",
-                    "cursor ",
-                    "focus title ",
-                    "focus on ",
-                    "pointer title ",
-                    "point to ",
-                    "show pointer ",
-                ]
-                title = ""
-                for key in keys:
-                    if lower_cmd.startswith(key):
-                        try:
-                            start = len(key)
-                            title = command[start:].strip()
-                        except Exception:
-                            title = ""
-                        break
-                if not title:
-                    title = extract_title_from_command(command) or ""
-                if not title:
-                    await asyncio.to_thread(TextToSpeech, "Please say the title to focus")
-                    handled = True
-                    continue
-                await asyncio.to_thread(TextToSpeech, f"Focusing on: {title}")
-                box = _find_title_box(title)
-                if not box:
-                    await asyncio.to_thread(TextToSpeech, "Cannot locate that title to focus")
-                    handled = True
+            # Then try original raw/trim/clean
+            for v in (t, t_trim, t_clean):
+                if v and v not in variants:
+                    variants.append(v)
+            box = None
+            # Get screen size for location heuristics
+            try:
+                sw, sh = pyautogui.size()
+            except Exception:
+                sw, sh = (1920, 1080)
+            for v in variants:
+                candidate = monitor.find_text(v, zone="content")
+                if not candidate:
                     continue
-                try:
-                    pyautogui.moveTo(box['x'], box['y'])
-                except Exception:
-                    pass
-                await asyncio.sleep(0.15)
-                await asyncio.to_thread(TextToSpeech, f"Hovering at {box['x']}, {box['y']}")
-                handled = True
-                continue
-
-            # Quick navigation: Home (left sidebar)
-            if ("click on home" in norm or "click home" in norm or "click on homes" in norm or "click homes" in norm):
-                try:
-                    print("[Automation][Nav] Click Home matched")
-                except Exception:
-                    pass
-                candidates = ["Home", "home", "HOME"]
-                best = None
-                for txt in candidates:
-                    itm = monitor.find_text(txt)
-                    if itm:
-                        if (best is None) or (itm['x'] < best['x']):
-                            best = itm
-                if best:
+                cx, cy = candidate.get('x'), candidate.get('y')
+                # Heuristics: ignore header/top chrome area and extreme edges
+                if cy is not None and cx is not None and cy >= 120 and 100 <= cx <= max(100, sw-120):
+                    box = candidate
+                    break
+            return box
+
+        # Focus/Pointer handler to visually verify OCR match
+        if (
+            norm.startswith("cursor title ") or
+            norm.startswith("cursor ") or
+            norm.startswith("focus title ") or
+            norm.startswith("focus on ") or
+            norm.startswith("pointer title ") or
+            norm.startswith("point to ") or
+            norm.startswith("show pointer ")
+        ):
+            try:
+                print("[Automation][Focus] Handler matched")
+            except Exception:
+                pass
+            lower_cmd = command.lower()
+            keys = [
+                "cursor title ",
+                "cursor ",
+                "focus title ",
+                "focus on ",
+                "pointer title ",
+                "point to ",
+                "show pointer ",
+            ]
+            title = ""
+            for key in keys:
+                if lower_cmd.startswith(key):
                     try:
-                        sw, _ = pyautogui.size()
+                        start = len(key)
+                        title = command[start:].strip()
                     except Exception:
-                        sw = 1920
-                    if best['x'] < int(0.4 * sw):
-                        monitor.click_at(best['x'], best['y'])
-                        await asyncio.to_thread(TextToSpeech, "Home")
-                    else:
-                        await asyncio.to_thread(TextToSpeech, "Home not found")
-                else:
-                    await asyncio.to_thread(TextToSpeech, "Home not found")
-                handled = True
-                continue
+                        title = ""
+                    break
+            if not title:
+                title = extract_title_from_command(command) or ""
+            if not title:
+                Speak("Please say the title to focus")
+                return True
+            Speak(f"Focusing on: {title}")
+            box = _find_title_box(title)
+            if not box:
+                Speak("Cannot locate that title to focus")
+                return True
+            try:
+                pyautogui.moveTo(box['x'], box['y'])
+            except Exception:
+                pass
+            await asyncio.sleep(0.15)
+            Speak(f"Hovering at {box['x']}, {box['y']}")
+            return True
 
-            # Quick navigation: History (left sidebar)
-            if ("click on history" in norm or "click history" in norm or "click on histry" in norm or "click histry" in norm):
+        # Quick navigation: Home (left sidebar)
+        if ("click on home" in norm or "click home" in norm or "click on homes" in norm or "click homes" in norm):
+            try:
+                print("[Automation][Nav] Click Home matched")
+            except Exception:
+                pass
+            candidates = ["Home", "home", "HOME"]
+            best = None
+            for txt in candidates:
+                itm = monitor.find_text(txt, zone="sidebar")
+                if itm:
+                    if (best is None) or (itm['x'] < best['x']):
+                        best = itm
+            if best:
                 try:
-                    print("[Automation][Nav] Click History matched")
+                    sw, _ = pyautogui.size()
                 except Exception:
-                    pass
-                candidates = ["History", "history", "Histry", "histry"]
-                best = None
-                for txt in candidates:
-                    itm = monitor.find_text(txt)
-                    if itm:
-                        if (best is None) or (itm['x'] < best['x']):
-                            best = itm
-                if best:
-                    try:
-                        sw, _ = pyautogui.size()
-                    except Exception:
-                        sw = 1920
-                    if best['x'] < int(0.4 * sw):
-                        monitor.click_at(best['x'], best['y'])
-                        await asyncio.to_thread(TextToSpeech, "History opened")
-                    else:
-                        await asyncio.to_thread(TextToSpeech, "History not found")
+                    sw = 1920
+                if best['x'] < int(0.4 * sw):
+                    monitor.click_at(best['x'], best['y'])
+                    Speak("Home")
                 else:
-                    await asyncio.to_thread(TextToSpeech, "History not found")
-                handled = True
-                continue
+                    Speak("Home not found")
+            else:
+                Speak("Home not found")
+            return True
 
-            # Quick navigation: Watch later (left sidebar)
-            if ("click on watch later" in norm or "click watch later" in norm or "click on watchlater" in norm or "click watchlater" in norm):
+        # Quick navigation: History (left sidebar)
+        if ("click on history" in norm or "click history" in norm or "click on histry" in norm or "click histry" in norm):
+            try:
+                print("[Automation][Nav] Click History matched")
+            except Exception:
+                pass
+            candidates = ["History", "history", "Histry", "histry"]
+            best = None
+            for txt in candidates:
+                itm = monitor.find_text(txt, zone="sidebar")
+                if itm:
+                    if (best is None) or (itm['x'] < best['x']):
+                        best = itm
+            if best:
                 try:
-                    print("[Automation][Nav] Click Watch later matched")
+                    sw, _ = pyautogui.size()
                 except Exception:
-                    pass
-                candidates = ["Watch later", "Watch Later", "watch later", "watchlater", "WATCH LATER"]
-                best = None
-                for txt in candidates:
-                    itm = monitor.find_text(txt)
-                    if itm:
-                        if (best is None) or (itm['x'] < best['x']):
-                            best = itm
-                if best:
-                    try:
-                        sw, _ = pyautogui.size()
-                    except Exception:
-                        sw = 1920
-                    if best['x'] < int(0.4 * sw):
-                        monitor.click_at(best['x'], best['y'])
-                        await asyncio.to_thread(TextToSpeech, "Opening Watch later")
-                    else:
-                        await asyncio.to_thread(TextToSpeech, "Watch later not found")
+                    sw = 1920
+                if best['x'] < int(0.4 * sw):
+                    monitor.click_at(best['x'], best['y'])
+                    Speak("History opened")
                 else:
-                    await asyncio.to_thread(TextToSpeech, "Watch later not found")
-                handled = True
-                continue
+                    Speak("History not found")
+            else:
+                Speak("History not found")
+            return True
 
-            # add to watch later <title> (open video -> Save -> Watch later)
-            if norm.startswith("add to watch later "):
+        # Quick navigation: Watch later (left sidebar)
+        if ("click on watch later" in norm or "click watch later" in norm or "click on watchlater" in norm or "click watchlater" in norm):
+            try:
+                print("[Automation][Nav] Click Watch later matched")
+            except Exception:
+                pass
+            candidates = ["Watch later", "Watch Later", "watch later", "watchlater", "WATCH LATER"]
+            best = None
+            for txt in candidates:
+                itm = monitor.find_text(txt, zone="sidebar")
+                if itm:
+                    if (best is None) or (itm['x'] < best['x']):
+                        best = itm
+            if best:
                 try:
-                    print("[Automation][WatchLater] Handler matched")
+                    sw, _ = pyautogui.size()
                 except Exception:
-                    pass
-                lower_cmd = command.lower()
-                key = "add to watch later "
-                try:
-                    start = lower_cmd.index(key) + len(key)
-                    title = command[start:].strip()
-                except ValueError:
-                    title = extract_title_from_command(command) or ""
-
-                if not title:
-                    await asyncio.to_thread(TextToSpeech, "Please say the video title to add to Watch later")
-                    handled = True
-                    continue
+                    sw = 1920
+                if best['x'] < int(0.4 * sw):
+                    monitor.click_at(best['x'], best['y'])
+                    Speak("Opening Watch later")
+                else:
+                    Speak("Watch later not found")
+            else:
+                Speak("Watch later not found")
+            return True
 
-                await asyncio.to_thread(TextToSpeech, f"Add to Watch later: {title}")
-                try:
-                    print(f"[Automation][WatchLater] Searching for title='{title}'")
-                except Exception:
-                    pass
-                box = _find_title_box(title)
-                if not box:
-                    await asyncio.to_thread(TextToSpeech, "Cannot locate that video title")
-                    handled = True
-                    continue
+        # add to watch later <title> (open video -> Save -> Watch later)
+        if norm.startswith("add to watch later "):
+            try:
+                print("[Automation][WatchLater] Handler matched")
+            except Exception:
+                pass
+            lower_cmd = command.lower()
+            key = "add to watch later "
+            try:
+                start = lower_cmd.index(key) + len(key)
+                title = command[start:].strip()
+            except ValueError:
+                title = extract_title_from_command(command) or ""
 
-                try:
-                    w, h = pyautogui.size()
-                    pyautogui.click(w//2, h//2)
-                    await asyncio.sleep(0.15)
-                except Exception:
-                    pass
-                monitor.click_at(box['x'], box['y'])
-                await asyncio.sleep(1.8)
-
-                save_btn = None
-                for _ in range(12):
-                    save_btn = (
-                        monitor.find_text("Save") or
-                        monitor.find_text("save") or
-                        monitor.find_text("SAVE")
-                    )
-                    if save_btn:
-                        break
-                    await asyncio.sleep(0.5)
+            if not title:
+                Speak("Please say the video title to add to Watch later")
+                return True
 
+            Speak(f"Add to Watch later: {title}")
+            try:
+                print(f"[Automation][WatchLater] Searching for title='{title}'")
+            except Exception:
+                pass
+            box = _find_title_box(title)
+            if not box:
+                Speak("Cannot locate that video title")
+                return True
+
+            try:
+                w, h = pyautogui.size()
+                pyautogui.click(w//2, h//2)
+                await asyncio.sleep(0.15)
+            except Exception:
+                pass
+            monitor.click_at(box['x'], box['y'])
+            await asyncio.sleep(1.8)
+
+            # Wait (off the event loop) for the Save button; each new frame is checked as it arrives
+            save_btn = await asyncio.to_thread(monitor.wait_for_text, "Save", 6.0)
+
+            if not save_btn:
+                share = monitor.find_text("Share")
+                if share:
+                    for dx in [200, 240, 280, 320]:
+                        for dy in [0, -15, 15]:
+                            tx, ty = share['x'] + dx, share['y'] + dy
+                            try:
+                                pyautogui.moveTo(tx, ty)
+                                monitor.click_at(tx, ty)
+                            except Exception:
+                                continue
+                            save_btn = await asyncio.to_thread(monitor.wait_for_text, "Save", 0.7)
+                            if save_btn:
+                                break
+                        if save_btn:
+                            break
                 if not save_btn:
-                    share = monitor.find_text("Share") or monitor.find_text("share")
-                    if share:
-                        for dx in [200, 240, 280, 320]:
+                    download = monitor.find_text("Download")
+                    if download:
+                        for dx in [140, 180, 220, 260]:
                             for dy in [0, -15, 15]:
-                                tx, ty = share['x'] + dx, share['y'] + dy
+                                tx, ty = download['x'] + dx, download['y'] + dy
                                 try:
                                     pyautogui.moveTo(tx, ty)
                                     monitor.click_at(tx, ty)
                                 except Exception:
                                     continue
-                                await asyncio.sleep(0.7)
-                                save_btn = monitor.find_text("Save") or monitor.find_text("save")
+                                save_btn = await asyncio.to_thread(monitor.wait_for_text, "Save", 0.7)
                                 if save_btn:
                                     break
                             if save_btn:
                                 break
-                    if not save_btn:
-                        download = monitor.find_text("Download") or monitor.find_text("download")
-                        if download:
-                            for dx in [140, 180, 220, 260]:
-                                for dy in [0, -15, 15]:
-                                    tx, ty = download['x'] + dx, download['y'] + dy
-                                    try:
-                                        pyautogui.moveTo(tx, ty)
-                                        monitor.click_at(tx, ty)
-                                    except Exception:
-                                        continue
-                                    await asyncio.sleep(0.7)
-                                    save_btn = monitor.find_text("Save") or monitor.find_text("save")
-                                    if save_btn:
-                                        break
-                                if save_btn:
-                                    break
 
-                if save_btn:
-                    try:
-                        pyautogui.moveTo(save_btn['x'], save_btn['y'])
-                        monitor.click_at(save_btn['x'], save_btn['y'])
-                    except Exception:
-                        pass
-                    await asyncio.sleep(0.7)
-                    wl = None
-                    for _ in range(14):
-                        wl = (
-                            monitor.find_text("Watch later") or
-                            monitor.find_text("watch later") or
-                            monitor.find_text("WATCH LATER")
-                        )
-                        if wl:
-                            break
-                        await asyncio.sleep(0.35)
-                    if wl:
-                        pyautogui.moveTo(wl['x'], wl['y'])
-                        monitor.click_at(wl['x'], wl['y'])
-                        await asyncio.sleep(0.3)
-                        await asyncio.to_thread(TextToSpeech, "Added to Watch later")
-                    else:
-                        await asyncio.to_thread(TextToSpeech, "Watch later option not found")
-                else:
-                    await asyncio.to_thread(TextToSpeech, "Save button not visible yet")
-
-                try:
-                    keyboard.press_and_release('escape')
-                    await asyncio.sleep(0.2)
-                except Exception:
-                    pass
+            if save_btn:
                 try:
-                    keyboard.press_and_release('alt+left')
+                    pyautogui.moveTo(save_btn['x'], save_btn['y'])
+                    monitor.click_at(save_btn['x'], save_btn['y'])
                 except Exception:
                     pass
-                await asyncio.sleep(0.8)
-                handled = True
-                continue
-
-        if not handled:
-            mon_state = get_screen_monitor()
-            if mon_state and mon_state.running:
-                await asyncio.to_thread(TextToSpeech, "Screen-monitor: command not recognized")
+                await asyncio.sleep(0.7)
+                wl = await asyncio.to_thread(monitor.wait_for_text, "Watch later", 5.0)
+                if wl:
+                    pyautogui.moveTo(wl['x'], wl['y'])
+                    monitor.click_at(wl['x'], wl['y'])
+                    await asyncio.sleep(0.3)
+                    Speak("Added to Watch later")
+                else:
+                    Speak("Watch later option not found")
             else:
-                await asyncio.to_thread(TextToSpeech, "Command not recognized")
-            continue
-
-        # Bottom routing
-        if command.startswith("general "):
-            pass
-        if command.startswith("realtime "):
-            pass
-        if command.startswith("close "):
-            funcs.append(asyncio.to_thread(CloseApp, command.removeprefix("close ")))
-        if command.startswith("play "):
-            funcs.append(asyncio.to_thread(PlayYouTube, command.removeprefix("play ")))
-        if command.startswith("content "):
-            funcs.append(asyncio.to_thread(Content, command.removeprefix("content ")))
-        if command.startswith("google search "):
-            funcs.append(asyncio.to_thread(GoogleSearch, command.removeprefix("google search ")))
-        if command.startswith("youtube search "):
-            funcs.append(asyncio.to_thread(YouTubeSearch, command.removeprefix("youtube search ")))
-        if command.startswith("system "):
-            funcs.append(asyncio.to_thread(System, command.removeprefix("system ")))
-        else:
-            print(f"No Function Found. For {command}")
+                Speak("Save button not visible yet")
+
+            try:
+                keyboard.press_and_release('escape')
+                await asyncio.sleep(0.2)
+            except Exception:
+                pass
+            try:
+                keyboard.press_and_release('alt+left')
+            except Exception:
+                pass
+            await asyncio.sleep(0.8)
+            return True
+
+    mon_state = get_screen_monitor()
+    if mon_state and mon_state.running:
+        Speak("Screen-monitor: command not recognized")
+    else:
+        Speak("Command not recognized")
+    return False
+
+# Asynchronous function to translate and execute user commands.
+# Independent commands run concurrently; screen-monitor commands run one at a time (see Scheduler.py).
+async def TranslateAndExecute(commands: list[str]):
+
+    monitor = get_screen_monitor()
+    plan = PlanCommands(commands, screen_active=bool(monitor and monitor.running)) # Build the execution plan.
+    if monitor and monitor.running and any(stage.exclusive for stage in plan):
+        monitor.wake() # Capture at the active rate while on-screen commands run.
+
+    for result in await RunPlan(plan, ExecuteCommand): # Results come back in command order.
+        yield result
 
-    results = await asyncio.gather(*funcs)
-    for result in results:
-        if isinstance(result, str):
-            yield result
-        else:
-            yield result
 async def Automation(commands: list[str]):
 
     async for result in TranslateAndExecute(commands): # Translate and execute commands.
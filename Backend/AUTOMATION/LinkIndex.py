@@ -0,0 +1,294 @@
+import json # Import json to read Data/WebLinks.json.
+import os # Import os to check the links file modification time.
+import re # Import re to split names and commands into tokens.
+import threading # Import threading to guard rebuilds.
+from pathlib import Path # Import Path to resolve project root reliably.
+
+# Resolve project root (two levels up from this file).
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Built-in site names; entries in Data/WebLinks.json override these.
+website_keywords = {
+    "instagram": "https://www.instagram.com/",
+    "instagram.com": "https://www.instagram.com/",
+    "insta": "https://www.instagram.com/",
+    "facebook": "https://www.facebook.com/",
+    "facebook.com": "https://www.facebook.com/",
+    "fb": "https://www.facebook.com/",
+    "youtube": "https://www.youtube.com/",
+    "youtube.com": "https://www.youtube.com/",
+    "yt": "https://www.youtube.com/",
+    "google": "https://www.google.com/",
+    "google.com": "https://www.google.com/",
+    "g": "https://www.google.com/",
+    "gmail": "https://mail.google.com/",
+    "gmail.com": "https://mail.google.com/",
+    "mail": "https://mail.google.com/",
+    "whatsapp": "https://web.whatsapp.com/",
+    "whatsapp.com": "https://web.whatsapp.com/",
+    "wh": "https://web.whatsapp.com/",
+    "twitter": "https://twitter.com/",
+    "twitter.com": "https://twitter.com/",
+    "tw": "https://twitter.com/",
+    "linkedin": "https://www.linkedin.com/",
+    "linkedin.com": "https://www.linkedin.com/",
+    "ln": "https://www.linkedin.com/",
+    "telegram": "https://web.telegram.org/",
+    "telegram.com": "https://web.telegram.org/",
+    "tg": "https://web.telegram.org/",
+    "snapchat": "https://www.snapchat.com/",
+    "snapchat.com": "https://www.snapchat.com/",
+    "snap": "https://www.snapchat.com/",
+    "github": "https://github.com/",
+    "github.com": "https://github.com/",
+    "git": "https://github.com/",
+    "cohere": "https://cohere.com/",
+    "cohere.com": "https://cohere.com/",
+    "co": "https://cohere.com/",
+    "chatgpt": "https://chat.openai.com/",
+    "chatgpt.com": "https://chat.openai.com/",
+    "aisaver": "https://aisaver.com/",
+    "aisaver.com": "https://aisaver.com/",
+    "magichour": "https://magichour.com/",
+    "magichour.com": "https://magichour.com/",
+    'google': 'https://www.google.com',
+    'youtube': 'https://www.youtube.com',
+    'facebook': 'https://www.facebook.com',
+    'twitter': 'https://www.twitter.com',
+    'instagram': 'https://www.instagram.com',
+    'linkedin': 'https://www.linkedin.com',
+    'github': 'https://www.github.com',
+    'stackoverflow': 'https://stackoverflow.com',
+    'reddit': 'https://www.reddit.com',
+    'wikipedia': 'https://www.wikipedia.org',
+    'quora': 'https://www.quora.com',
+    'amazon': 'https://www.amazon.com',
+    'flipkart': 'https://www.flipkart.com',
+    'snapdeal': 'https://www.snapdeal.com',
+    'myntra': 'https://www.myntra.com',
+    'udemy': 'https://www.udemy.com',
+    'coursera': 'https://www.coursera.org',
+    'edx': 'https://www.edx.org',
+    'khanacademy': 'https://www.khanacademy.org',
+    'medium': 'https://medium.com',
+    'netflix': 'https://www.netflix.com',
+    'hotstar': 'https://www.hotstar.com',
+    'primevideo': 'https://www.primevideo.com',
+    'zomato': 'https://www.zomato.com',
+    'swiggy': 'https://www.swiggy.com',
+    'canva': 'https://www.canva.com',
+    'notion': 'https://www.notion.so',
+    'gmail': 'https://mail.google.com',
+    'yahoo': 'https://www.yahoo.com',
+    'duckduckgo': 'https://www.duckduckgo.com',
+    'bing': 'https://www.bing.com',
+    'zoho': 'https://www.zoho.com',
+    'pixabay': 'https://www.pixabay.com',
+    'pexels': 'https://www.pexels.com',
+    'unsplash': 'https://www.unsplash.com',
+    'wordpress': 'https://www.wordpress.com',
+    'blogger': 'https://www.blogger.com',
+    'tumblr': 'https://www.tumblr.com',
+    'trello': 'https://www.trello.com',
+    'dropbox': 'https://www.dropbox.com',
+    'drive': 'https://drive.google.com',
+    'skype': 'https://www.skype.com',
+    'zoom': 'https://zoom.us',
+    'meet': 'https://meet.google.com',
+    'figma': 'https://www.figma.com',
+    'codepen': 'https://codepen.io',
+    'replit': 'https://replit.com',
+    'w3schools': 'https://www.w3schools.com',
+    'geeksforgeeks': 'https://www.geeksforgeeks.org',
+    'tutorialspoint': 'https://www.tutorialspoint.com',
+    'udacity': 'https://www.udacity.com',
+    'futurelearn': 'https://www.futurelearn.com',
+    'javatpoint': 'https://www.javatpoint.com',
+    'crunchyroll': 'https://www.crunchyroll.com',
+    'openai': 'https://www.openai.com',
+    'codeacademy': 'https://www.codecademy.com',
+    'freecodecamp': 'https://www.freecodecamp.org',
+    'codeforces': 'https://codeforces.com',
+    'atcoder': 'https://atcoder.jp',
+    'leetcode': 'https://leetcode.com',
+    'hackerank': 'https://www.hackerrank.com',
+    'hackernews': 'https://news.ycombinator.com',
+    'producthunt': 'https://www.producthunt.com',
+    'techcrunch': 'https://techcrunch.com',
+    'thenextweb': 'https://thenextweb.com',
+    'wired': 'https://www.wired.com',
+    'cnn': 'https://www.cnn.com',
+    'bbc': 'https://www.bbc.com',
+    'ndtv': 'https://www.ndtv.com',
+    'indiatimes': 'https://www.indiatimes.com',
+    'moneycontrol': 'https://www.moneycontrol.com',
+    'groww': 'https://www.groww.in',
+    'zerodha': 'https://www.zerodha.com',
+    'coinmarketcap': 'https://coinmarketcap.com',
+    'tradingview': 'https://www.tradingview.com',
+    'spotify': 'https://www.spotify.com',
+    'soundcloud': 'https://soundcloud.com',
+    'gaana': 'https://gaana.com',
+    'wynk': 'https://wynk.in',
+    'jiosaavn': 'https://www.jiosaavn.com',
+    'telegram': 'https://web.telegram.org',
+    'whatsapp': 'https://web.whatsapp.com',
+    'discord': 'https://discord.com',
+    'tiktok': 'https://www.tiktok.com',
+    'snapchat': 'https://www.snapchat.com',
+    'glassdoor': 'https://www.glassdoor.com',
+    'naukri': 'https://www.naukri.com',
+    'indeed': 'https://www.indeed.com',
+    'monster': 'https://www.monster.com',
+    'internshala': 'https://internshala.com',
+    'timesjobs': 'https://www.timesjobs.com',
+    'freelancer': 'https://www.freelancer.com',
+    'fiverr': 'https://www.fiverr.com',
+    'upwork': 'https://www.upwork.com',
+    'behance': 'https://www.behance.net',
+    'dribbble': 'https://dribbble.com',
+    'envato': 'https://www.envato.com',
+    'themeforest': 'https://themeforest.net',
+    'githubpages': 'https://pages.github.com',
+    'netlify': 'https://www.netlify.com',
+    'vercel': 'https://vercel.com',
+    'cloudflare': 'https://www.cloudflare.com',
+    'aws': 'https://aws.amazon.com',
+    'azure': 'https://azure.microsoft.com',
+    'gcp': 'https://cloud.google.com',
+}
+
+
+_token_re = re.compile(r"[a-z0-9]+(?:\.[a-z0-9]+)*")
+
+
+def Tokens(text: str) -> list:
+    """Lowercase word tokens; dotted names stay whole: "Open Instagram.com!" -> ["open", "instagram.com"]."""
+    return _token_re.findall((text or "").lower())
+
+
+def DefaultLinks() -> list:
+    """Built-in links as WebLinks.json items, without the ".com" variants."""
+    return [{"name": name, "url": url} for name, url in website_keywords.items() if "." not in name]
+
+
+class LinkIndex:
+    """
+    Maps spoken names to URLs with a token trie over the built-in names and
+    Data/WebLinks.json. Names match whole tokens only; a name may also be
+    spoken as separate words ("stack overflow" -> "stackoverflow"). The name
+    covering the most words wins ("github pages" over "github") and ties go
+    to the earliest one in the text. Short aliases such as "co" or "yt" count
+    only when they are the whole text, so "co pilot" does not open Cohere.
+    The index is rebuilt only when the links file's modification time
+    changes or invalidate() is called.
+    """
+
+    MAX_JOINED_TOKENS = 3 # Spoken words that may be joined into one name
+    SHORT_ALIAS       = 2 # Single-word names this short need the whole text
+
+    def __init__(self, path, defaults: dict):
+        self.path     = Path(path)
+        self.defaults = defaults
+        self._lock    = threading.Lock()
+        self._mtime   = None
+        self._root    = None
+
+    def _read_links(self) -> list:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                links = json.load(f) or []
+            return links if isinstance(links, list) else []
+        except Exception:
+            return []
+
+    def _seed(self) -> list:
+        # First run (or an emptied file): write the defaults so the GUI can edit them.
+        links = DefaultLinks()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(links, f, ensure_ascii=False, indent=2)
+        except Exception:
+            pass
+        return links
+
+    def _build(self):
+        links = self._read_links() or self._seed()
+        names = dict(self.defaults)
+        # User-defined names override defaults with the same name.
+        for item in links:
+            try:
+                name = str(item.get("name", "")).strip().lower()
+                url  = str(item.get("url", "")).strip()
+                if name and (url.startswith("http://") or url.startswith("https://")):
+                    names[name] = url
+            except Exception:
+                continue
+        root = {}
+        for name, url in names.items():
+            node = root
+            for token in Tokens(name):
+                node = node.setdefault(token, {})
+            if node is not root:
+                node[None] = url
+        self._root = root
+
+    def _current(self) -> dict:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = None
+        with self._lock:
+            if self._root is None or mtime != self._mtime:
+                self._build()
+                try:
+                    self._mtime = os.stat(self.path).st_mtime_ns
+                except OSError:
+                    self._mtime = None
+            return self._root
+
+    def invalidate(self):
+        """Force a rebuild on the next lookup (e.g. after the GUI saved the links)."""
+        with self._lock:
+            self._root = None
+
+    def _match_at(self, root: dict, tokens: list, start: int):
+        """Longest (length, url) starting at tokens[start], or (0, None)."""
+        best = (0, None)
+        node = root
+        for i in range(start, len(tokens)):
+            node = node.get(tokens[i])
+            if node is None:
+                break
+            if None in node:
+                best = (i - start + 1, node[None])
+        # Words spoken apart that form one name ("stack overflow").
+        for n in range(self.MAX_JOINED_TOKENS, 1, -1):
+            if start + n <= len(tokens) and n > best[0]:
+                joined = root.get("".join(tokens[start:start + n]))
+                if joined is not None and None in joined:
+                    return n, joined[None]
+        return best
+
+    def is_site(self, text: str) -> bool:
+        """True when the whole of `text` is one known site name ("stack overflow", not "the deal")."""
+        tokens = Tokens(text)
+        return bool(tokens) and self._match_at(self._current(), tokens, 0)[0] == len(tokens)
+
+    def resolve(self, text: str):
+        """URL for the longest site name in `text` (earliest on ties), or None."""
+        root = self._current()
+        tokens = Tokens(text)
+        best = (0, None)
+        for start in range(len(tokens)):
+            match = self._match_at(root, tokens, start)
+            if match[0] == 1 and len(tokens) > 1 and len(tokens[start]) <= self.SHORT_ALIAS:
+                continue # A fragment like "co" in "co pilot", not the site's alias.
+            if match[0] > best[0]:
+                best = match
+        return best[1]
+
+
+# Shared index used by Automation.OpenApp; the GUI invalidates it after editing links.
+Links = LinkIndex(PROJECT_ROOT / "Data" / "WebLinks.json", website_keywords)
@@ -0,0 +1,99 @@
+import asyncio # Import asyncio to run independent commands concurrently.
+import re # Import re for normalizing commands.
+import time # Import time to report how long each stage took.
+from collections import namedtuple # Import namedtuple for plan entries.
+
+# Decision entries answered by main.py itself rather than by the automation handlers.
+# "exit" only as a whole entry: "exit screen monitor" is an automation command.
+NonAutomation = ("general ", "realtime ", "generate ")
+
+# Prefixes of actions that run on their own thread and never touch the screen monitor.
+BackgroundActions = ("open ", "close ", "play ", "content ", "google search ", "youtube search ", "system ")
+
+# One command in a plan, with its position in the decision list so results keep their order.
+PlannedCommand = namedtuple("PlannedCommand", "index command")
+
+# A plan is a list of stages run one after another. Each stage maps a lane name to
+# the commands it runs in order; the lanes of a stage run concurrently. A stage
+# with `exclusive` set holds screen-monitor commands and runs alone.
+Stage = namedtuple("Stage", "lanes exclusive")
+
+
+def NormalizeCommand(command: str) -> str:
+    command = command.strip()
+    if command.lower().startswith("automation "):
+        command = command[len("automation "):].strip()
+    return re.sub(r"[^a-z0-9 ]+", "", command.lower()).strip()
+
+
+def CommandLane(norm: str, screen_active: bool):
+    """
+    Lane for a normalized command, or None when it must run exclusively.
+    Commands on the same lane depend on each other (open then close the same app,
+    volume keys); different lanes are independent.
+    """
+    if "screen monitor" in norm:
+        return None
+    if norm.startswith(("open ", "close ")):
+        if screen_active and norm.startswith("open "):
+            return None # May click an on-screen match instead of launching the app.
+        return "app:" + norm.split(" ", 1)[1]
+    if norm.startswith("system "):
+        return "system"
+    if norm.startswith(BackgroundActions):
+        return "web:" + norm
+    if screen_active:
+        return None # Clicks, hovers and other on-screen actions share the screen.
+    return "other:" + norm
+
+
+def PlanCommands(commands: list[str], screen_active: bool = False) -> list[Stage]:
+    """
+    Group `commands` into stages. Consecutive independent commands share a stage;
+    each run of screen-monitor commands becomes an exclusive stage that waits for
+    everything before it and blocks everything after it.
+    """
+    plan = []
+    for index, command in enumerate(commands):
+        norm = NormalizeCommand(command)
+        if not norm or norm == "exit" or norm.startswith(NonAutomation):
+            continue
+        lane = CommandLane(norm, screen_active)
+        if "screen monitor on" in norm:
+            screen_active = True
+        elif "screen monitor of" in norm or "exit screen monitor" in norm:
+            screen_active = False
+
+        exclusive = lane is None
+        if not plan or plan[-1].exclusive != exclusive:
+            plan.append(Stage({}, exclusive))
+        plan[-1].lanes.setdefault(lane or "screen", []).append(PlannedCommand(index, command))
+    return plan
+
+
+def DescribePlan(plan: list[Stage]) -> str:
+    parts = []
+    for stage in plan:
+        lanes = [" -> ".join(c.command for c in commands) for commands in stage.lanes.values()]
+        parts.append(("[screen] " if stage.exclusive else "") + " | ".join(lanes))
+    return " ; ".join(parts)
+
+
+async def RunPlan(plan: list[Stage], execute) -> list:
+    """Run `plan` with `execute(command)` (a coroutine function); returns results in command order."""
+    results = {}
+
+    async def run_lane(commands):
+        for planned in commands:
+            try:
+                results[planned.index] = await execute(planned.command)
+            except Exception as e:
+                print(f"[Automation] '{planned.command}' failed: {e}")
+                results[planned.index] = False
+
+    print(f"[Automation] Plan: {DescribePlan(plan)}")
+    for stage in plan:
+        started = time.perf_counter()
+        await asyncio.gather(*(run_lane(commands) for commands in stage.lanes.values()))
+        print(f"[Automation] Stage of {sum(map(len, stage.lanes.values()))} command(s) took {time.perf_counter() - started:.2f}s")
+    return [results[index] for index in sorted(results)]
@@ -1,5 +1,9 @@
+from dotenv import dotenv_values
 from .screen_monitor.monitor import ScreenMonitorService
 
+# OCR worker processes for full-frame reads; 1 keeps OCR in-process.
+OCRWorkers = int(dotenv_values(".env").get("OCRWorkers") or 1)
+
 _monitor = None
 
 def start_screen_monitor(region=None):
@@ -11,7 +15,7 @@ def start_screen_monitor(region=None):
     if _monitor and _monitor.running:
         return False
 
-    _monitor = ScreenMonitorService(region=region)
+    _monitor = ScreenMonitorService(region=region, ocr_workers=OCRWorkers)
     _monitor.start()
     # Wait briefly until the first frame is captured to avoid early None frames
     try:
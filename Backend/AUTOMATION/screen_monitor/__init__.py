@@ -1,3 +1,3 @@
 from .monitor              import ScreenMonitorService
-from .ocr_processor       import OCRProcessor
-from .template_matching   import TemplateMatcher
\ No newline at end of file
+from .ocr_processor       import OCRProcessor, OCRCache, FrameText
+from .template_matching   import TemplateMatcher, FramePyramid
\ No newline at end of file
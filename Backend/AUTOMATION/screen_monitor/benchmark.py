@@ -0,0 +1,210 @@
+"""
+Micro-benchmark for find_text's line grouping and scoring on saved frames.
+
+    python -m Backend.AUTOMATION.screen_monitor.benchmark Data/ScreenDebug/*.png
+    python -m Backend.AUTOMATION.screen_monitor.benchmark --synthetic 600
+
+Each frame is OCR'd once and its word boxes are stored next to it as
+`<frame>.boxes.json`, so later runs (and machines without Tesseract) only
+time the Python side. The legacy nested-loop grouping and difflib scoring
+are kept here as the baseline; the report shows both timings and how often
+both pick the same best candidate.
+
+    python -m Backend.AUTOMATION.screen_monitor.benchmark shot_4k.png --ocr-workers 1 2 4 8
+
+times the OCR itself on each frame with that many worker processes, and
+
+    python -m Backend.AUTOMATION.screen_monitor.benchmark shot_4k.png --templates three_dot_icon.png
+
+times template lookups against the legacy single-scale, full-resolution match.
+"""
+import argparse
+import difflib
+import json
+import random
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .ocr_processor import FrameText, group_lines
+
+DEFAULT_QUERIES = ["Save", "save", "SAVE", "Share", "Download", "Watch later", "Home", "History"]
+
+
+def legacy_group_lines(boxes):
+    lines = []
+    for b in sorted(boxes, key=lambda x: x['top']):
+        placed = False
+        for ln in lines:
+            ln_mid = ln['top'] + ln['height'] / 2
+            b_mid  = b['top'] + b['height'] / 2
+            if abs(ln_mid - b_mid) <= max(10, 0.6 * max(ln['height'], b['height'])):
+                if b['left'] < ln['left']:
+                    ln['text'] = f"{b['text']} " + ln['text']
+                    ln['width'] = (ln['left'] + ln['width']) - b['left']
+                    ln['left']  = b['left']
+                else:
+                    ln['text'] = ln['text'] + f" {b['text']}"
+                    ln['width'] = max(ln['left'] + ln['width'], b['left'] + b['width']) - ln['left']
+                ln['top']    = min(ln['top'], b['top'])
+                ln['height'] = max(ln['height'], b['height'])
+                ln.setdefault('words', []).append(dict(b))
+                placed = True
+                break
+        if not placed:
+            lines.append({**b, 'words': [dict(b)]})
+    return lines
+
+
+def legacy_best(query, candidates, img_w):
+    best, best_score = None, 0.0
+    q = (query or "").lower().strip()
+    q_tokens = [w for w in q.split() if len(w) >= 3]
+    for b in candidates:
+        t = b['text'].lower().strip()
+        score = difflib.SequenceMatcher(None, t, q).ratio()
+        if q in t:
+            score = max(score, 0.90)
+        if q_tokens:
+            overlap = sum(1 for w in q_tokens if w in t)
+            score = max(score, overlap / max(1, len(q_tokens)))
+        line_width = b.get('width', 0)
+        if line_width and img_w and line_width > 0.8 * img_w:
+            score *= 0.9
+        if score > best_score:
+            best_score, best = score, b
+    return best, best_score
+
+
+def synthetic_frame(count, width=1920, seed=0):
+    """
+    A YouTube-like page: a sidebar column plus a grid of multi-word titles.
+    """
+    rng = random.Random(seed)
+    vocab = ["video", "music", "live", "official", "trailer", "how", "to", "make", "best", "song",
+             "watch", "later", "history", "home", "share", "save", "download", "views", "ago", "mix"]
+    boxes = []
+    for i, label in enumerate(["Home", "Shorts", "Subscriptions", "History", "Watch", "later", "Liked"]):
+        boxes.append({'text': label, 'left': 24, 'top': 80 + 40 * i, 'width': 9 * len(label), 'height': 18, 'conf': 90})
+    while len(boxes) < count:
+        col, row = rng.randrange(4), rng.randrange(30)
+        x = 260 + col * 410 + rng.randrange(0, 200)
+        y = 120 + row * 30 + rng.randrange(-2, 3)
+        word = rng.choice(vocab)
+        boxes.append({'text': word.capitalize() if rng.random() < 0.3 else word,
+                      'left': x, 'top': y, 'width': 9 * len(word), 'height': 16 + rng.randrange(4), 'conf': 90})
+    return width, boxes
+
+
+def load_frame(path):
+    cache = Path(str(path) + ".boxes.json")
+    if cache.exists():
+        data = json.loads(cache.read_text(encoding="utf-8"))
+        return data['width'], data['boxes']
+    import cv2
+    from .ocr_processor import OCRProcessor, to_bgr
+    img = to_bgr(cv2.imread(str(path), cv2.IMREAD_UNCHANGED))
+    boxes = OCRProcessor(confidence=50).ocr_image(img)
+    cache.write_text(json.dumps({'width': img.shape[1], 'boxes': boxes}), encoding="utf-8")
+    return img.shape[1], boxes
+
+
+def timed(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - started) / repeat, result
+
+
+def benchmark(name, width, boxes, queries, repeat):
+    legacy_group, legacy_lines = timed(lambda: legacy_group_lines(boxes), repeat)
+    new_group, lines = timed(lambda: group_lines(boxes), repeat)
+    legacy_candidates = boxes + legacy_lines
+    frame = FrameText(np.zeros((1, width, 3), dtype=np.uint8), boxes)
+
+    legacy_score = new_score = 0.0
+    same = 0
+    for query in queries:
+        t, (old_best, _) = timed(lambda: legacy_best(query, legacy_candidates, width), repeat)
+        legacy_score += t
+        t, scores = timed(lambda: frame.score(query), repeat)
+        new_score += t
+        new_best = frame.candidates[int(np.argmax(scores))] if len(scores) else None
+        same += (old_best or {}).get('text') == (new_best or {}).get('text')
+
+    print(f"\n== {name}: {len(boxes)} words, {len(legacy_lines)} / {len(lines)} lines (legacy / new) ==")
+    print(f"group lines : legacy {legacy_group * 1000:7.2f} ms   new {new_group * 1000:7.2f} ms   x{legacy_group / max(new_group, 1e-9):.1f}")
+    print(f"score {len(queries):2d} q : legacy {legacy_score * 1000:7.2f} ms   new {new_score * 1000:7.2f} ms   x{legacy_score / max(new_score, 1e-9):.1f}")
+    print(f"same best candidate for {same}/{len(queries)} queries")
+
+
+def benchmark_ocr(path, workers_list, repeat):
+    import cv2
+    from .ocr_processor import OCRProcessor, to_bgr
+    img = to_bgr(cv2.imread(str(path), cv2.IMREAD_UNCHANGED))
+    print(f"\n== OCR {Path(path).name}: {img.shape[1]}x{img.shape[0]} ==")
+    baseline = None
+    for workers in workers_list:
+        ocr = OCRProcessor(confidence=50, workers=workers)
+        try:
+            ocr.ocr_image(img)  # start the worker processes
+            seconds, boxes = timed(lambda: ocr.ocr_image(img), repeat)
+        finally:
+            ocr.close()
+        baseline = baseline or seconds
+        print(f"{workers:2d} worker(s): {seconds * 1000:8.0f} ms  {len(boxes)} words  x{baseline / seconds:.1f}")
+
+
+def benchmark_templates(path, names, repeat):
+    import cv2
+    from .ocr_processor import to_bgr
+    from .template_matching import FramePyramid, TemplateMatcher
+    img = cv2.imread(str(path), cv2.IMREAD_UNCHANGED)
+    matcher = TemplateMatcher()
+    print(f"\n== Templates {Path(path).name}: {img.shape[1]}x{img.shape[0]} ==")
+    for name in names:
+        tpl = cv2.imread(str(Path(matcher.template_dir) / name), cv2.IMREAD_COLOR)
+        if tpl is None:
+            print(f"{name}: could not read template")
+            continue
+        legacy, res = timed(lambda: cv2.matchTemplate(to_bgr(img), tpl, cv2.TM_CCOEFF_NORMED), max(1, repeat // 10))
+        fresh, found = timed(lambda: matcher.match(img, name), repeat)
+        pyramid = FramePyramid(img)
+        matcher.match(pyramid, name)
+        cached, _ = timed(lambda: matcher.match(pyramid, name), repeat)
+        print(f"{name}: legacy {legacy * 1000:7.1f} ms (score {float(res.max()):.2f})   "
+              f"new {fresh * 1000:6.1f} ms   same frame {cached * 1000:6.1f} ms   {found}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OCR line grouping and fuzzy scoring.")
+    parser.add_argument("frames", nargs="*", help="saved screenshots (PNG) or their .boxes.json")
+    parser.add_argument("--queries", nargs="+", default=DEFAULT_QUERIES)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--synthetic", type=int, default=0, help="also run on a generated page with this many words")
+    parser.add_argument("--ocr-workers", type=int, nargs="+", help="time OCR of each frame with these pool sizes")
+    parser.add_argument("--templates", nargs="+", help="time template lookups of these templates on each frame")
+    args = parser.parse_args()
+    if args.templates:
+        for path in args.frames:
+            benchmark_templates(path, args.templates, args.repeat)
+        return
+    if args.ocr_workers:
+        for path in args.frames:
+            benchmark_ocr(path, args.ocr_workers, max(1, args.repeat // 10))
+        return
+    if not args.frames and not args.synthetic:
+        parser.error("give saved frames or --synthetic N")
+    for path in args.frames:
+        if path.endswith(".boxes.json"):
+            path = path[:-len(".boxes.json")]
+        width, boxes = load_frame(path)
+        benchmark(Path(path).name, width, boxes, args.queries, args.repeat)
+    if args.synthetic:
+        width, boxes = synthetic_frame(args.synthetic)
+        benchmark(f"synthetic-{args.synthetic}", width, boxes, args.queries, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import numpy as np
+
+class ChangeDetector:
+    """
+    Finds the tiles of a frame that changed since the last published frame by
+    comparing a downsampled copy (every `step`-th pixel). The downsampled
+    buffers are allocated once per frame size and reused for every frame.
+    """
+
+    def __init__(self, tile: int = 64, step: int = 4, threshold: int = 24):
+        self.tile      = tile       # tile size in frame pixels
+        self.step      = step       # sampling stride in frame pixels
+        self.threshold = threshold  # per-channel difference that counts as a change
+        self._shape    = None
+        self._prev     = None
+        self._diff     = None
+        self._gray     = None
+        self._rows     = None
+        self._cols     = None
+
+    def _allocate(self, small):
+        hs, ws = small.shape[:2]
+        cells = max(1, self.tile // self.step)
+        self._shape = small.shape
+        self._prev  = np.empty(small.shape, dtype=np.uint8)
+        self._diff  = np.empty(small.shape, dtype=np.int16)
+        self._gray  = np.empty((hs, ws), dtype=np.int16)
+        self._rows  = np.arange(0, hs, cells)
+        self._cols  = np.arange(0, ws, cells)
+
+    def grid_shape(self):
+        if self._rows is None:
+            return (0, 0)
+        return (len(self._rows), len(self._cols))
+
+    def update(self, frame):
+        """
+        Compare `frame` (H x W x 3/4, uint8) with the last frame that had a
+        dirty tile, so slow fades add up until they cross the threshold.
+        Returns a boolean (rows x cols) tile mask; every tile is dirty on the
+        first frame or after a size change.
+        """
+        small = frame[::self.step, ::self.step, :3]
+        if self._shape != small.shape:
+            self._allocate(small)
+            np.copyto(self._prev, small)
+            return np.ones(self.grid_shape(), dtype=bool)
+
+        np.subtract(small, self._prev, out=self._diff, dtype=np.int16)
+        np.abs(self._diff, out=self._diff)
+        np.max(self._diff, axis=2, out=self._gray)
+        tiles = np.maximum.reduceat(np.maximum.reduceat(self._gray, self._rows, axis=0), self._cols, axis=1)
+        mask  = tiles > self.threshold
+        if mask.any():
+            np.copyto(self._prev, small) # This frame is published; later frames are compared with it.
+        return mask
+
+    def regions(self, mask, width: int, height: int):
+        """
+        Bounding boxes (left, top, width, height) in frame pixels of the
+        connected groups of dirty tiles in `mask`.
+        """
+        rows, cols = mask.shape
+        seen  = np.zeros_like(mask)
+        boxes = []
+        for r, c in zip(*np.nonzero(mask)):
+            if seen[r, c]:
+                continue
+            seen[r, c] = True
+            stack = [(r, c)]
+            r0, r1, c0, c1 = r, r, c, c
+            while stack:
+                y, x = stack.pop()
+                r0, r1, c0, c1 = min(r0, y), max(r1, y), min(c0, x), max(c1, x)
+                for ny, nx in ((y - 1, x), (y + 1, x), (y, x - 1), (y, x + 1)):
+                    if 0 <= ny < rows and 0 <= nx < cols and mask[ny, nx] and not seen[ny, nx]:
+                        seen[ny, nx] = True
+                        stack.append((ny, nx))
+            left, top = int(c0) * self.tile, int(r0) * self.tile
+            right  = min(width,  (int(c1) + 1) * self.tile)
+            bottom = min(height, (int(r1) + 1) * self.tile)
+            boxes.append((left, top, right - left, bottom - top))
+        return boxes
@@ -1,6 +1,7 @@
+import ctypes
 import threading
 import time
-import difflib
+from collections import deque
 
 import mss
 import numpy as np
@@ -10,24 +11,51 @@ import pyautogui
 import os
 from pathlib import Path
 
-from .ocr_processor     import OCRProcessor
-from .template_matching import TemplateMatcher
+from .ocr_processor     import OCRProcessor, OCRCache
+from .template_matching import TemplateMatcher, FramePyramid
+from .change_detector   import ChangeDetector
+from .zones             import ZoneMap, clip_rect
 
 class ScreenMonitorService(threading.Thread):
     """
     Continuously captures a screen region in a background thread.
     Exposes methods to find text via OCR, match image templates,
     click coordinates, and send paste hotkeys.
+
+    Capture is change-driven: a new frame is only published when the
+    downsampled diff finds changed tiles, and the loop drops from
+    `active_interval` to `idle_interval` once nothing has queried the
+    screen for `idle_after` seconds. A query while idle wakes the loop
+    and waits for a fresh frame.
     """
 
-    def __init__(self, region=None, ocr_confidence=50, template_dir=None):
+    def __init__(self, region=None, ocr_confidence=50, template_dir=None,
+                 active_interval=0.1, idle_interval=1.0, idle_after=5.0, ocr_workers=1):
         super().__init__(daemon=True)
         self.region   = region or self._detect_fullscreen_region()
-        self.ocr      = OCRProcessor(confidence=ocr_confidence)
+        # ocr_workers > 1 splits full-frame OCR across that many processes (opt-in)
+        self.ocr      = OCRProcessor(confidence=ocr_confidence, workers=ocr_workers)
+        self.ocr_cache = OCRCache(self.ocr)
         self.matcher  = TemplateMatcher(template_dir=template_dir)
+        self._pyramid_cache = (None, None)  # (frame_id, FramePyramid) for template matching
+        self._pyramid_lock  = threading.Lock()
+        # Named OCR zones, learned per window layout (Data/ScreenZones.json)
+        self.zones    = ZoneMap(Path(__file__).resolve().parents[3] / "Data" / "ScreenZones.json")
         self.running  = False
         self.latest   = None
+        self.frame_id = 0
+        self._snapshot = (0, None)  # (frame_id, frame), replaced atomically
         self._ready   = threading.Event()
+        # Adaptive capture
+        self.active_interval = active_interval
+        self.idle_interval   = idle_interval
+        self.idle_after      = idle_after
+        self.frame_time      = 0.0  # monotonic time the latest frame was last confirmed current
+        self.detector        = ChangeDetector()
+        self._changes        = deque(maxlen=64)  # (frame_id, dirty tile mask) per published frame
+        self._frame_cond     = threading.Condition()
+        self._wake           = threading.Event()
+        self._last_demand    = 0.0
         # Debug controls
         self.debug    = False
         self.debug_dir = None
@@ -40,16 +68,81 @@ class ScreenMonitorService(threading.Thread):
         self.running = True
         with mss.mss() as sct:
             while self.running:
-                frame = np.array(sct.grab(self.region))
-                # mss returns BGRA. Store as-is; downstream will convert as needed.
-                self.latest = frame
+                shot = sct.grab(self.region)
+                # mss returns BGRA in a fresh buffer per grab; view it without copying.
+                frame = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+                mask  = self.detector.update(frame)
+                with self._frame_cond:
+                    if self.latest is None or mask.any():
+                        self.latest = frame
+                        self.frame_id += 1
+                        self._snapshot = (self.frame_id, frame)
+                        self._changes.append((self.frame_id, mask))
+                    self.frame_time = time.monotonic()
+                    self._frame_cond.notify_all()
                 # Signal readiness after first frame
                 if not self._ready.is_set():
                     self._ready.set()
-                time.sleep(0.1)     
+                self._wake.wait(self._interval())
+                self._wake.clear()
+
+    def _interval(self):
+        if time.monotonic() - self._last_demand < self.idle_after:
+            return self.active_interval
+        return self.idle_interval
 
     def stop(self):
         self.running = False
+        self._wake.set()
+        self.ocr.close()
+
+    def wake(self):
+        """
+        Switch to the active capture rate (e.g. when screen automation is about to run).
+        """
+        self._last_demand = time.monotonic()
+        self._wake.set()
+
+    def _fresh_snapshot(self, max_age=None):
+        """
+        (frame_id, frame) confirmed current within `max_age` seconds
+        (default: one active interval), waking the capture loop if needed.
+        """
+        self._last_demand = time.monotonic()
+        if self.latest is None:
+            self._ready.wait(timeout=1.0)
+        max_age = self.active_interval if max_age is None else max_age
+        with self._frame_cond:
+            requested = time.monotonic()
+            if self.running and requested - self.frame_time > max_age:
+                self._wake.set()
+                self._frame_cond.wait_for(lambda: self.frame_time >= requested or not self.running, timeout=1.0)
+            return self._snapshot
+
+    def dirty_regions(self, since):
+        """
+        Regions (left, top, width, height), relative to the frame, that changed
+        after frame `since`. Returns None when that is unknown (no frame yet,
+        or `since` is older than the change history), meaning "everything".
+        """
+        with self._frame_cond:
+            frame_id, frame = self._snapshot
+            changes = list(self._changes)
+        if since is None or frame is None:
+            return None
+        if since >= frame_id:
+            return []
+        if not changes or changes[0][0] > since + 1:
+            return None
+        mask = None
+        for fid, m in changes:
+            if fid <= since:
+                continue
+            if mask is not None and mask.shape != m.shape:
+                return None
+            mask = m.copy() if mask is None else (mask | m)
+        h, w = frame.shape[:2]
+        return self.detector.regions(mask, w, h)
 
     def set_debug(self, enabled: bool = True, save_dir: str | None = None):
         """
@@ -71,10 +164,8 @@ class ScreenMonitorService(threading.Thread):
         """
         Return the most recent frame as a BGR numpy array.
         """
-        # Wait briefly for the first frame if not ready yet
-        if self.latest is None:
-            self._ready.wait(timeout=1.0)
-        return self.latest
+        # Waits briefly for the first frame, or for a fresh one while idle
+        return self._fresh_snapshot()[1]
 
     def wait_until_ready(self, timeout: float = 2.0) -> bool:
         """
@@ -83,113 +174,197 @@ class ScreenMonitorService(threading.Thread):
         """
         return self._ready.wait(timeout=timeout)
 
-    def find_text(self, query: str, threshold: float = 0.75):
+    def read_text(self, rect=None):
         """
-        OCR entire frame, fuzzy-match `query` against each text box.
-        Returns the center coords of the best match if above threshold.
+        OCR result (FrameText) for the latest frame, or only for `rect`
+        (left, top, width, height in frame coordinates). Repeated calls on
+        the same or an identical frame reuse one OCR pass.
         """
-        img = self.capture()
+        frame_id, img = self._fresh_snapshot()
         if img is None:
             return None
+        if rect is not None:
+            rect = clip_rect(rect, img.shape[1], img.shape[0])
+            if rect is None:
+                return None
+            return self.ocr_cache.read_region(frame_id, img, rect)
+        # Only regions that changed since the cached OCR are read again.
+        return self.ocr_cache.read(frame_id, img, changed_since=self.dirty_regions)
 
-        # Ensure we pass a compatible image for OCR
-        if img.ndim == 3 and img.shape[2] == 4:
-            proc_img = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
-        else:
-            proc_img = img
-
-        boxes = self.ocr.ocr_image(proc_img)
-
-        # Aggregate boxes into approximate text lines to support multi-word titles
-        lines = []
-        for b in sorted(boxes, key=lambda x: x['top']):
-            placed = False
-            for ln in lines:
-                # Consider same line if vertical overlap is significant
-                ln_mid = ln['top'] + ln['height'] / 2
-                b_mid  = b['top'] + b['height'] / 2
-                if abs(ln_mid - b_mid) <= max(10, 0.6 * max(ln['height'], b['height'])):
-                    # Append word to this line
-                    if b['left'] < ln['left']:
-                        ln['text'] = f"{b['text']} " + ln['text']
-                        ln['width'] = (ln['left'] + ln['width']) - b['left']
-                        ln['left']  = b['left']
-                    else:
-                        ln['text'] = ln['text'] + f" {b['text']}"
-                        ln['width'] = max(ln['left'] + ln['width'], b['left'] + b['width']) - ln['left']
-                    ln['top']    = min(ln['top'], b['top'])
-                    ln['height'] = max(ln['height'], b['height'])
-                    # Track constituent words with boxes (left-ordered)
-                    ln.setdefault('words', []).append({
-                        'text': b['text'],
-                        'left': b['left'],
-                        'top': b['top'],
-                        'width': b['width'],
-                        'height': b['height'],
-                    })
-                    placed = True
-                    break
-            if not placed:
-                lines.append({
-                    'text': b['text'],
-                    'left': b['left'],
-                    'top': b['top'],
-                    'width': b['width'],
-                    'height': b['height'],
-                    'words': [{
-                        'text': b['text'],
-                        'left': b['left'],
-                        'top': b['top'],
-                        'width': b['width'],
-                        'height': b['height'],
-                    }]
-                })
-
-        candidates = boxes + lines  # try both words and reconstructed lines
-        best, best_score = None, 0.0
+    def _offset(self):
+        """
+        Screen position of the captured region's top-left corner.
+        """
+        off_x = int(self.region.get('left', 0)) if isinstance(self.region, dict) else 0
+        off_y = int(self.region.get('top', 0))  if isinstance(self.region, dict) else 0
+        return off_x, off_y
+
+    def active_window(self):
+        """
+        The foreground window as (left, top, width, height) in frame
+        coordinates, or the whole frame when it cannot be determined.
+        """
+        frame = self._snapshot[1]
+        if frame is None:
+            return None
+        h, w = frame.shape[:2]
+        try:
+            win = pyautogui.getActiveWindow()
+            off_x, off_y = self._offset()
+            rect = clip_rect((win.left - off_x, win.top - off_y, win.width, win.height), w, h)
+            if rect is not None:
+                return rect
+        except Exception:
+            pass
+        return (0, 0, w, h)
+
+    def target_window(self):
+        """
+        The window zones are resolved against: the foreground window, or
+        None when that is the assistant's own GUI (voice commands usually
+        leave it in front) and zones would only crop the wrong window.
+        """
+        try:
+            hwnd = getattr(pyautogui.getActiveWindow(), "_hWnd", None)
+            if hwnd:
+                pid = ctypes.c_ulong()
+                ctypes.windll.user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+                if pid.value == os.getpid():
+                    return None
+        except Exception:
+            pass
+        return self.active_window()
+
+    def zone_rect(self, zone: str):
+        """
+        Absolute screen rectangle currently searched for `zone` (narrowest
+        first), or None when zones do not apply (see target_window).
+        """
+        window = self.target_window()
+        if window is None:
+            return None
+        frame = self._snapshot[1]
+        rect = clip_rect(self.zones.rects(zone, window)[0], frame.shape[1], frame.shape[0])
+        if rect is None:
+            return None
+        off_x, off_y = self._offset()
+        return (rect[0] + off_x, rect[1] + off_y, rect[2], rect[3])
+
+    def find_text(self, query: str, threshold: float = 0.75, roi=None, zone=None):
+        """
+        OCR the frame, fuzzy-match `query` against each text box.
+        Returns the center coords of the best match if above threshold.
 
+        roi:  (left, top, width, height) in absolute screen coordinates;
+              only that region is OCR'd.
+        zone: a named zone of the active window ("sidebar", "header",
+              "content", "action bar"). Only the narrowest rectangle (where
+              matches were found before, else the default zone) is read;
+              a miss there reads the whole frame once. When the assistant's
+              own GUI is in front, the whole frame is read directly.
+        """
+        if zone is not None:
+            window = self.target_window()
+            if window is None:
+                return self._find_in(query, threshold, None)[0]
+            rect = self.zones.rects(zone, window)[0]
+            result, best = self._find_in(query, threshold, rect)
+            if not result:
+                # The whole frame covers the default zone too, so it is not read separately.
+                result, best = self._find_in(query, threshold, None)
+                default = self.zones.default_rect(zone, window)
+                if result and not (default[0] <= best['left'] and best['left'] + best['width'] <= default[0] + default[2]
+                                   and default[1] <= best['top'] and best['top'] + best['height'] <= default[1] + default[3]):
+                    return result # Outside the zone: not learned.
+            if result:
+                self.zones.learn(zone, window, (best['left'], best['top'], best['width'], best['height']))
+            return result
+        rect = None
+        if roi is not None:
+            off_x, off_y = self._offset()
+            rect = (roi[0] - off_x, roi[1] - off_y, roi[2], roi[3])
+        return self._find_in(query, threshold, rect)[0]
+
+    def wait_for_text(self, query: str, timeout: float = 5.0, threshold: float = 0.75, roi=None, zone=None):
+        """
+        Block until `query` is found on screen (see find_text) or `timeout`
+        seconds pass. Each newly captured frame is checked once, as soon as
+        it arrives; returns the match or None. Whole-frame waits skip the
+        full scoring while the frame's text index rules the query out.
+        """
+        deadline = time.monotonic() + timeout
+        self.wake()
+        while True:
+            seen = self.frame_id
+            if roi is None and zone is None:
+                text = self.read_text()
+                likely = text is not None and text.index.matches(query, min(threshold, 0.65))  # find_text's effective threshold
+                result = self.find_text(query, threshold) if likely else None
+            else:
+                result = self.find_text(query, threshold, roi=roi, zone=zone)
+            remaining = deadline - time.monotonic()
+            if result or remaining <= 0 or not self.running:
+                return result
+            with self._frame_cond:
+                self._frame_cond.wait_for(lambda: self.frame_id != seen or not self.running, timeout=remaining)
+
+    def nearest_text(self, x: int, y: int, query: str | None = None, max_distance: float | None = None):
+        """
+        The OCR word closest to absolute screen point (x, y), optionally only
+        words sharing a token with `query`. Returns center coords, text and
+        distance, or None.
+        """
+        text = self.read_text()
+        if text is None:
+            return None
+        off_x, off_y = self._offset()
+        box, distance = text.index.nearest(x - off_x, y - off_y, query, max_distance)
+        if box is None:
+            return None
+        return {'x': box['left'] + box['width'] // 2 + off_x, 'y': box['top'] + box['height'] // 2 + off_y,
+                'text': box['text'], 'distance': distance}
+
+    def _find_in(self, query: str, threshold: float, rect=None):
+        """
+        find_text over the frame or `rect` (frame coordinates); returns
+        (result, best candidate) or (None, None).
+        """
+        text = self.read_text(rect)
+        if text is None:
+            return None, None
+        proc_img = text.image
+
+        candidates = text.candidates
         q = (query or "").lower().strip()
         q_tokens = [w for w in q.split() if len(w) >= 3]
-        scored = []
-        for b in candidates:
-            t = b['text'].lower().strip()
-            score = difflib.SequenceMatcher(None, t, q).ratio()
-            if q in t:
-                score = max(score, 0.90)
-            # Token overlap bonus for multi-word queries
-            if q_tokens:
-                overlap = sum(1 for w in q_tokens if w in t)
-                score = max(score, overlap / max(1, len(q_tokens)))
-            # Penalize extremely long lines to reduce misclick on merged UI strings
-            try:
-                line_width = b.get('width', 0)
-                img_w = proc_img.shape[1]
-                if line_width and img_w and line_width > 0.8 * img_w:
-                    score *= 0.9
-            except Exception:
-                pass
-            scored.append((score, b))
-            if score > best_score:
-                best_score, best = score, b
+
+        # Score every word and line in one batch
+        scores = text.score(q)
+        best, best_score = None, 0.0
+        if len(scores):
+            i = int(np.argmax(scores))
+            if scores[i] > 0:
+                best, best_score = candidates[i], float(scores[i])
 
         # Slightly lower default threshold to 0.65 to accommodate OCR noise
         eff_threshold = min(threshold, 0.65)
         # Debug prints and overlay save
         if self.debug:
-            top = sorted(scored, key=lambda x: x[0], reverse=True)[:10]
+            top = [(float(scores[i]), candidates[i]) for i in np.argsort(-scores, kind='stable')[:10]]
             print("[ScreenMonitor] OCR candidates for query:", q)
             for i, (s, b) in enumerate(top, 1):
                 print(f"  {i:02d}. score={s:.3f} text='{b['text']}' box=({b['left']},{b['top']},{b['width']},{b['height']})")
             try:
                 dbg_img = proc_img.copy()
+                ox, oy = text.origin  # boxes are in frame coordinates; the image may be a crop
                 # Draw top candidates
                 for (s, b) in top:
                     color = (0, 255, 255)
-                    cv2.rectangle(dbg_img, (b['left'], b['top']), (b['left']+b['width'], b['top']+b['height']), color, 2)
-                    cv2.putText(dbg_img, f"{s:.2f}", (b['left'], max(0, b['top']-5)), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1, cv2.LINE_AA)
+                    cv2.rectangle(dbg_img, (b['left']-ox, b['top']-oy), (b['left']-ox+b['width'], b['top']-oy+b['height']), color, 2)
+                    cv2.putText(dbg_img, f"{s:.2f}", (b['left']-ox, max(0, b['top']-oy-5)), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1, cv2.LINE_AA)
                 # Highlight best in green if exists
                 if best is not None:
-                    cv2.rectangle(dbg_img, (best['left'], best['top']), (best['left']+best['width'], best['top']+best['height']), (0,255,0), 2)
+                    cv2.rectangle(dbg_img, (best['left']-ox, best['top']-oy), (best['left']-ox+best['width'], best['top']-oy+best['height']), (0,255,0), 2)
                 ts = int(time.time()*1000)
                 out_path = os.path.join(self.debug_dir or ".", f"ocr_debug_{ts}.png")
                 cv2.imwrite(out_path, dbg_img)
@@ -212,73 +387,71 @@ class ScreenMonitorService(threading.Thread):
                     cx = (min_left + max_right) // 2
                     cy = (min_top + max_bottom) // 2
             # Convert to absolute screen coordinates using region offset
-            off_x = int(self.region.get('left', 0)) if isinstance(self.region, dict) else 0
-            off_y = int(self.region.get('top', 0))  if isinstance(self.region, dict) else 0
-            return {'x': cx + off_x, 'y': cy + off_y, 'text': best['text']}
+            off_x, off_y = self._offset()
+            return {'x': cx + off_x, 'y': cy + off_y, 'text': best['text']}, best
 
-        return None
+        return None, None
 
-    def match_template(self, name: str, threshold: float = 0.8):
+    def _pyramid(self):
         """
-        Run template matching on the latest frame.
-        `name` is the filename under screen_monitor/templates/.
-        Returns center coords and match score.
+        FramePyramid of the latest frame, reused until a new frame is captured.
         """
-        img = self.capture()
+        frame_id, img = self._fresh_snapshot()
         if img is None:
             return None
+        with self._pyramid_lock:
+            cached_id, pyramid = self._pyramid_cache
+            if cached_id != frame_id:
+                pyramid = FramePyramid(img)
+                self._pyramid_cache = (frame_id, pyramid)
+        return pyramid
 
-        # Convert to BGR if BGRA to match common template formats
-        if img.ndim == 3 and img.shape[2] == 4:
-            proc_img = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
-        else:
-            proc_img = img
-
-        result = self.matcher.match(proc_img, name, threshold=threshold)
+    def _to_screen(self, result, dx=0, dy=0):
         if result:
-            off_x = int(self.region.get('left', 0)) if isinstance(self.region, dict) else 0
-            off_y = int(self.region.get('top', 0))  if isinstance(self.region, dict) else 0
-            result['x'] += off_x
-            result['y'] += off_y
+            off_x, off_y = self._offset()
+            result['x'] += dx + off_x
+            result['y'] += dy + off_y
         return result
 
-    def match_template_near(self, name: str, center_x: int, center_y: int, search_radius: int = 400, threshold: float = 0.8):
+    def match_template(self, name: str, threshold: float = 0.8, edges: bool = False):
         """
-        Run template matching but only within a square region around (center_x, center_y).
-        This improves reliability for small UI icons like the three-dot menu on a tile.
-        Returns absolute screen coords and match score if found, else None.
+        Run template matching on the latest frame.
+        `name` is the filename under screen_monitor/templates/.
+        Returns center coords, match score and the display scale it matched at.
         """
-        img = self.capture()
-        if img is None:
+        pyramid = self._pyramid()
+        if pyramid is None:
             return None
+        return self._to_screen(self.matcher.match(pyramid, name, threshold=threshold, edges=edges))
 
-        # Convert to BGR if BGRA to match common template formats
-        if img.ndim == 3 and img.shape[2] == 4:
-            proc_img = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
-        else:
-            proc_img = img
-
-        h, w = proc_img.shape[:2]
-        x1 = max(0, center_x - search_radius)
-        y1 = max(0, center_y - search_radius)
-        x2 = min(w, center_x + search_radius)
-        y2 = min(h, center_y + search_radius)
+    def match_templates(self, names, threshold: float = 0.8, edges: bool = False):
+        """
+        Match several templates on the same frame. Returns {name: result or None}.
+        """
+        pyramid = self._pyramid()
+        if pyramid is None:
+            return {name: None for name in names}
+        results = self.matcher.match_many(pyramid, names, threshold=threshold, edges=edges)
+        return {name: self._to_screen(result) for name, result in results.items()}
 
-        roi = proc_img[y1:y2, x1:x2]
-        if roi.size == 0:
+    def match_template_near(self, name: str, center_x: int, center_y: int, search_radius: int = 400,
+                            threshold: float = 0.8, edges: bool = False):
+        """
+        Run template matching but only within a square region around (center_x, center_y).
+        This improves reliability for small UI icons like the three-dot menu on a tile.
+        Returns absolute screen coords and match score if found, else None.
+        """
+        pyramid = self._pyramid()
+        if pyramid is None:
             return None
 
-        local = self.matcher.match(roi, name, threshold=threshold)
-        if not local:
+        rect = clip_rect((center_x - search_radius, center_y - search_radius, 2 * search_radius, 2 * search_radius),
+                         pyramid.width, pyramid.height)
+        if rect is None:
             return None
 
-        off_x = int(self.region.get('left', 0)) if isinstance(self.region, dict) else 0
-        off_y = int(self.region.get('top', 0))  if isinstance(self.region, dict) else 0
-
-        # Translate local coords back to absolute
-        local['x'] += x1 + off_x
-        local['y'] += y1 + off_y
-        return local
+        # Only the search square is converted; results are already in frame coordinates
+        return self._to_screen(self.matcher.match(pyramid, name, threshold=threshold, rect=rect, edges=edges))
 
     def click_at(self, x: int, y: int):
         """
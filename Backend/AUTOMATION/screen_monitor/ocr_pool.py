@@ -0,0 +1,119 @@
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytesseract
+from pytesseract import Output
+
+from .ocr_processor import TESSERACT_CMD, boxes_from_data
+
+# Shared-memory blocks attached in this worker process, by name.
+_attached = {}
+
+
+def _init_worker(cmd):
+    pytesseract.pytesseract.tesseract_cmd = cmd
+    # One thread per Tesseract run; the pool provides the parallelism.
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+def _attach(name):
+    shm = _attached.get(name)
+    if shm is None:
+        for old in _attached.values():
+            old.close()
+        _attached.clear()
+        shm = shared_memory.SharedMemory(name=name)
+        _attached[name] = shm
+    return shm
+
+
+def _ocr_tile(name, shape, top, bottom, keep_top, keep_bottom, confidence):
+    """
+    OCR rows top..bottom of the grayscale frame in shared memory `name`.
+    Returns boxes in frame coordinates whose vertical center lies in
+    keep_top..keep_bottom, so words in the overlap are reported by one tile only.
+    """
+    frame = np.ndarray(shape, dtype=np.uint8, buffer=_attach(name).buf)
+    tile  = np.array(frame[top:bottom])  # Tesseract gets its own copy of the rows
+    data  = pytesseract.image_to_data(tile, output_type=Output.DICT)
+    boxes = boxes_from_data(data, confidence, dy=top)
+    return [b for b in boxes if keep_top <= b['top'] + b['height'] / 2 < keep_bottom]
+
+
+class OCRPool:
+    """
+    Runs Tesseract on horizontal tiles of a frame in `workers` processes.
+    The grayscale frame is copied once into a shared-memory block that the
+    workers map, so only tile coordinates and boxes cross the process
+    boundary. Neighbouring tiles overlap by `overlap` rows so a line cut by
+    a tile edge is read whole by one of them.
+    """
+
+    def __init__(self, workers: int, confidence: float = 60, overlap: int = 64, min_tile_height: int = 240):
+        self.workers         = workers
+        self.confidence      = confidence
+        self.overlap         = overlap
+        self.min_tile_height = min_tile_height
+        self._lock     = threading.Lock()
+        self._executor = None
+        self._shm      = None
+        atexit.register(self.close)
+
+    def worth_splitting(self, gray) -> bool:
+        return gray.shape[0] >= 2 * self.min_tile_height
+
+    def _ensure(self, nbytes):
+        # Caller holds the lock.
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(pytesseract.pytesseract.tesseract_cmd or TESSERACT_CMD,))
+        if self._shm is None or self._shm.size < nbytes:
+            self._release_shm()
+            self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        return self._shm
+
+    def _release_shm(self):
+        if self._shm is not None:
+            self._shm.close()
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+            self._shm = None
+
+    def tiles(self, height):
+        """
+        (top, bottom, keep_top, keep_bottom) per tile: the rows read and the
+        rows whose words the tile reports.
+        """
+        count = max(1, min(self.workers, height // self.min_tile_height))
+        edges = [round(i * height / count) for i in range(count + 1)]
+        return [(max(0, edges[i] - self.overlap), min(height, edges[i + 1] + self.overlap), edges[i], edges[i + 1])
+                for i in range(count)]
+
+    def ocr(self, gray):
+        """
+        Word boxes for a grayscale frame, read tile by tile in parallel.
+        """
+        with self._lock:
+            shm = self._ensure(gray.nbytes)
+            frame = np.ndarray(gray.shape, dtype=np.uint8, buffer=shm.buf)
+            np.copyto(frame, gray)
+            del frame  # Do not keep a view on the buffer; it may be replaced later.
+            futures = [self._executor.submit(_ocr_tile, shm.name, gray.shape, *tile, self.confidence)
+                       for tile in self.tiles(gray.shape[0])]
+            boxes = []
+            for future in futures:
+                boxes.extend(future.result())
+        return boxes
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self._release_shm()
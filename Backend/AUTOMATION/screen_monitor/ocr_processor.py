@@ -1,37 +1,364 @@
+import hashlib
+import threading
+
 import cv2
+import numpy as np
 import pytesseract
 from pytesseract import Output
 
+from .text_index    import TextIndex
+from .text_matching import score_candidates
+
+# Adjust path below if Tesseract sits elsewhere
+TESSERACT_CMD = r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe"
+
+
+def boxes_from_data(data, confidence, dx=0, dy=0):
+    """
+    Word boxes above `confidence` from pytesseract's image_to_data dict,
+    shifted by (dx, dy).
+    """
+    boxes = []
+    n     = len(data['text'])
+
+    for i in range(n):
+        txt  = data['text'][i].strip()
+        conf = float(data['conf'][i] or -1)
+        if txt and conf >= confidence:
+            boxes.append({
+                'text':  txt,
+                'left':  data['left'][i] + dx,
+                'top':   data['top'][i] + dy,
+                'width': data['width'][i],
+                'height':data['height'][i],
+                'conf':  conf
+            })
+
+    return boxes
+
+
 class OCRProcessor:
     """
     Wraps Tesseract OCR to emit bounding boxes of text above a
-    confidence threshold.
+    confidence threshold. With `workers` > 1, large images are split into
+    horizontal tiles that an OCRPool reads in parallel processes.
     """
 
-    def __init__(self, confidence: float = 60):
+    def __init__(self, confidence: float = 60, workers: int = 1):
         self.conf = confidence
-        # Adjust path below if Tesseract sits elsewhere
-        pytesseract.pytesseract.tesseract_cmd = (
-            r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe"
-        )
+        pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+        self.pool = None
+        if workers > 1:
+            from .ocr_pool import OCRPool
+            self.pool = OCRPool(workers, confidence=confidence)
 
     def ocr_image(self, img):
         gray  = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        if self.pool is not None and self.pool.worth_splitting(gray):
+            try:
+                return self.pool.ocr(gray)
+            except Exception as e:
+                print(f"[ScreenMonitor] OCR pool failed, reading in-process: {e}")
         data  = pytesseract.image_to_data(gray, output_type=Output.DICT)
-        boxes = []
-        n     = len(data['text'])
-
-        for i in range(n):
-            txt  = data['text'][i].strip()
-            conf = float(data['conf'][i] or -1)
-            if txt and conf >= self.conf:
-                boxes.append({
-                    'text':  txt,
-                    'left':  data['left'][i],
-                    'top':   data['top'][i],
-                    'width': data['width'][i],
-                    'height':data['height'][i],
-                    'conf':  conf
-                })
-
-        return boxes
\ No newline at end of file
+        return boxes_from_data(data, self.conf)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+
+
+def group_lines(boxes):
+    """
+    Aggregate word boxes into approximate text lines to support multi-word
+    titles. Each line keeps its constituent words (left-ordered) under 'words'.
+
+    Boxes are sorted by vertical midpoint and a new line starts when a box's
+    midpoint is more than max(10, 0.6 * the taller height) below the first
+    box of the current line, so a staircase of words does not chain into
+    one line; bounds are then reduced per line with array operations.
+    """
+    if not boxes:
+        return []
+    geom = np.array([(b['left'], b['top'], b['width'], b['height']) for b in boxes], dtype=np.int64)
+    mids = geom[:, 1] + geom[:, 3] / 2
+
+    order = np.argsort(mids, kind='stable')
+    sorted_mids = mids[order].tolist()
+    heights = geom[order, 3].tolist()
+    line_of = np.zeros(len(order), dtype=np.int64)
+    line, anchor_mid, anchor_height = 0, sorted_mids[0], heights[0]
+    for i in range(1, len(order)):
+        if sorted_mids[i] - anchor_mid > max(10, 0.6 * max(anchor_height, heights[i])):
+            line, anchor_mid, anchor_height = line + 1, sorted_mids[i], heights[i]
+        line_of[i] = line
+
+    # Order words by line, then left to right within a line
+    order = order[np.lexsort((geom[order, 0], line_of))]
+    line_of = np.sort(line_of)
+    starts = np.flatnonzero(np.concatenate(([True], line_of[1:] != line_of[:-1])))
+
+    g = geom[order]
+    lefts   = np.minimum.reduceat(g[:, 0], starts)
+    tops    = np.minimum.reduceat(g[:, 1], starts)
+    rights  = np.maximum.reduceat(g[:, 0] + g[:, 2], starts)
+    bottoms = np.maximum.reduceat(g[:, 1] + g[:, 3], starts)
+
+    words = [{
+        'text': boxes[i]['text'],
+        'left': boxes[i]['left'],
+        'top': boxes[i]['top'],
+        'width': boxes[i]['width'],
+        'height': boxes[i]['height'],
+    } for i in order.tolist()]
+    ends = starts.tolist()[1:] + [len(words)]
+
+    lines = []
+    for k, (start, end) in enumerate(zip(starts.tolist(), ends)):
+        members = words[start:end]
+        lines.append({
+            'text': " ".join(w['text'] for w in members),
+            'left': int(lefts[k]),
+            'top': int(tops[k]),
+            'width': int(rights[k] - lefts[k]),
+            'height': int(bottoms[k] - tops[k]),
+            'words': members,
+        })
+    return lines
+
+
+def to_bgr(img):
+    """
+    mss frames are BGRA; OCR and template matching expect BGR.
+    """
+    if img.ndim == 3 and img.shape[2] == 4:
+        return cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+    return img
+
+
+def frame_digest(img) -> bytes:
+    """
+    Content hash of a frame, used to recognize an unchanged screen.
+    """
+    return hashlib.blake2b(np.ascontiguousarray(img).data, digest_size=16).digest()
+
+
+class FrameText:
+    """
+    OCR output for one frame (or one region of it): word boxes in frame
+    coordinates, the lines built from them, and the BGR image they were read
+    from, whose top-left corner sits at `origin` in the frame. Treat as
+    read-only; it is shared between every query against the same frame.
+    """
+
+    def __init__(self, image, boxes, origin=(0, 0), frame_width=None, index=None):
+        self.image       = image
+        self.origin      = origin
+        self.frame_width = frame_width or image.shape[1]
+        self.boxes       = boxes
+        self.lines      = group_lines(boxes)
+        self.candidates = boxes + self.lines  # try both words and reconstructed lines
+        # Per-candidate data reused by every query against this frame
+        self.texts      = [c['text'].lower().strip() for c in self.candidates]
+        self.widths     = np.array([c.get('width', 0) for c in self.candidates], dtype=np.float32)
+        self._index     = index
+
+    @property
+    def index(self):
+        """
+        TextIndex over the word boxes, built on first use.
+        """
+        if self._index is None:
+            self._index = TextIndex(self.boxes)
+        return self._index
+
+    def score(self, query: str):
+        """
+        Match scores of `query` against every candidate (see score_candidates).
+        """
+        return score_candidates(query, self.texts, self.widths, self.frame_width)
+
+    def within(self, rect):
+        """
+        The part of this result whose word centers fall inside `rect` (left, top, width, height).
+        """
+        x, y, w, h = rect
+        ox, oy = self.origin
+        boxes = [b for b in self.boxes
+                 if x <= b['left'] + b['width'] / 2 < x + w and y <= b['top'] + b['height'] / 2 < y + h]
+        image = self.image[max(0, y - oy):max(0, y + h - oy), max(0, x - ox):max(0, x + w - ox)]
+        return FrameText(image, boxes, origin=(max(x, ox), max(y, oy)), frame_width=self.frame_width)
+
+
+def _box_rect(b):
+    return (b['left'], b['top'], b['width'], b['height'])
+
+
+def _overlaps(a, b):
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+def _union(a, b):
+    left, top = min(a[0], b[0]), min(a[1], b[1])
+    right, bottom = max(a[0] + a[2], b[0] + b[2]), max(a[1] + a[3], b[1] + b[3])
+    return (left, top, right - left, bottom - top)
+
+
+def merge_rects(rects):
+    """
+    Merge overlapping (left, top, width, height) rectangles until none overlap.
+    """
+    rects = list(rects)
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(rects)):
+            for j in range(i + 1, len(rects)):
+                if _overlaps(rects[i], rects[j]):
+                    rects[i] = _union(rects[i], rects.pop(j))
+                    merged = True
+                    break
+            if merged:
+                break
+    return rects
+
+
+class OCRCache:
+    """
+    Memoizes OCR for the most recent frame. A frame is recognized by its
+    capture id and, when the id changed, by a hash of its pixels, so any
+    number of queries against an unchanged screen cost one Tesseract pass.
+    When the caller can say which regions changed since the last full pass,
+    only those regions are read again (up to `max_regions` regions covering
+    at most `max_fraction` of the frame; beyond that a full pass is cheaper).
+    Region-of-interest reads OCR just the crop, or filter the full result
+    when the frame was already read whole.
+    """
+
+    def __init__(self, ocr: OCRProcessor, max_regions: int = 4, max_fraction: float = 0.4, margin: int = 8):
+        self.ocr           = ocr
+        self.max_regions   = max_regions
+        self.max_fraction  = max_fraction
+        self.margin        = margin
+        self.passes        = 0
+        self.partial       = 0
+        self.region_passes = 0
+        self.hits          = 0
+        self._lock         = threading.Lock()
+        self._frame_id     = None
+        self._digest       = None
+        self._result       = None  # full-frame result for the current frame
+        self._regions      = {}    # rect -> result for the current frame
+        self._base_id      = None  # frame of the last full result, for partial updates
+        self._base         = None
+
+    @property
+    def frame_id(self):
+        return self._frame_id
+
+    def _advance(self, frame_id, img):
+        """
+        Caller holds the lock. Make `img` the current frame, dropping results
+        of the previous one unless the pixels are identical.
+        """
+        if frame_id == self._frame_id:
+            return
+        digest = frame_digest(img)
+        self._frame_id = frame_id
+        if digest == self._digest:
+            return
+        self._digest  = digest
+        self._result  = None
+        self._regions = {}
+
+    def _read_regions(self, proc_img, regions):
+        """
+        (boxes, removed, added) for `proc_img`: the last full result with
+        `regions` read again, or None when a full pass is the better choice.
+        """
+        h, w = proc_img.shape[:2]
+        old = self._base.boxes
+        rects = [(max(0, x - self.margin), max(0, y - self.margin),
+                  min(w, x + rw + self.margin) - max(0, x - self.margin),
+                  min(h, y + rh + self.margin) - max(0, y - self.margin)) for x, y, rw, rh in regions]
+        # Grow regions over words they cut through so those are read again whole.
+        while True:
+            rects = merge_rects(rects)
+            grown = list(rects)
+            for b in old:
+                box = _box_rect(b)
+                for i, rect in enumerate(grown):
+                    if _overlaps(box, rect):
+                        grown[i] = _union(rect, box)
+            if grown == rects:
+                break
+            rects = grown
+        if len(rects) > self.max_regions or sum(r[2] * r[3] for r in rects) > self.max_fraction * w * h:
+            return None
+
+        boxes, removed, added = [], [], []
+        for b in old:
+            (removed if any(_overlaps(_box_rect(b), rect) for rect in rects) else boxes).append(b)
+        for x, y, rw, rh in rects:
+            for b in self.ocr.ocr_image(proc_img[y:y + rh, x:x + rw]):
+                b['left'] += x
+                b['top']  += y
+                added.append(b)
+        return boxes + added, removed, added
+
+    def read(self, frame_id, img, changed_since=None) -> FrameText:
+        """
+        OCR result for the whole of `img`. `changed_since(frame_id)`, when
+        given, returns the regions (left, top, width, height) that changed
+        since that frame, or None when unknown.
+        """
+        # The lock also makes concurrent queries wait for one OCR pass instead of starting their own.
+        with self._lock:
+            self._advance(frame_id, img)
+            if self._result is not None:
+                self.hits += 1
+                return self._result
+            proc_img = to_bgr(img)
+            update = None
+            if self._base is not None and changed_since is not None:
+                regions = changed_since(self._base_id)
+                if regions is not None and self._base.image.shape == proc_img.shape:
+                    update = self._read_regions(proc_img, regions)
+            if update is None:
+                self._result = FrameText(proc_img, self.ocr.ocr_image(proc_img))
+                self.passes += 1
+            else:
+                boxes, removed, added = update
+                # The text index follows the changed words instead of being rebuilt.
+                self._result = FrameText(proc_img, boxes, index=self._base.index.updated(removed, added))
+                self.partial += 1
+            self._base_id, self._base = frame_id, self._result
+            return self._result
+
+    def read_region(self, frame_id, img, rect) -> FrameText:
+        """
+        OCR result for `rect` (left, top, width, height, frame coordinates) of `img`.
+        """
+        with self._lock:
+            self._advance(frame_id, img)
+            if rect in self._regions:
+                self.hits += 1
+                return self._regions[rect]
+            if self._result is not None:
+                self.hits += 1
+                result = self._result.within(rect)
+            else:
+                x, y, w, h = rect
+                crop = to_bgr(img[y:y + h, x:x + w])
+                boxes = self.ocr.ocr_image(crop)
+                for b in boxes:
+                    b['left'] += x
+                    b['top']  += y
+                result = FrameText(crop, boxes, origin=(x, y), frame_width=img.shape[1])
+                self.region_passes += 1
+            self._regions[rect] = result
+            return result
+
+    def clear(self):
+        with self._lock:
+            self._frame_id = self._digest = self._result = self._base_id = self._base = None
+            self._regions = {}
@@ -1,39 +1,259 @@
 import os
+import threading
+
 import cv2
 import numpy as np
 
+# Display scale factors a template saved at 100% is searched at (Windows DPI settings)
+DEFAULT_SCALES = (1.0, 1.25, 1.5, 1.75, 2.0)
+
+
+def to_gray(img):
+    """
+    Single-channel view of a BGRA, BGR or already grayscale image.
+    """
+    if img.ndim == 2:
+        return img
+    if img.shape[2] == 4:
+        return cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY)
+    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+
+def edge_map(gray):
+    """
+    Gradient magnitude of a grayscale image; the same icon gives the same
+    edges on light and dark themes.
+    """
+    dx = cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=3)
+    dy = cv2.Sobel(gray, cv2.CV_32F, 0, 1, ksize=3)
+    return cv2.magnitude(dx, dy)
+
+
+def _shrink(img, factor):
+    h, w = img.shape[:2]
+    size = (max(1, int(round(w / factor))), max(1, int(round(h / factor))))
+    return cv2.resize(img, size, interpolation=cv2.INTER_AREA if factor > 1 else cv2.INTER_LINEAR)
+
+
+class ScaledTemplate:
+    """
+    One template at one display scale: full-resolution grayscale and edge
+    images, plus a grayscale copy `factor` times smaller for the coarse pass.
+    """
+
+    def __init__(self, gray, scale, factor):
+        self.scale  = scale
+        self.factor = factor
+        self.fine   = gray if scale == 1.0 else _shrink(gray, 1 / scale)
+        self.coarse = _shrink(self.fine, factor) if factor > 1 else self.fine
+        self.edges  = edge_map(self.fine)
+
+    @property
+    def shape(self):
+        return self.fine.shape
+
+
+class FramePyramid:
+    """
+    Grayscale copies of one frame, downsampled by 1, 2, 4, ...
+    Levels are built on first use and kept, so several lookups on the same
+    frame convert it once. A search inside a small rectangle shrinks only
+    that crop, and refinement converts only small windows around candidates.
+    """
+
+    def __init__(self, img):
+        self.img    = img
+        self.height, self.width = img.shape[:2]
+        self._levels = {}  # factor -> image
+
+    def level(self, factor):
+        level = self._levels.get(factor)
+        if level is None:
+            if factor == 1:
+                level = to_gray(self.img)
+            else:
+                half  = self._levels.get(factor // 2)
+                level = _shrink(half, 2) if half is not None else _shrink(self.level(1), factor)
+            self._levels[factor] = level
+        return level
+
+    def coarse(self, factor, left, top, right, bottom):
+        """
+        The rectangle downsampled by `factor`. Returns (image, left, top) with
+        the offset in downsampled pixels.
+        """
+        x1, y1 = left // factor, top // factor
+        x2, y2 = -(-right // factor), -(-bottom // factor)
+        whole = (right - left) * (bottom - top) > self.width * self.height // 4
+        if factor in self._levels or whole:
+            return self.level(factor)[y1:y2, x1:x2], x1, y1
+        crop = to_gray(self.img[y1 * factor:min(self.height, y2 * factor), x1 * factor:min(self.width, x2 * factor)])
+        return _shrink(crop, factor), x1, y1
+
+    def window(self, left, top, right, bottom, edges=False):
+        """
+        Full-resolution grayscale (or edge) crop, clipped to the frame.
+        Returns (image, left, top).
+        """
+        left, top = max(0, left), max(0, top)
+        right, bottom = min(self.width, right), min(self.height, bottom)
+        if 1 in self._levels:
+            gray = self._levels[1][top:bottom, left:right]
+        else:
+            gray = to_gray(self.img[top:bottom, left:right])
+        return (edge_map(gray) if edges else gray), left, top
+
+
 class TemplateMatcher:
     """
-    Caches small template images and runs OpenCV matchTemplate
-    to find icons (e.g. YouTube’s three-dot menu).
+    Finds icons (e.g. YouTube's three-dot menu) with OpenCV matchTemplate.
+    Templates are loaded once as grayscale and pre-scaled for every entry in
+    `scales`. A search runs on a frame downsampled so the template is about
+    `coarse_size` pixels, then re-checks the best `candidates` spots at full
+    resolution. The scale that matched last is tried first next time.
     """
 
-    def __init__(self, template_dir=None):
+    def __init__(self, template_dir=None, scales=DEFAULT_SCALES, coarse_size: int = 6,
+                 max_factor: int = 8, candidates: int = 5, coarse_margin: float = 0.2):
         base = os.path.dirname(__file__)
-        self.template_dir = template_dir or os.path.join(base, "templates")
-        self.cache = {}
+        self.template_dir  = template_dir or os.path.join(base, "templates")
+        self.scales        = tuple(scales)
+        self.coarse_size   = coarse_size    # smallest template side searched at the coarse level
+        self.max_factor    = max_factor     # most the frame is downsampled
+        self.candidates    = candidates     # coarse peaks re-checked at full resolution
+        self.coarse_margin = coarse_margin  # coarse scores may fall this far below the threshold
+        self.cache         = {}  # name -> [ScaledTemplate] or None
+        self._last_scale   = {}  # name -> scale of the last match
+        self._lock         = threading.Lock()
 
-    def _load(self, name):
-        if name not in self.cache:
-            path = os.path.join(self.template_dir, name)
-            tpl  = cv2.imread(path, cv2.IMREAD_UNCHANGED)
-            self.cache[name] = tpl
-        return self.cache.get(name)
-
-    def match(self, img, name, threshold=0.8):
-        tpl = self._load(name)
+    def _factor(self, shape):
+        factor = 1
+        while factor * 2 <= self.max_factor and min(shape) / (factor * 2) >= self.coarse_size:
+            factor *= 2
+        return factor
+
+    def _read(self, name):
+        path = os.path.join(self.template_dir, name)
+        tpl  = cv2.imread(path, cv2.IMREAD_UNCHANGED)
         if tpl is None:
             return None
+        if tpl.ndim == 3 and tpl.shape[2] == 4:
+            # Blend transparent pixels into a plain background that contrasts
+            # with the icon (white behind dark icons, black behind light ones)
+            # instead of matching the alpha channel as colour.
+            alpha = tpl[:, :, 3].astype(np.float32) / 255
+            gray  = to_gray(tpl[:, :, :3]).astype(np.float32)
+            if not alpha.any():
+                return None
+            background = 255.0 if (gray * alpha).sum() / alpha.sum() < 128 else 0.0
+            return np.clip(gray * alpha + background * (1 - alpha), 0, 255).astype(np.uint8)
+        return to_gray(tpl)
 
-        res = cv2.matchTemplate(img, tpl, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, max_loc = cv2.minMaxLoc(res)
+    def _load(self, name):
+        with self._lock:
+            if name not in self.cache:
+                gray = self._read(name)
+                if gray is None:
+                    print(f"[ScreenMonitor] Template not found or empty: {name}")
+                    self.cache[name] = None
+                else:
+                    scaled = []
+                    for scale in self.scales:
+                        h, w = gray.shape
+                        shape = (max(1, round(h * scale)), max(1, round(w * scale)))
+                        scaled.append(ScaledTemplate(gray, scale, self._factor(shape)))
+                    self.cache[name] = scaled
+            return self.cache[name]
+
+    def _match_scaled(self, frame, tpl, threshold, rect, edges):
+        """
+        Best full-resolution match of one scaled template inside `rect`
+        (left, top, width, height) of the frame, as (score, left, top).
+        """
+        left, top, width, height = rect
+        th, tw = tpl.shape
+        if th > height or tw > width:
+            return -1.0, 0, 0
+        f = tpl.factor
+
+        if f == 1:
+            region, x0, y0 = frame.window(left, top, left + width, top + height, edges)
+            res = cv2.matchTemplate(region, tpl.edges if edges else tpl.fine, cv2.TM_CCOEFF_NORMED)
+            _, score, _, loc = cv2.minMaxLoc(res)
+            return score, x0 + loc[0], y0 + loc[1]
+
+        # Coarse pass over the downsampled frame. Edge maps of a template
+        # this small are mostly noise, so edge matching finds its candidates
+        # in grayscale, where an inverted (dark theme) icon scores near -1.
+        coarse, cx1, cy1 = frame.coarse(f, left, top, left + width, top + height)
+        small  = tpl.coarse
+        if small.shape[0] > coarse.shape[0] or small.shape[1] > coarse.shape[1]:
+            return -1.0, 0, 0
+        res = cv2.matchTemplate(coarse, small, cv2.TM_CCOEFF_NORMED)
+        if edges:
+            res = np.abs(res)
+
+        # Re-check the strongest coarse peaks at full resolution
+        best = (-1.0, 0, 0)
+        sh, sw = small.shape
+        for _ in range(self.candidates):
+            _, peak, _, loc = cv2.minMaxLoc(res)
+            if peak < threshold - self.coarse_margin:
+                break
+            px, py = (cx1 + loc[0]) * f, (cy1 + loc[1]) * f
+            wx1, wy1 = max(left, px - 2 * f), max(top, py - 2 * f)
+            wx2, wy2 = min(left + width, px + tw + 2 * f), min(top + height, py + th + 2 * f)
+            region, x0, y0 = frame.window(wx1, wy1, wx2, wy2, edges)
+            if region.shape[0] >= th and region.shape[1] >= tw:
+                fine = cv2.matchTemplate(region, tpl.edges if edges else tpl.fine, cv2.TM_CCOEFF_NORMED)
+                _, score, _, floc = cv2.minMaxLoc(fine)
+                if score > best[0]:
+                    best = (score, x0 + floc[0], y0 + floc[1])
+            # Suppress this peak before looking for the next one
+            res[max(0, loc[1] - sh // 2):loc[1] + sh // 2 + 1, max(0, loc[0] - sw // 2):loc[0] + sw // 2 + 1] = -1.0
+        return best
 
-        if max_val >= threshold:
-            h, w = tpl.shape[:2]
-            return {
-                'x': int(max_loc[0] + w/2),
-                'y': int(max_loc[1] + h/2),
-                'score': float(max_val)
-            }
+    def match(self, img, name, threshold=0.8, rect=None, edges=False):
+        """
+        Find template `name` in `img` (a frame array or a FramePyramid),
+        optionally only inside `rect` (left, top, width, height). With
+        `edges`, candidates are verified on gradient maps, so the icon is
+        found on light and dark themes alike.
+        Returns {'x', 'y', 'score', 'scale'} for the match center, or None.
+        """
+        scaled = self._load(name)
+        if not scaled:
+            return None
+        frame = img if isinstance(img, FramePyramid) else FramePyramid(img)
+        rect  = rect or (0, 0, frame.width, frame.height)
+
+        # Try the scale that matched last time first
+        last  = self._last_scale.get(name)
+        order = sorted(scaled, key=lambda t: t.scale != last)
+        best, best_tpl = (-1.0, 0, 0), None
+        for tpl in order:
+            found = self._match_scaled(frame, tpl, threshold, rect, edges)
+            if found[0] > best[0]:
+                best, best_tpl = found, tpl
+            if tpl.scale == last and found[0] >= threshold:
+                break
+
+        score, x, y = best
+        if best_tpl is None or score < threshold:
+            return None
+        self._last_scale[name] = best_tpl.scale
+        h, w = best_tpl.shape
+        return {
+            'x': int(x + w / 2),
+            'y': int(y + h / 2),
+            'score': float(score),
+            'scale': best_tpl.scale,
+        }
 
-        return None
\ No newline at end of file
+    def match_many(self, img, names, threshold=0.8, rect=None, edges=False):
+        """
+        Match several templates against one frame, sharing its downsampled
+        copies. Returns {name: result or None}.
+        """
+        frame = img if isinstance(img, FramePyramid) else FramePyramid(img)
+        return {name: self.match(frame, name, threshold=threshold, rect=rect, edges=edges) for name in names}
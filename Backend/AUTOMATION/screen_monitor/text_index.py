@@ -0,0 +1,149 @@
+import math
+import re
+
+from .text_matching import score_candidates
+
+_token = re.compile(r"[a-z0-9]+")
+
+
+def normalize_tokens(text: str):
+    """
+    Lowercase alphanumeric tokens of `text` ("Watch later!" -> ["watch", "later"]).
+    """
+    return _token.findall((text or "").lower())
+
+
+def _center(box):
+    return box['left'] + box['width'] / 2, box['top'] + box['height'] / 2
+
+
+class TextIndex:
+    """
+    Lookup structures over the word boxes of one frame: normalized token ->
+    boxes, and a grid of `cell`-pixel buckets for nearest-text queries.
+    Postings are tuples shared between successive indexes; updated() copies
+    only the top-level maps and rewrites the entries touched by changed
+    words, so an index follows dirty-region OCR without a rebuild.
+    """
+
+    def __init__(self, boxes=(), cell: int = 128):
+        self.cell   = cell
+        self.tokens = {}  # token -> tuple of boxes
+        self.grid   = {}  # (col, row) -> tuple of boxes
+        self.count  = 0
+        for box in boxes:
+            self._add(box)
+
+    def _cell_of(self, box):
+        cx, cy = _center(box)
+        return int(cx // self.cell), int(cy // self.cell)
+
+    def _add(self, box):
+        for token in set(normalize_tokens(box['text'])):
+            self.tokens[token] = self.tokens.get(token, ()) + (box,)
+        key = self._cell_of(box)
+        self.grid[key] = self.grid.get(key, ()) + (box,)
+        self.count += 1
+
+    def _remove(self, box):
+        for token in set(normalize_tokens(box['text'])):
+            kept = tuple(b for b in self.tokens.get(token, ()) if b is not box)
+            if kept:
+                self.tokens[token] = kept
+            else:
+                self.tokens.pop(token, None)
+        key = self._cell_of(box)
+        kept = tuple(b for b in self.grid.get(key, ()) if b is not box)
+        if kept:
+            self.grid[key] = kept
+        else:
+            self.grid.pop(key, None)
+        self.count -= 1
+
+    def updated(self, removed, added):
+        """
+        A new index with `removed` boxes dropped and `added` boxes inserted; this one is unchanged.
+        """
+        index = TextIndex(cell=self.cell)
+        index.tokens = dict(self.tokens)
+        index.grid   = dict(self.grid)
+        index.count  = self.count
+        for box in removed:
+            index._remove(box)
+        for box in added:
+            index._add(box)
+        return index
+
+    def lookup(self, token: str):
+        """
+        Boxes whose text contains the normalized `token`.
+        """
+        return self.tokens.get(token.lower(), ())
+
+    def contains(self, query: str) -> bool:
+        """
+        True when every token of `query` appears somewhere on the frame.
+        """
+        tokens = normalize_tokens(query)
+        return bool(tokens) and all(t in self.tokens for t in tokens)
+
+    def matches(self, query: str, threshold: float, margin: float = 0.1) -> bool:
+        """
+        Cheap pre-check for find_text: scores each token of `query` against
+        the frame's distinct tokens only. False when even the best tokens,
+        averaged by length, stay `margin` below `threshold`, so no word or
+        line is likely to match.
+        """
+        tokens = normalize_tokens(query)
+        if not tokens or self.contains(query):
+            return True
+        vocab = list(self.tokens)
+        if not vocab:
+            return False
+        total = weighted = 0.0
+        for token in tokens:
+            best = 1.0 if token in self.tokens else float(score_candidates(token, vocab).max())
+            total    += len(token)
+            weighted += len(token) * best
+        return weighted / total >= threshold - margin
+
+    def nearest(self, x: float, y: float, query: str | None = None, max_distance: float | None = None):
+        """
+        The word box closest to (x, y) in frame coordinates, optionally only
+        among boxes sharing a token with `query`. Returns (box, distance) or (None, None).
+        """
+        if query:
+            pool = {id(b): b for t in normalize_tokens(query) for b in self.lookup(t)}
+            return self._closest(pool.values(), x, y, max_distance)
+        if not self.grid:
+            return None, None
+
+        # Search rings of grid cells outward until the best box cannot be beaten.
+        col, row = int(x // self.cell), int(y // self.cell)
+        cols = [c for c, _ in self.grid]
+        rows = [r for _, r in self.grid]
+        max_ring = max(abs(col - min(cols)), abs(col - max(cols)), abs(row - min(rows)), abs(row - max(rows)))
+        best, best_distance = None, math.inf
+        for ring in range(max_ring + 1):
+            if best is not None and (ring - 1) * self.cell > best_distance:
+                break
+            if max_distance is not None and (ring - 1) * self.cell > max_distance:
+                break
+            for c in range(col - ring, col + ring + 1):
+                for r in range(row - ring, row + ring + 1):
+                    if max(abs(c - col), abs(r - row)) != ring:
+                        continue
+                    box, distance = self._closest(self.grid.get((c, r), ()), x, y, max_distance)
+                    if box is not None and distance < best_distance:
+                        best, best_distance = box, distance
+        return (best, best_distance) if best is not None else (None, None)
+
+    @staticmethod
+    def _closest(boxes, x, y, max_distance=None):
+        best, best_distance = None, math.inf
+        for box in boxes:
+            cx, cy = _center(box)
+            distance = math.hypot(cx - x, cy - y)
+            if distance < best_distance and (max_distance is None or distance <= max_distance):
+                best, best_distance = box, distance
+        return (best, best_distance) if best is not None else (None, None)
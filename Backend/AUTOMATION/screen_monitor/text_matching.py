@@ -0,0 +1,55 @@
+import difflib
+
+import numpy as np
+
+# RapidFuzz scores every candidate in one C call; without it difflib's
+# SequenceMatcher gives the same ratios one candidate at a time.
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    fuzz = process = None
+
+HAVE_RAPIDFUZZ = process is not None
+
+
+def sequence_similarity(query: str, texts) -> np.ndarray:
+    """
+    SequenceMatcher.ratio of each text against `query`; the query's
+    matching tables are built once and reused for every text.
+    """
+    matcher = difflib.SequenceMatcher(None)
+    matcher.set_seq2(query)
+    scores = np.empty(len(texts), dtype=np.float32)
+    for i, text in enumerate(texts):
+        matcher.set_seq1(text)
+        scores[i] = matcher.ratio()
+    return scores
+
+
+def score_candidates(query: str, texts, widths=None, frame_width: int = 0) -> np.ndarray:
+    """
+    Score lowercased candidate `texts` against `query` in one batch:
+    fuzzy similarity, raised to 0.9 when the query is a substring, raised to
+    the fraction of query tokens (3+ letters) present, and scaled by 0.9 for
+    candidates wider than 80% of the frame (merged UI strings).
+    """
+    q = (query or "").lower().strip()
+    if not len(texts):
+        return np.zeros(0, dtype=np.float32)
+
+    if process is not None:
+        scores = process.cdist([q], texts, scorer=fuzz.ratio, dtype=np.float32)[0] / 100.0
+    else:
+        scores = sequence_similarity(q, texts)
+
+    contains = np.fromiter((q in t for t in texts), dtype=bool, count=len(texts))
+    scores = np.where(contains, np.maximum(scores, 0.90), scores)
+
+    q_tokens = [w for w in q.split() if len(w) >= 3]
+    if q_tokens:
+        overlap = np.fromiter((sum(w in t for w in q_tokens) for t in texts), dtype=np.float32, count=len(texts))
+        scores = np.maximum(scores, overlap / len(q_tokens))
+
+    if widths is not None and frame_width:
+        scores = np.where(np.asarray(widths) > 0.8 * frame_width, scores * 0.9, scores)
+    return scores
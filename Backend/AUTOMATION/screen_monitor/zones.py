@@ -0,0 +1,122 @@
+import json
+import threading
+from pathlib import Path
+
+# Default zones as fractions (left, top, right, bottom) of the active window.
+DEFAULT_ZONES = {
+    "header":     (0.0, 0.0, 1.0, 0.12),
+    "sidebar":    (0.0, 0.06, 0.2, 1.0),
+    "content":    (0.1, 0.1, 1.0, 1.0),
+    "action bar": (0.0, 0.5, 0.75, 0.92),
+}
+
+
+def clip_rect(rect, width, height):
+    """
+    Clip (left, top, width, height) to a width x height frame; None if nothing is left.
+    """
+    x, y, w, h = (int(round(v)) for v in rect)
+    left, top = max(0, x), max(0, y)
+    right, bottom = min(width, x + w), min(height, y + h)
+    if right <= left or bottom <= top:
+        return None
+    return (left, top, right - left, bottom - top)
+
+
+class ZoneMap:
+    """
+    Named screen zones (sidebar, header, content, action bar) per window layout.
+    A zone starts as a fixed fraction of the window; every match found in it
+    narrows the zone to the area where its texts were seen (plus `margin`),
+    so later lookups OCR less. Learned zones are keyed by window size and
+    kept in `path` across runs.
+    """
+
+    def __init__(self, path=None, margin: int = 48, defaults=None):
+        self.path     = Path(path) if path else None
+        self.margin   = margin
+        self.defaults = dict(defaults or DEFAULT_ZONES)
+        self._lock    = threading.Lock()
+        self._learned = {}  # layout key -> zone -> [left, top, right, bottom] relative to the window
+        self._load()
+
+    def _load(self):
+        if self.path is None:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._learned = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[ScreenMonitor] Could not read zones: {e}")
+
+    def _save(self):
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._learned, f, indent=2)
+            tmp.replace(self.path)
+        except Exception as e:
+            print(f"[ScreenMonitor] Could not save zones: {e}")
+
+    @staticmethod
+    def layout_key(window):
+        return f"{window[2]}x{window[3]}"
+
+    def default_rect(self, name, window):
+        """
+        The zone's default rectangle in frame coordinates for `window` (left, top, width, height).
+        """
+        if name not in self.defaults:
+            raise KeyError(f"Unknown screen zone '{name}'")
+        wx, wy, ww, wh = window
+        l, t, r, b = self.defaults[name]
+        return (wx + int(l * ww), wy + int(t * wh), int((r - l) * ww), int((b - t) * wh))
+
+    def learned_rect(self, name, window):
+        """
+        The learned rectangle for the zone in this layout, or None.
+        """
+        with self._lock:
+            span = self._learned.get(self.layout_key(window), {}).get(name)
+        if not span:
+            return None
+        l, t, r, b = span
+        return (window[0] + l - self.margin, window[1] + t - self.margin, r - l + 2 * self.margin, b - t + 2 * self.margin)
+
+    def rects(self, name, window):
+        """
+        Rectangles to search for `name`, narrowest first.
+        """
+        default = self.default_rect(name, window)
+        learned = self.learned_rect(name, window)
+        return [learned, default] if learned and learned != default else [default]
+
+    def learn(self, name, window, box):
+        """
+        Widen the learned zone to cover `box` (left, top, width, height, frame coordinates).
+        """
+        l, t = box[0] - window[0], box[1] - window[1]
+        r, b = l + box[2], t + box[3]
+        with self._lock:
+            zones = self._learned.setdefault(self.layout_key(window), {})
+            span = zones.get(name)
+            new = [l, t, r, b] if not span else [min(span[0], l), min(span[1], t), max(span[2], r), max(span[3], b)]
+            if new == span:
+                return
+            zones[name] = new
+            self._save()
+
+    def forget(self, name=None, window=None):
+        with self._lock:
+            if window is None:
+                self._learned = {}
+            elif name is None:
+                self._learned.pop(self.layout_key(window), None)
+            else:
+                self._learned.get(self.layout_key(window), {}).pop(name, None)
+            self._save()
@@ -1,5 +1,7 @@
-from groq import Groq # Importing the Groq library to use its API.
-from json import load, dump # Importing functions to read and write JSON files.
+from Backend.CLIENTS.ClientRegistry import GroqClient # Import the shared, pooled Groq client.
+from Backend.CHAT_LOG.ChatLogStore import ChatLog # Import the shared append-only chat log.
+from Backend.CHAT_LOG.ContextWindow import ContextWindowBuilder # Import the token-budgeted context builder.
+from Backend.PIPELINE.Cancellation import Cancelled, NeverCancelled, IterateCancellable # Import turn cancellation helpers.
 import datetime # Importing the datetime module for real-time date and information.
 from dotenv import dotenv_values # Import dotenv to read environment variables from a .env file.
 
@@ -11,11 +13,15 @@ Username = env_vars.get("Username")
 Assistantname = env_vars.get("Assistantname")
 GroqAPIKey = env_vars.get("GroqAPIKey")
 
-# Initialize the Groq client using the provided API key.
-client = Groq(api_key=GroqAPIKey)
+# Get the shared Groq client (pooled keep-alive connections) for the provided API key.
+client = GroqClient(GroqAPIKey)
 
-# Initialize an empty list to store chat messages.
-messages = []
+# Build each prompt from the most recent turns that fit the token budget.
+Context = ContextWindowBuilder(
+    ChatLog,
+    budget_tokens=int(env_vars.get("ContextTokenBudget") or 3000),
+    max_turns=int(env_vars.get("ContextMaxTurns") or 20),
+)
 
 # Define a system message that provides context to the AI chatbot about its role and behavior.
 System = f"""Hello, I am {Username}, You are a very accurate and advanced AI chatbot named {Assistantname} which also has real-time up-to-date information from the internet.
@@ -24,19 +30,10 @@ System = f"""Hello, I am {Username}, You are a very accurate and advanced AI cha
 *** Do not provide notes in the output, just answer the question and never mention your training data. ***
 """
 
-# A list of system instructions for the chatbot.
-SystemChatBot = [
-    {"role": "user", "content": System}
-]
-
-# Attempt to load the chat log from a JSON file.
-try:
-    with open(r"Data\ChatLog.json", "r") as f:
-        messages = load(f)  # Load existing chat messages from the chat log.
-except FileNotFoundError:
-    # If the file doesn't exist, create an empty JSON file to store chat logs.
-    with open(r"Data\ChatLog.json", "w") as f:
-        dump([], f)
+# The system instructions for the chatbot, shared read-only by every request.
+SystemChatBot = (
+    {"role": "user", "content": System},
+)
 
 # Function to get real-time date and time information.
 def RealTimeInformation():
@@ -63,16 +60,21 @@ def AnswerModifier(Answer):
     return modifier_answer
 
 # Main chatbot function to handle user queries.
-def ChatBot(Query):
-    """ This function sends the user's query to the chatbot and returns the AI's response."""
+def ChatBot(Query, on_token=None, cancel=None, retries=1):
+    """ This function sends the user's query to the chatbot and returns the AI's response.
+    If `on_token` is given it is called with each streamed piece of text as it arrives.
+    If `cancel` (a CancelToken) fires, the stream is closed and Cancelled is raised.
+    A failed request is retried with a fresh stream at most `retries` times, and only if
+    no text has been streamed yet."""
 
-    try:
-        # Load the existing chat log from the JSON file.
-        with open(r"Data\ChatLog.json", "r") as f:
-            messages = load(f)
+    cancel = cancel or NeverCancelled
+    Answer = "" # Text streamed so far; a retry would repeat it to the listener.
 
-        # Append the user's query to the message list.
-        messages.append({"role": "user", "content": f"{Query}"})
+    try:
+        cancel.raise_if_cancelled()
+        # Assemble the system prompt, recent history and the user's query within the token budget.
+        query_message = {"role": "user", "content": f"{Query}"}
+        messages = Context.build(SystemChatBot, query_message, extra=({"role": "user", "content": RealTimeInformation()},)).messages
 
         # Make a request to the Groq API for a response, with model fallback handling.
         preferred_model = env_vars.get("GroqModel") or "llama-3.1-8b-instant"
@@ -80,7 +82,7 @@ def ChatBot(Query):
         try:
             completion = client.chat.completions.create(
                 model=model_to_use,
-                messages=SystemChatBot + [{"role": "user", "content": RealTimeInformation()}] + messages,
+                messages=messages,
                 max_tokens=1024,
                 temperature=0.7,
                 top_p=1,
@@ -94,7 +96,7 @@ def ChatBot(Query):
                     model_to_use = "llama-3.1-8b-instant"
                     completion = client.chat.completions.create(
                         model=model_to_use,
-                        messages=SystemChatBot + [{"role": "user", "content": RealTimeInformation()}] + messages,
+                        messages=messages,
                         max_tokens=1024,
                         temperature=0.7,
                         top_p=1,
@@ -106,31 +108,36 @@ def ChatBot(Query):
             else:
                 raise
 
-        Answer = "" # Initialize an empty string to store the AI's response.
-
         # Process the streamed response chunks.
-        for chunk in completion:
+        for chunk in IterateCancellable(completion, cancel):
             if chunk.choices[0].delta.content: # Check if there's content in the current chunk.
                 Answer += chunk.choices[0].delta.content # Append the content to the answer.
+                if on_token:
+                    on_token(chunk.choices[0].delta.content) # Forward the text for streaming speech.
 
         Answer = Answer.replace("</s>", "") # Clean up any unwanted tokesn from the responses.
 
-        # Append the chatbot's response to the message list.
-        messages.append({"role": "assistant", "content": Answer})
-
-        # Save the updated chat log to the JSON file.
-        with open(r"Data\ChatLog.json", "w") as f:
-            dump(messages, f, indent=4)
+        # Append the query and the chatbot's response to the chat log.
+        ChatLog.extend([query_message, {"role": "assistant", "content": Answer}])
 
         # Return the Formatted Answer
         return AnswerModifier(Answer=Answer)
     
+    except Cancelled:
+        raise # Cancelled turns are not retried and leave the chat log untouched.
+
     except Exception as e:
-        # Handle errors by printing the exception and restting the chat log.
+        # Handle errors by printing the exception; the chat log is kept.
         print(f"Error in ChatBot: {e}")
-        with open(r"Data\ChatLog.json", "w") as f:
-            dump([], f, indent=4)
-        return ChatBot(Query) # Retry the query after resetting the chat log.
+        if Answer:
+            # Part of the answer was already streamed and spoken; keep it instead of repeating it.
+            return AnswerModifier(Answer=Answer.replace("</s>", ""))
+        if retries > 0:
+            return ChatBot(Query, on_token, cancel, retries - 1) # Retry once with a fresh stream.
+        Apology = "Sorry, I could not get an answer right now. Please try again."
+        if on_token:
+            on_token(Apology)
+        return Apology
 
 # Main program entry point.
 if __name__ == "__main__":
@@ -0,0 +1,161 @@
+import json # Import json to encode/decode one message per line.
+import threading # Import threading to guard the store across worker threads.
+from collections import deque # Import deque for the in-memory tail cache.
+from pathlib import Path # Import Path to resolve project root reliably.
+
+# Resolve project root (two levels up from this file).
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DATA_DIR = PROJECT_ROOT / "Data"
+
+
+class ChatLogStore:
+    """
+    Append-only chat history stored as JSON lines.
+    Appends write a single line; a byte-offset index gives random access
+    to any message, and the most recent messages are kept in memory so
+    a normal turn never re-reads the file.
+    """
+
+    def __init__(self, path, legacy_path=None, tail_size: int = 200):
+        self.path        = Path(path)
+        self.legacy_path = Path(legacy_path) if legacy_path else None
+        self.tail_size   = tail_size
+        self._lock       = threading.RLock()
+        self._offsets    = []                      # byte offset of each message line
+        self._tail       = deque(maxlen=tail_size) # most recent messages
+        self._end        = 0                       # byte offset of the end of the file
+        self._open()
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            self._migrate_legacy()
+        self.path.touch(exist_ok=True)
+
+        # Build the offset index with a single pass over the file.
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Partial line from an interrupted write; drop it below.
+                    break
+                if line.strip():
+                    self._offsets.append(offset)
+                offset += len(line)
+        if offset != self.path.stat().st_size:
+            with open(self.path, "r+b") as f:
+                f.truncate(offset)
+        self._end = offset
+
+        # Warm the tail cache from the last lines.
+        first = max(0, len(self._offsets) - self.tail_size)
+        self._tail.extend(self._read_range(first, len(self._offsets)))
+
+    def _migrate_legacy(self):
+        # One-time import of the old whole-file Data/ChatLog.json list.
+        if not self.legacy_path or not self.legacy_path.exists():
+            return
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except Exception as e:
+            print(f"[ChatLog] Could not read legacy chat log: {e}")
+            return
+        if not isinstance(legacy, list):
+            return
+        with open(self.path, "wb") as f:
+            for message in legacy:
+                if isinstance(message, dict):
+                    f.write(self._encode(message))
+        print(f"[ChatLog] Migrated {len(legacy)} messages from {self.legacy_path.name}")
+
+    @staticmethod
+    def _encode(message: dict) -> bytes:
+        return json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+
+    def _read_range(self, start: int, stop: int) -> list:
+        if start >= stop:
+            return []
+        result = []
+        with open(self.path, "rb") as f:
+            f.seek(self._offsets[start])
+            for _ in range(stop - start):
+                line = f.readline()
+                try:
+                    result.append(json.loads(line))
+                except ValueError:
+                    result.append({"role": "system", "content": ""})
+        return result
+
+    def append(self, role: str, content: str) -> int:
+        """Append one message and return its index."""
+        return self.extend([{"role": role, "content": content}])
+
+    def extend(self, messages: list) -> int:
+        """Append several messages with one write; returns the index of the last one."""
+        with self._lock:
+            data = b""
+            offsets = []
+            for message in messages:
+                offsets.append(self._end + len(data))
+                data += self._encode(message)
+            with open(self.path, "ab") as f:
+                f.write(data)
+            self._end += len(data)
+            self._offsets.extend(offsets)
+            self._tail.extend(dict(m) for m in messages)
+            return len(self._offsets) - 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._offsets)
+
+    def read(self, start: int = 0, stop: int | None = None) -> list:
+        """
+        Return messages[start:stop]. Ranges inside the tail cache are served
+        from memory, anything older is read through the offset index.
+        """
+        with self._lock:
+            count = len(self._offsets)
+            start, stop, _ = slice(start, stop).indices(count)
+            if start >= stop:
+                return []
+            tail_start = count - len(self._tail)
+            if start >= tail_start:
+                return [dict(m) for m in list(self._tail)[start - tail_start:stop - tail_start]]
+            older = self._read_range(start, min(stop, tail_start))
+            if stop > tail_start:
+                older += [dict(m) for m in list(self._tail)[:stop - tail_start]]
+            return older
+
+    def get(self, index: int) -> dict:
+        with self._lock:
+            if index < 0:
+                index += len(self._offsets)
+            if not 0 <= index < len(self._offsets):
+                raise IndexError("chat log index out of range")
+            return self.read(index, index + 1)[0]
+
+    def tail(self, n: int | None = None) -> list:
+        """Return the last `n` messages (default: the whole tail cache)."""
+        with self._lock:
+            n = len(self._tail) if n is None else n
+            if n <= 0:
+                return []
+            return self.read(max(0, len(self._offsets) - n))
+
+    def messages(self) -> list:
+        """Return the full history. Reads the file; avoid on the per-turn path."""
+        return self.read(0)
+
+    def clear(self):
+        with self._lock:
+            with open(self.path, "wb"):
+                pass
+            self._offsets.clear()
+            self._tail.clear()
+            self._end = 0
+
+
+# Shared store for the chatbot, realtime search engine, main loop and GUI.
+ChatLog = ChatLogStore(DATA_DIR / "ChatLog.jsonl", legacy_path=DATA_DIR / "ChatLog.json")
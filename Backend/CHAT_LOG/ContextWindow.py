@@ -0,0 +1,152 @@
+import re # Import re for the fallback token estimate and sentence splitting.
+import threading # Import threading to guard the cached summary.
+from collections import namedtuple # Import namedtuple for the build result.
+
+# Use tiktoken for exact counts when it is installed; otherwise estimate.
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _encoding = None
+
+# Fixed per-message overhead of the chat format (role, separators).
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_word_re = re.compile(r"\w+|[^\w\s]")
+_sentence_re = re.compile(r"(?<=[.!?])\s+")
+
+
+def CountTokens(text: str) -> int:
+    """Count (or estimate) the tokens in `text`."""
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    # Roughly 4 tokens for every 3 words/punctuation marks in English text.
+    return (len(_word_re.findall(text)) * 4 + 2) // 3
+
+
+def CountMessageTokens(messages) -> int:
+    return sum(CountTokens(str(m.get("content", ""))) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+
+def ExtractiveSummarizer(previous: str, messages: list, budget_tokens: int) -> str:
+    """
+    Fold `messages` into `previous` by keeping the first sentence of each
+    message. The oldest lines are dropped once the summary exceeds the budget.
+    """
+    lines = previous.split("\n") if previous else []
+    for m in messages:
+        content = " ".join(str(m.get("content", "")).split())
+        if not content:
+            continue
+        first = _sentence_re.split(content, 1)[0][:200]
+        who = "User" if m.get("role") == "user" else "Assistant"
+        lines.append(f"- {who}: {first}")
+    while len(lines) > 1 and CountTokens("\n".join(lines)) > budget_tokens:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+ContextWindow = namedtuple("ContextWindow", "messages prompt_tokens history_messages summarized_messages")
+
+
+class ContextWindowBuilder:
+    """
+    Assembles the messages sent to the chat model:
+    prefix + rolling summary of older turns + most recent turns that fit
+    the token budget + the new query.
+    The summary is cached and only extended with the messages that have
+    scrolled out of the window since the last request, so every message is
+    either summarized or sent verbatim.
+    """
+
+    def __init__(self, store, budget_tokens: int = 3000, max_turns: int = 20,
+                 summary_tokens: int = 400, summarizer=None):
+        self.store          = store
+        self.budget_tokens  = budget_tokens
+        self.max_turns      = max_turns
+        self.summary_tokens = summary_tokens
+        self.summarizer     = summarizer or ExtractiveSummarizer
+        self._lock          = threading.Lock()
+        self._summary       = ""
+        self._summary_upto  = 0   # messages [0, upto) are folded into the summary
+        self._prefix_cost   = (None, 0) # (prefix, tokens) for the last static prefix seen
+        # Per-request reporting
+        self.last_prompt_tokens  = 0
+        self.total_prompt_tokens = 0
+        self.requests            = 0
+
+    def _fold_older(self, first_kept: int):
+        # Reset if the log was cleared underneath us.
+        if len(self.store) < self._summary_upto:
+            self._summary, self._summary_upto = "", 0
+        if first_kept <= self._summary_upto:
+            return
+        # Anything further back would be trimmed out of the summary budget anyway.
+        start = max(self._summary_upto, first_kept - self.max_turns * 4)
+        older = self.store.read(start, first_kept)
+        self._summary = self.summarizer(self._summary, older, self.summary_tokens)
+        self._summary_upto = first_kept
+
+    def _prefix_tokens(self, prefix) -> int:
+        # Static prefixes are shared tuples, so their cost is counted once.
+        cached, tokens = self._prefix_cost
+        if cached is not prefix:
+            tokens = CountMessageTokens(prefix)
+            self._prefix_cost = (prefix, tokens)
+        return tokens
+
+    def build(self, prefix, query: dict, extra=()) -> ContextWindow:
+        """
+        Return the messages for one request and record its prompt token count.
+        `prefix` is the shared static system prompt and is never modified;
+        `extra` holds per-request system messages placed right after it.
+        """
+        fixed = self._prefix_tokens(prefix) + CountMessageTokens(extra) + CountMessageTokens([query])
+        candidates = self.store.tail(self.max_turns * 2)
+        total = len(self.store)
+
+        with self._lock:
+            summary_tokens = CountTokens(self._summary) + MESSAGE_OVERHEAD_TOKENS if self._summary else 0
+            available = self.budget_tokens - fixed - max(summary_tokens, self.summary_tokens)
+
+            # Keep the newest messages that fit, walking backwards.
+            kept = []
+            used = 0
+            for m in reversed(candidates):
+                cost = CountMessageTokens([m])
+                if used + cost > available:
+                    break
+                kept.append(m)
+                used += cost
+            kept.reverse()
+            # Do not start the window on an assistant reply without its question.
+            if kept and kept[0].get("role") == "assistant":
+                used -= CountMessageTokens(kept[:1])
+                kept = kept[1:]
+
+            self._fold_older(total - len(kept))
+            summary, summary_upto = self._summary, self._summary_upto
+
+        summary_message = ({"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"},) if summary else ()
+
+        messages = [*prefix, *extra, *summary_message, *kept, query]
+
+        prompt_tokens = fixed + used + CountMessageTokens(summary_message)
+        with self._lock:
+            self.last_prompt_tokens = prompt_tokens
+            self.total_prompt_tokens += prompt_tokens
+            self.requests += 1
+        try:
+            print(f"[Context] prompt_tokens={prompt_tokens} history={len(kept)}/{total} msgs summarized={summary_upto}")
+        except Exception:
+            pass
+        return ContextWindow(messages, prompt_tokens, len(kept), summary_upto)
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "last_prompt_tokens": self.last_prompt_tokens,
+            "average_prompt_tokens": self.total_prompt_tokens / self.requests if self.requests else 0,
+        }
@@ -0,0 +1,103 @@
+import socket # Import socket for DNS warm-up.
+import threading # Import threading for the background warm-up and the registry lock.
+from pathlib import Path # Import Path to resolve project root reliably.
+from urllib.parse import urlparse # Import urlparse to get host names for warm-up.
+
+import httpx # Import httpx; both the Groq and Cohere SDKs are built on it.
+import requests # Import requests for plain HTTP calls (image generation, Google).
+from requests.adapters import HTTPAdapter # Import HTTPAdapter to size the connection pool.
+from dotenv import dotenv_values # Import dotenv_values to read timeouts from the .env file.
+
+# HTTP/2 needs the optional `h2` package; fall back to HTTP/1.1 keep-alive without it.
+try:
+    import h2 # noqa: F401
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+# Resolve project root (two levels up from this file) and load environment variables.
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+env_vars = dotenv_values(str(PROJECT_ROOT / ".env"))
+
+# Timeouts in seconds for every API call made through the shared clients.
+ApiTimeout = float(env_vars.get("ApiTimeout") or 30)
+ApiConnectTimeout = float(env_vars.get("ApiConnectTimeout") or 5)
+
+# Endpoints contacted on most turns; connections to them are opened at startup.
+WarmUpUrls = [
+    "https://api.groq.com/openai/v1/models",
+    "https://api.cohere.com/v1/models",
+    "https://www.google.com/",
+]
+
+_lock = threading.Lock()
+_http_client = None
+_requests_session = None
+_groq_clients = {}
+_cohere_clients = {}
+
+
+def HttpClient() -> httpx.Client:
+    """Process-wide pooled httpx client shared by the Groq and Cohere SDKs."""
+    global _http_client
+    with _lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                http2=HTTP2,
+                timeout=httpx.Timeout(ApiTimeout, connect=ApiConnectTimeout),
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=300),
+                follow_redirects=True,
+            )
+        return _http_client
+
+
+def RequestsSession() -> requests.Session:
+    """Process-wide requests session with a keep-alive connection pool."""
+    global _requests_session
+    with _lock:
+        if _requests_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _requests_session = session
+        return _requests_session
+
+
+def GroqClient(api_key: str):
+    """Shared Groq client per API key, using the pooled HTTP client."""
+    # Imported here so modules that only need Cohere (or plain HTTP) do not load the Groq SDK.
+    from groq import Groq
+    http_client = HttpClient()
+    with _lock:
+        if api_key not in _groq_clients:
+            _groq_clients[api_key] = Groq(api_key=api_key, http_client=http_client, timeout=ApiTimeout)
+        return _groq_clients[api_key]
+
+
+def CohereClient(api_key: str):
+    """Shared Cohere client per API key, using the pooled HTTP client."""
+    import cohere
+    http_client = HttpClient()
+    with _lock:
+        if api_key not in _cohere_clients:
+            _cohere_clients[api_key] = cohere.Client(api_key=api_key, httpx_client=http_client, timeout=ApiTimeout)
+        return _cohere_clients[api_key]
+
+
+def _warm_up(urls):
+    client = HttpClient()
+    for url in urls:
+        host = urlparse(url).hostname
+        try:
+            socket.getaddrinfo(host, 443) # Resolve DNS ahead of the first real request.
+            client.head(url, timeout=ApiConnectTimeout) # Open a TLS connection that stays in the pool.
+        except Exception as e:
+            print(f"[Clients] Warm-up failed for {host}: {e}")
+
+
+def WarmUp(urls=None) -> threading.Thread:
+    """Resolve and connect to the API hosts in the background."""
+    thread = threading.Thread(target=_warm_up, args=(list(urls or WarmUpUrls),), daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,149 @@
+import threading # Import threading for locks and condition variables.
+import os # Import os for the file-backed adapter.
+
+
+class Channel:
+    """
+    A single typed state slot shared between threads.
+    Publishing stores the value, wakes up any waiting threads and
+    notifies subscribers. Readers never touch the disk.
+    """
+
+    def __init__(self, name: str, kind=str, default=None):
+        self.name      = name
+        self.kind      = kind
+        self._value    = self._coerce(default if default is not None else kind())
+        self._version  = 0
+        self._subs     = []
+        self._cond     = threading.Condition()
+
+    def _coerce(self, value):
+        # Accept the legacy "True"/"False" strings on boolean channels.
+        if self.kind is bool and isinstance(value, str):
+            return value.strip().lower() == "true"
+        if value is None:
+            return self.kind()
+        return value if isinstance(value, self.kind) else self.kind(value)
+
+    def publish(self, value):
+        """
+        Store `value` and notify subscribers and waiters.
+        Subscriber errors are printed and never break the publisher.
+        """
+        value = self._coerce(value)
+        with self._cond:
+            self._value   = value
+            self._version += 1
+            subs = list(self._subs)
+            self._cond.notify_all()
+        for callback in subs:
+            try:
+                callback(value)
+            except Exception as e:
+                print(f"[EventBus] Subscriber error on '{self.name}': {e}")
+
+    def get(self):
+        with self._cond:
+            return self._value
+
+    @property
+    def version(self) -> int:
+        with self._cond:
+            return self._version
+
+    def subscribe(self, callback):
+        """
+        Register `callback(value)` to run on every publish (in the publisher's thread).
+        Returns a function that removes the subscription.
+        """
+        with self._cond:
+            self._subs.append(callback)
+
+        def unsubscribe():
+            with self._cond:
+                if callback in self._subs:
+                    self._subs.remove(callback)
+        return unsubscribe
+
+    def wait_for(self, predicate, timeout: float | None = None):
+        """
+        Block until `predicate(value)` is true or timeout occurs.
+        Returns the matching value, or None on timeout.
+        """
+        with self._cond:
+            if self._cond.wait_for(lambda: predicate(self._value), timeout=timeout):
+                return self._value
+        return None
+
+    def wait_for_change(self, since_version: int, timeout: float | None = None):
+        """
+        Block until a publish happens after `since_version`.
+        Returns (version, value), or None on timeout.
+        """
+        with self._cond:
+            if self._cond.wait_for(lambda: self._version != since_version, timeout=timeout):
+                return self._version, self._value
+        return None
+
+
+class FileChannelAdapter:
+    """
+    Mirrors a channel to a file for consumers living in another process
+    (e.g. Backend/IMAGE_GENERATION/ImageGeneration.py). The file is only
+    written on publish, never polled from this process.
+    """
+
+    def __init__(self, channel: Channel, path: str, encode=str):
+        self.channel = channel
+        self.path    = path
+        self.encode  = encode
+        self._unsubscribe = channel.subscribe(self._write)
+
+    def _write(self, value):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        except Exception:
+            pass
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write(self.encode(value))
+
+    def read(self) -> str:
+        """Read the file as last written by either process."""
+        with open(self.path, "r", encoding="utf-8") as file:
+            return file.read()
+
+    def close(self):
+        self._unsubscribe()
+
+
+class StateBus:
+    """
+    Registry of named channels. Each channel keeps its type for its lifetime;
+    asking for an existing name with a different type is an error.
+    """
+
+    def __init__(self):
+        self._channels = {}
+        self._lock     = threading.Lock()
+
+    def channel(self, name: str, kind=str, default=None) -> Channel:
+        with self._lock:
+            ch = self._channels.get(name)
+            if ch is None:
+                ch = Channel(name, kind=kind, default=default)
+                self._channels[name] = ch
+            elif ch.kind is not kind:
+                raise TypeError(f"Channel '{name}' is {ch.kind.__name__}, not {kind.__name__}")
+            return ch
+
+    def __getitem__(self, name: str) -> Channel:
+        with self._lock:
+            return self._channels[name]
+
+
+# Process-wide bus with the channels shared by the GUI and the worker thread.
+bus = StateBus()
+AssistantStatusChannel = bus.channel("status", str, "")
+MicrophoneChannel      = bus.channel("mic", bool, False)
+ResponsesChannel       = bus.channel("responses", str, "")
+ImageGenerationChannel = bus.channel("image_generation", str, "False, False")
@@ -1,12 +1,16 @@
 import asyncio
 from random import randint
 from PIL import Image
-import requests
 from dotenv import get_key
 import os
+import sys
 from time import sleep
 import logging
 
+# This script runs as its own process; make the project packages importable.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from Backend.CLIENTS.ClientRegistry import RequestsSession, WarmUp, ApiTimeout
+
 # Function to open and displav imaqes based on a given prompt
 def open_images(prompt):
     folder_path = DATA_DIR # Folder where the images are stored
@@ -34,6 +38,9 @@ API_URL = "https://api-inference.huggingface.co/models/stabilityai/stable-diffus
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 ENV_PATH = os.path.join(BASE_DIR, '.env')
 headers = {"Authorization": f"Bearer {get_key(ENV_PATH, 'HuggingFaceAPIKey')}"}
+# Reuse one keep-alive session so the 4 parallel requests share TLS connections.
+session = RequestsSession()
+WarmUp([API_URL])
 TRIGGER_FILE = os.path.join(BASE_DIR, r"Frontend", r"Files", r"ImageGeneration.data")
 DATA_DIR = os.path.join(BASE_DIR, r"Data")
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -48,7 +55,7 @@ except Exception as _e:
 
 # Async function to send a query to the Hugging Face API
 async def query(payload):
-    response = await asyncio.to_thread(requests.post, API_URL, headers=headers, json=payload)
+    response = await asyncio.to_thread(session.post, API_URL, headers=headers, json=payload, timeout=ApiTimeout * 4)
     if getattr(response, 'status_code', 200) != 200:
         try:
             preview = response.text[:400]
@@ -0,0 +1,144 @@
+import atexit # Import atexit to write pending entries on shutdown.
+import hashlib # Import hashlib to fingerprint the prompt configuration.
+import json # Import json to persist the cache.
+import re # Import re to normalize queries.
+import threading # Import threading to guard the cache across threads.
+import time # Import time for TTL handling.
+from collections import OrderedDict # Import OrderedDict for LRU ordering.
+from pathlib import Path # Import Path to resolve project root reliably.
+
+# Resolve project root (two levels up from this file).
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Words that do not change what the user is asking for. Words like "you", "me"
+# or "now" do ("who are you" vs "who are"), so they are kept.
+FILLER_WORDS = {
+    "please", "pls", "plz", "kindly", "hey", "hi", "ok", "okay", "jarvis", "um", "uh", "umm", "hmm",
+}
+
+
+def NormalizeQuery(prompt: str) -> str:
+    """Lowercase, drop punctuation and filler words: "Hey Jarvis, open Chrome please!" -> "open chrome"."""
+    text = (prompt or "").lower().replace("'", "")
+    words = re.sub(r"[^a-z0-9ऀ-ॿ ]+", " ", text).split()
+    kept = [w for w in words if w not in FILLER_WORDS]
+    return " ".join(kept or words)
+
+
+def Fingerprint(*parts) -> str:
+    """Stable hash of the inputs that shape a decision (preamble, few-shot history, model)."""
+    raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class DecisionCache:
+    """
+    LRU cache for FirstLayerDMM results, kept in memory and mirrored to a
+    JSON file. Entries expire after `ttl` seconds and the oldest entries are
+    evicted beyond `max_entries`. The whole cache is dropped when the
+    fingerprint (preamble + ChatHistory + model) changes. New entries are
+    written at most every `save_interval` seconds and on exit.
+    """
+
+    def __init__(self, path, fingerprint: str, ttl: float = 7 * 24 * 3600, max_entries: int = 500,
+                 save_interval: float = 10.0):
+        self.path        = Path(path)
+        self.fingerprint = fingerprint
+        self.ttl         = ttl
+        self.max_entries = max_entries
+        self.hits        = 0
+        self.misses      = 0
+        self.save_interval = save_interval
+        self._lock       = threading.Lock()
+        self._entries    = OrderedDict() # key -> {"tasks": [...], "expires_at": float}
+        self._timer      = None # Pending delayed save, if any
+        self._load()
+        atexit.register(self.flush)
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"[DecisionCache] Could not read cache: {e}")
+            return
+        if data.get("fingerprint") != self.fingerprint:
+            print("[DecisionCache] Prompt configuration changed; cache invalidated")
+            self._save()
+            return
+        now = time.time()
+        for key, entry in data.get("entries", []):
+            if entry.get("expires_at", 0) > now:
+                self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"fingerprint": self.fingerprint, "entries": list(self._entries.items())}, f, ensure_ascii=False)
+            tmp.replace(self.path)
+        except Exception as e:
+            print(f"[DecisionCache] Could not save cache: {e}")
+
+    def get(self, prompt: str):
+        """Return the cached task list for `prompt`, or None."""
+        key = NormalizeQuery(prompt)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry["expires_at"] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry["tasks"])
+
+    def put(self, prompt: str, tasks: list):
+        key = NormalizeQuery(prompt)
+        if not key or not tasks:
+            return
+        with self._lock:
+            self._entries[key] = {"tasks": list(tasks), "expires_at": time.time() + self.ttl}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            # Batch writes: one save covers every entry added within the interval.
+            if self._timer is None:
+                self._timer = threading.Timer(self.save_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Write pending entries now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+                self._save()
+
+    def invalidate(self, fingerprint: str | None = None):
+        """Drop every entry, optionally switching to a new fingerprint."""
+        with self._lock:
+            if fingerprint:
+                self.fingerprint = fingerprint
+            self._entries.clear()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._save()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
@@ -0,0 +1,176 @@
+import re # Import re for the compiled utterance patterns.
+from collections import namedtuple # Import namedtuple for the Decision result.
+
+# Result of a classification: the task list FirstLayerDMM returns, how sure
+# we are about it (0..1), and where it came from ("local", "cohere", ...).
+Decision = namedtuple("Decision", "tasks confidence source")
+
+# Prompts starting with these are already forced to a single task after the
+# Cohere call (see FirstLayerDMM), so they can be decided locally with certainty.
+# Maps the spoken prefix to the canonical task prefix.
+OVERRIDE_PREFIXES = {
+    "focus on": "focus on",
+    "focus title": "focus title",
+    "cursor title": "cursor title",
+    "cursor": "cursor",
+    "point to": "point to",
+    "show pointer": "show pointer",
+    "add to watch later": "add to watch later",
+    "copy link for": "copy link for",
+    "copy link": "copy link for",
+    "open": "open",
+}
+
+# Spoken task keywords (from Model.funcs) and aliases, mapped to the task prefix.
+# "general" and "realtime" are model labels rather than something users say.
+TASK_KEYWORDS = {
+    "open": "open",
+    "close": "close",
+    "play": "play",
+    "generate image": "generate image",
+    "system": "system",
+    "content": "content",
+    "google search": "google search",
+    "search google for": "google search",
+    "youtube search": "youtube search",
+    "search youtube for": "youtube search",
+    "reminder": "reminder",
+    "automation": "automation",
+    "pointer title": "pointer title",
+}
+
+# Whole-utterance patterns: (compiled regex, task template, confidence).
+PATTERNS = [
+    (re.compile(r"^(?:system )?(mute|unmute|volume up|volume down)$"), "system {0}", 0.97),
+    (re.compile(r"^(?:turn (?:the )?)?volume (up|down)$"), "system volume {0}", 0.95),
+    (re.compile(r"^(increase|raise) (?:the )?volume$"), "system volume up", 0.95),
+    (re.compile(r"^(decrease|lower|reduce) (?:the )?volume$"), "system volume down", 0.95),
+    (re.compile(r"^((?:exit )?screen monitor (?:(?:debug|testing) )?(?:on|off|of))$"), "automation {0}", 0.97),
+    (re.compile(r"^(click (?:on )?(?:home|homes|history|histry|watch ?later))$"), "automation {0}", 0.95),
+    (re.compile(r"^(?:ok(?:ay)? )?(?:bye|goodbye|good bye)(?: \w+)?$"), "exit", 0.93),
+    (re.compile(r"^(what(?:'s| is) (?:the )?(?:time|date|day)(?: (?:today|now|right now))?)$"), "general {0}?", 0.95),
+    (re.compile(r"^(what(?:'s| is) today'?s date)$"), "general {0}?", 0.95),
+]
+
+# Confidence for a clause that only starts with a task keyword ("close the deal",
+# "play it cool"). It stays below LocalIntentThreshold, so Cohere still decides.
+KEYWORD_CONFIDENCE = 0.75
+
+# Confidence for a keyword clause whose argument was checked (see _validated).
+VALIDATED_CONFIDENCE = 0.93
+
+# Spoken command phrases that cannot be ordinary speech, whatever follows them.
+EXPLICIT_KEYWORDS = {"google search", "youtube search", "generate image"}
+
+# Desktop apps "open"/"close" may name; site names come from the link index.
+KNOWN_APPS = {
+    "notepad", "calculator", "calc", "paint", "settings", "camera", "chrome", "google chrome",
+    "edge", "microsoft edge", "firefox", "brave", "file explorer", "explorer", "task manager",
+    "command prompt", "cmd", "powershell", "terminal", "vs code", "vscode", "visual studio code",
+    "word", "excel", "powerpoint", "outlook", "onenote", "teams", "microsoft teams",
+    "spotify", "whatsapp", "telegram", "discord", "zoom", "skype", "vlc", "steam", "obs",
+}
+
+# Arguments of "system" that Automation.System handles.
+SYSTEM_ACTIONS = {"mute", "unmute", "volume up", "volume down"}
+
+
+class PrefixTrie:
+    """
+    Word-level trie over command keywords.
+    longest_prefix(["google", "search", "cats"]) -> (2, "google search")
+    """
+
+    def __init__(self, items=None):
+        self.root = {}
+        for key, value in (items or {}).items():
+            self.insert(key, value)
+
+    def insert(self, key: str, value):
+        node = self.root
+        for word in key.split():
+            node = node.setdefault(word, {})
+        node[None] = value
+
+    def longest_prefix(self, words: list):
+        """Return (matched_words, value) for the longest keyword at the start of `words`."""
+        node, best = self.root, (0, None)
+        for i, word in enumerate(words):
+            node = node.get(word)
+            if node is None:
+                break
+            if None in node:
+                best = (i + 1, node[None])
+        return best
+
+
+_override_trie = PrefixTrie(OVERRIDE_PREFIXES)
+_keyword_trie  = PrefixTrie(TASK_KEYWORDS)
+_clause_split  = re.compile(r"\s*,\s*|\s+and\s+")
+
+
+def _normalize(prompt: str) -> str:
+    text = (prompt or "").lower().strip()
+    text = re.sub(r"[.?!]+$", "", text).strip()
+    return re.sub(r"\s+", " ", text)
+
+
+def _validated(prefix: str, argument: str) -> bool:
+    """True when `argument` has a shape we know `prefix` takes."""
+    if prefix in EXPLICIT_KEYWORDS:
+        return True
+    if prefix == "system":
+        return argument in SYSTEM_ACTIONS
+    if prefix in ("open", "close"):
+        if argument in KNOWN_APPS:
+            return True
+        from Backend.AUTOMATION.LinkIndex import Links # Imported here: the index reads Data/WebLinks.json.
+        return Links.is_site(argument)
+    return False
+
+
+def _match_clause(clause: str):
+    """Return (task, confidence) for one clause, or None."""
+    for pattern, template, confidence in PATTERNS:
+        m = pattern.match(clause)
+        if m:
+            return template.format(*m.groups()), confidence
+    words = clause.split()
+    n, prefix = _keyword_trie.longest_prefix(words)
+    if prefix and n < len(words):
+        argument = " ".join(words[n:])
+        confidence = VALIDATED_CONFIDENCE if _validated(prefix, argument) else KEYWORD_CONFIDENCE
+        return f"{prefix} {argument}", confidence
+    return None
+
+
+def MatchIntent(prompt: str) -> Decision:
+    """
+    Classify `prompt` without a network call.
+    Returns a Decision whose confidence is 0 when nothing matched.
+    """
+    text = _normalize(prompt)
+    if not text:
+        return Decision([], 0.0, "local")
+
+    # 1) Prefixes that FirstLayerDMM always overrides; keep the original casing of the tail.
+    words = text.split()
+    n, prefix = _override_trie.longest_prefix(words)
+    if prefix and n < len(words):
+        spoken = " ".join(words[:n]) + " "
+        raw = (prompt or "").strip()
+        tail = raw[len(spoken):].strip() if raw.lower().startswith(spoken) else " ".join(words[n:])
+        return Decision([f"{prefix} {tail}"], 1.0, "local")
+
+    # 2) One or more clauses that each match a pattern or start with a task keyword.
+    tasks, confidence = [], 1.0
+    for clause in _clause_split.split(text):
+        if not clause:
+            continue
+        match = _match_clause(clause)
+        if match is None:
+            # A clause we cannot place (e.g. "play tom and jerry") - let the model decide.
+            return Decision([], 0.0, "local")
+        tasks.append(match[0])
+        confidence = min(confidence, match[1])
+    return Decision(tasks, confidence if tasks else 0.0, "local")
@@ -1,9 +1,11 @@
 from http.client import responses
 
-import cohere # Import the Cohere library for AI services.
 from pyexpat.errors import messages
 from rich import print # Import the Rich library to enhance terminal outputs.
 from dotenv import dotenv_values # Import dotenv to load environment variables from a .env file.
+from Backend.CLIENTS.ClientRegistry import CohereClient # Import the shared, pooled Cohere client.
+from Backend.MODEL.IntentMatcher import MatchIntent # Import the local rule-based intent matcher.
+from Backend.MODEL.DecisionCache import DecisionCache, Fingerprint, PROJECT_ROOT # Import the decision cache.
 
 # Load environment variables from the .env file.
 env_vars = dotenv_values(".env")
@@ -11,8 +13,11 @@ env_vars = dotenv_values(".env")
 # Retrieve API key.
 CohereAPIKey = env_vars.get("CohereAPIKey")
 
-# Create a Cohere client using the provided API key.
-co = cohere.Client(api_key=CohereAPIKey)
+# Get the shared Cohere client (pooled keep-alive connections) for the provided API key.
+co = CohereClient(CohereAPIKey)
+
+# Local matches at or above this confidence skip the Cohere call.
+LocalIntentThreshold = float(env_vars.get("LocalIntentThreshold") or 0.9)
 
 # Define a list of recognized function keywords for task categorization.
 # Include canonical automation commands so they pass the initial filter.
@@ -81,62 +86,21 @@ ChatHistory = [
     {"role": "Chatbot", "message": "automation copy link for this video"},
 ]
 
-# Define the main function for decision making on queries.
-def FirstLayerDMM(prompt: str = "test"):
-    # Add the user's query to the messages list.
-    messages.append({"role": "user", "content": f"{prompt}"})
-
-    # Create a streaming chat session with the Cohere model.
-    stream = co.chat_stream(
-        model='command-r-plus', # Specify the Cohere model to use.
-        message=prompt, # Pass the user's query.
-        temperature=0.7, # Set the creativity level
-        chat_history=ChatHistory, # Provide the predefined chat history for context.
-        prompt_truncation='OFF', # Ensure the prompt is no truncated.
-        connectors=[], # No additional connectors are used.
-        preamble=preamble # Pass the detailed instruction preamble.
-    )
-
-    # Initialize an empty string to store the generate response.
-    response = ""
-
-    # Iterate over events in the stream and capture text generation events.
-    for event in stream:
-        if event.event_type == "text-generation":
-            response += event.text # Append generated text to the response.
-
-    # Remove newline characters and split responses into individual tasks.
-    response = response.replace("\n", "")
-    response = response.split(",")
-
-    # Strip leading and trailing whitespaces from each task.
-    response = [i.strip() for i in response]
+# Cache Cohere decisions; entries are tied to the preamble, few-shot history and model.
+DecisionModel = "command-r-plus"
+DMMCache = DecisionCache(
+    PROJECT_ROOT / "Data" / "DecisionCache.json",
+    fingerprint=Fingerprint(preamble, ChatHistory, DecisionModel),
+    ttl=float(env_vars.get("DecisionCacheTTL") or 7 * 24 * 3600),
+    max_entries=int(env_vars.get("DecisionCacheSize") or 500),
+)
 
-    # Strong intent override based on the raw prompt to avoid misclassification
-    low_prompt = (prompt or "").lower().strip()
-    def tail_after(prefix: str) -> str:
-        return prompt[len(prefix):].strip()
-    if low_prompt.startswith("focus on "):
-        response = [f"focus on {tail_after('focus on ')}"]
-    elif low_prompt.startswith("focus title "):
-        response = [f"focus title {tail_after('focus title ')}"]
-    elif low_prompt.startswith("cursor title "):
-        response = [f"cursor title {tail_after('cursor title ')}"]
-    elif low_prompt.startswith("cursor "):
-        response = [f"cursor {tail_after('cursor ')}"]
-    elif low_prompt.startswith("point to "):
-        response = [f"point to {tail_after('point to ')}"]
-    elif low_prompt.startswith("show pointer "):
-        response = [f"show pointer {tail_after('show pointer ')}"]
-    elif low_prompt.startswith("add to watch later "):
-        response = [f"add to watch later {tail_after('add to watch later ')}"]
-    elif low_prompt.startswith("copy link for "):
-        response = [f"copy link for {tail_after('copy link for ')}"]
-    elif low_prompt.startswith("copy link "):
-        response = [f"copy link for {tail_after('copy link ')}"]
-    elif low_prompt.startswith("open "):
-        response = [f"open {tail_after('open ')}"]
+# Function to drop cached decisions after editing the preamble or ChatHistory at runtime.
+def InvalidateDecisionCache():
+    DMMCache.invalidate(Fingerprint(preamble, ChatHistory, DecisionModel))
 
+# Filter, normalize and de-duplicate the tasks of a decision (from Cohere or the local matcher).
+def FilterTasks(response):
     # Initialize an empty list to filter valid tasks.
     temp = []
 
@@ -219,12 +183,92 @@ def FirstLayerDMM(prompt: str = "test"):
     except Exception:
         # In case of any unexpected parsing issue, keep the original response
         pass
+    return response
+
+# Define the main function for decision making on queries.
+def FirstLayerDMM(prompt: str = "test"):
+    # Add the user's query to the messages list.
+    messages.append({"role": "user", "content": f"{prompt}"})
+
+    # Try the local matcher first; only ask Cohere when it is unsure.
+    local = MatchIntent(prompt)
+    tasks = FilterTasks(local.tasks) if local.confidence >= LocalIntentThreshold else []
+    if tasks:
+        try:
+            print(f"[DMM] Local match ({local.confidence:.2f}): {tasks}")
+        except Exception:
+            pass
+        return tasks
+
+    # Reuse an earlier Cohere decision for the same normalized query.
+    cached = DMMCache.get(prompt)
+    if cached is not None:
+        try:
+            print(f"[DMM] Cache hit: {cached} {DMMCache.stats()}")
+        except Exception:
+            pass
+        return cached
+
+    # Create a streaming chat session with the Cohere model.
+    stream = co.chat_stream(
+        model=DecisionModel, # Specify the Cohere model to use.
+        message=prompt, # Pass the user's query.
+        temperature=0.7, # Set the creativity level
+        chat_history=ChatHistory, # Provide the predefined chat history for context.
+        prompt_truncation='OFF', # Ensure the prompt is no truncated.
+        connectors=[], # No additional connectors are used.
+        preamble=preamble # Pass the detailed instruction preamble.
+    )
+
+    # Initialize an empty string to store the generate response.
+    response = ""
+
+    # Iterate over events in the stream and capture text generation events.
+    for event in stream:
+        if event.event_type == "text-generation":
+            response += event.text # Append generated text to the response.
+
+    # Remove newline characters and split responses into individual tasks.
+    response = response.replace("\n", "")
+    response = response.split(",")
+
+    # Strip leading and trailing whitespaces from each task.
+    response = [i.strip() for i in response]
+
+    # Strong intent override based on the raw prompt to avoid misclassification
+    low_prompt = (prompt or "").lower().strip()
+    def tail_after(prefix: str) -> str:
+        return prompt[len(prefix):].strip()
+    if low_prompt.startswith("focus on "):
+        response = [f"focus on {tail_after('focus on ')}"]
+    elif low_prompt.startswith("focus title "):
+        response = [f"focus title {tail_after('focus title ')}"]
+    elif low_prompt.startswith("cursor title "):
+        response = [f"cursor title {tail_after('cursor title ')}"]
+    elif low_prompt.startswith("cursor "):
+        response = [f"cursor {tail_after('cursor ')}"]
+    elif low_prompt.startswith("point to "):
+        response = [f"point to {tail_after('point to ')}"]
+    elif low_prompt.startswith("show pointer "):
+        response = [f"show pointer {tail_after('show pointer ')}"]
+    elif low_prompt.startswith("add to watch later "):
+        response = [f"add to watch later {tail_after('add to watch later ')}"]
+    elif low_prompt.startswith("copy link for "):
+        response = [f"copy link for {tail_after('copy link for ')}"]
+    elif low_prompt.startswith("copy link "):
+        response = [f"copy link for {tail_after('copy link ')}"]
+    elif low_prompt.startswith("open "):
+        response = [f"open {tail_after('open ')}"]
+
+    # Keep recognized tasks, normalize them and drop duplicates.
+    response = FilterTasks(response)
 
     # If '(query)' is in the response, recursively call the function for further clarification.
     if "(query)" in response:
         newresponse = FirstLayerDMM(prompt=prompt)
         return newresponse # Return the clarified response.
     else:
+        DMMCache.put(prompt, response) # Remember the decision for repeated queries.
         return response # Return the filtered response.
 
 # Entry point for the script.
@@ -0,0 +1,139 @@
+import threading # Import threading for the cancel event and callback lock.
+
+
+class Cancelled(Exception):
+    """Raised inside a turn's work once its CancelToken has been cancelled."""
+
+
+class CancelToken:
+    """
+    Shared flag for one unit of work (a listen -> decide -> answer -> speak turn).
+    Long-running steps either poll `cancelled` / raise_if_cancelled() or
+    register an on_cancel() callback that aborts them (close a stream, stop audio).
+    """
+
+    def __init__(self):
+        self.reason     = None
+        self._event     = threading.Event()
+        self._lock      = threading.Lock()
+        self._callbacks = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelled"):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"[Cancel] Callback failed: {e}")
+
+    def on_cancel(self, callback):
+        """Run `callback()` when cancelled (immediately if already cancelled); returns an unregister function."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+
+                def unregister():
+                    with self._lock:
+                        if callback in self._callbacks:
+                            self._callbacks.remove(callback)
+                return unregister
+        callback()
+        return lambda: None
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise Cancelled(self.reason)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Sleep up to `timeout` seconds; returns True as soon as the token is cancelled."""
+        return self._event.wait(timeout)
+
+    def wait_future(self, future, poll: float = 0.05):
+        """Return `future.result()`, raising Cancelled if the token fires first."""
+        while True:
+            self.raise_if_cancelled()
+            try:
+                return future.result(timeout=poll)
+            except TimeoutError:
+                continue
+
+
+# A token that is never cancelled, for callers that do not pass one.
+class _NeverCancelled(CancelToken):
+    def cancel(self, reason: str = "cancelled"):
+        pass
+
+    def on_cancel(self, callback):
+        return lambda: None
+
+
+NeverCancelled = _NeverCancelled()
+
+
+def IterateCancellable(iterable, cancel: CancelToken):
+    """
+    Yield from `iterable` (e.g. a streamed LLM completion) until `cancel` fires.
+    If the iterable has close(), it is called on cancel so a blocked read returns at once.
+    """
+    close = getattr(iterable, "close", None)
+    unregister = cancel.on_cancel(close) if close else (lambda: None)
+    try:
+        for item in iterable:
+            cancel.raise_if_cancelled()
+            yield item
+    except Exception:
+        cancel.raise_if_cancelled() # The stream was closed underneath us.
+        raise
+    finally:
+        unregister()
+    cancel.raise_if_cancelled()
+
+
+class TurnManager:
+    """Hands out one CancelToken per turn and cancels the active one on request."""
+
+    def __init__(self):
+        self._lock    = threading.Lock()
+        self._current = None
+
+    def begin(self) -> CancelToken:
+        """Start a new turn, cancelling any turn still running."""
+        token = CancelToken()
+        with self._lock:
+            previous, self._current = self._current, token
+        if previous is not None:
+            previous.cancel("superseded")
+        return token
+
+    def end(self, token: CancelToken):
+        with self._lock:
+            if self._current is token:
+                self._current = None
+
+    def cancel(self, reason: str = "cancelled") -> bool:
+        """Cancel the active turn, if any. Returns True when something was cancelled."""
+        with self._lock:
+            token = self._current
+        if token is None or token.cancelled:
+            return False
+        print(f"[Cancel] Turn cancelled: {reason}")
+        token.cancel(reason)
+        return True
+
+    @property
+    def current(self):
+        with self._lock:
+            return self._current
+
+
+# Shared turn manager for the assistant's main loop.
+Turns = TurnManager()
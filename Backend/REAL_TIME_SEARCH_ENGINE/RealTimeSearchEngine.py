@@ -1,6 +1,10 @@
 from googlesearch import search
-from groq import Groq #importing the Groq library to use its API.
-from json import load, dump # Importing functions to read and write JSON files.
+from Backend.CLIENTS.ClientRegistry import GroqClient # Import the shared, pooled Groq client.
+from Backend.CHAT_LOG.ChatLogStore import ChatLog # Import the shared append-only chat log.
+from Backend.CHAT_LOG.ContextWindow import ContextWindowBuilder # Import the token-budgeted context builder.
+from Backend.PIPELINE.Cancellation import NeverCancelled, IterateCancellable # Import turn cancellation helpers.
+from Backend.REAL_TIME_SEARCH_ENGINE.SearchCache import SearchCache # Import the TTL search-result cache.
+from pathlib import Path # Import Path to locate the Data directory.
 import datetime # Importing the datetime module for real-time date and time information.
 from dotenv import dotenv_values # Importing dotenv_values to read environment variables from a .env file.
 
@@ -12,33 +16,52 @@ Username = env_vars.get("Username")
 Assistantname = env_vars.get("Assistantname")
 GroqAPIKey = env_vars.get("GroqAPIKey")
 
-# Initialize the Groq client with the provided API key.
-client = Groq(api_key=GroqAPIKey)
+# Get the shared Groq client (pooled keep-alive connections) for the provided API key.
+client = GroqClient(GroqAPIKey)
+
+# Build each prompt from the most recent turns that fit the token budget.
+Context = ContextWindowBuilder(
+    ChatLog,
+    budget_tokens=int(env_vars.get("ContextTokenBudget") or 3000),
+    max_turns=int(env_vars.get("ContextMaxTurns") or 20),
+)
 
 # Refine the system instructions for the chatbot.
 System = f"""Hello, I am {Username}, You are a very accurate and advanced AI chatbot named {Assistantname} which has real-time up-to-date information from the internet.
 *** Provide Answers In a Professional Way, make sure to add full stops, commas, question marks, and use proper grammar.***
 *** Just answer the question from the provided data in a professional way. ***"""
 
-# Try to load the chat log from a JSON file, or create an empty one if it doesn't exist.
-try:
-    with open(r"Data\ChatLog.json", "r") as f:
-        messages = load(f)
-except:
-    with open(r"Data\ChatLog.json", "w") as f:
-        dump([], f)
-
-# Function to perform a Google search and format the results.
-def GoogleSearch(query):
-    results = list(search(query, advanced=True, num_results=5))
+# Fetch the top results for a query as plain dicts so they can be cached on disk.
+def FetchSearchResults(query):
+    return [{"title": i.title, "description": i.description} for i in search(query, advanced=True, num_results=5)]
+
+# Cache search results per normalized query. Repeated questions ("today's news", "weather")
+# are answered from the cache; entries past the TTL are served once more while a background refresh runs.
+Searches = SearchCache(
+    FetchSearchResults,
+    Path(__file__).resolve().parents[2] / "Data" / "SearchCache.json",
+    ttl=float(env_vars.get("SearchCacheTTL") or 900),
+    stale_ttl=float(env_vars.get("SearchCacheStaleTTL") or 6 * 3600),
+)
+
+# Format cached search results for the prompt.
+def FormatSearchResults(query, results):
     Answer = f"The search results for '{query}' are:\n[start]\n"
 
     for i in results:
-        Answer += f"Title: {i.title}\nDescription: {i.description}\n\n"
+        Answer += f"Title: {i['title']}\nDescription: {i['description']}\n\n"
 
     Answer += "[end]"
     return Answer
 
+# Function to perform a Google search and format the results.
+def GoogleSearch(query, cancel=None):
+    return FormatSearchResults(query, Searches.get(query, cancel))
+
+# Search several sub-queries concurrently and format them in order.
+def GoogleSearchMany(queries, cancel=None):
+    return "\n".join(FormatSearchResults(q, r) for q, r in zip(queries, Searches.get_many(queries, cancel)))
+
 # Function to clean up the answer by removing empty lines.
 def AnswerModifier(Answer):
     lines = Answer.split('\n')
@@ -47,11 +70,12 @@ def AnswerModifier(Answer):
     return modified_answer
 
 # Predefined chatbot conversation system message and an initial user message.
-SystemChatBot = [
+# Shared read-only by every request; per-request messages are passed separately.
+SystemChatBot = (
     {"role": "system", "content": System},
     {"role": "user", "content": "Hi"},
-    {"role": "assistant", "content": "Hello, how can i Help you?"}
-]
+    {"role": "assistant", "content": "Hello, how can i Help you?"},
+)
 
 # Function to get real-time information like the current date and time
 def Information():
@@ -73,16 +97,19 @@ def Information():
     return data
 
 # Function to handle real-time search and response generation.
-def RealTimeSearchEngine(prompt):
-    global SystemChatBot, messages
+def RealTimeSearchEngine(prompt, on_token=None, sub_queries=None, cancel=None):
+    cancel = cancel or NeverCancelled
+    query_message = {"role": "user", "content": f"{prompt}"}
 
-    # Load the chat log from the JSON file.
-    with open(r"Data\ChatLog.json", "r") as f:
-        messages = load(f)
-    messages.append({"role": "user", "content": f"{prompt}"})
+    # Google search results for this request; merged queries are searched part by part in parallel.
+    SearchResults = GoogleSearchMany(sub_queries, cancel) if sub_queries else GoogleSearch(prompt, cancel)
+    RequestMessages = (
+        {"role": "system", "content": SearchResults},
+        {"role": "system", "content": Information()},
+    )
 
-    # Add Google search results to the system chatbot message.
-    SystemChatBot.append({"role": "system", "content": GoogleSearch(prompt)})
+    # Assemble the shared system prompt, this request's messages, recent history and the query within the token budget.
+    messages = Context.build(SystemChatBot, query_message, extra=RequestMessages).messages
 
     # Generate a response using the Groq client.
     preferred_model = env_vars.get("GroqModel") or "llama-3.1-8b-instant"
@@ -90,7 +117,7 @@ def RealTimeSearchEngine(prompt):
     try:
         completion = client.chat.completions.create(
             model=model_to_use,
-            messages=SystemChatBot + [{"role": "system", "content": Information()}] + messages,
+            messages=messages,
             temperature=0.7,
             max_tokens=2048,
             top_p=1,
@@ -103,7 +130,7 @@ def RealTimeSearchEngine(prompt):
                 model_to_use = "llama-3.1-8b-instant"
                 completion = client.chat.completions.create(
                     model=model_to_use,
-                    messages=SystemChatBot + [{"role": "system", "content": Information()}] + messages,
+                    messages=messages,
                     temperature=0.7,
                     max_tokens=2048,
                     top_p=1,
@@ -118,20 +145,16 @@ def RealTimeSearchEngine(prompt):
     Answer = " "
 
     # Concatenate response chunks from the streaming output.
-    for chunk in completion:
+    for chunk in IterateCancellable(completion, cancel):
         if chunk.choices[0].delta.content:
             Answer += chunk.choices[0].delta.content
+            if on_token:
+                on_token(chunk.choices[0].delta.content)
 
     # Clean up the response.
     Answer = Answer.strip().replace("</s>", "")
-    messages.append({"role": "assistant", "content": Answer})
-
-    # Save the updated chat log back to the JSON file.
-    with open(r"Data\ChatLog.json", "w") as f:
-        dump(messages, f, indent=4)
-
-    # Remove the most recent system from the chatbot conversation.
-    SystemChatBot.pop()
+    # Append the query and the response to the chat log.
+    ChatLog.extend([query_message, {"role": "assistant", "content": Answer}])
     return AnswerModifier(Answer=Answer)
 
 # Main entry point of the program for interactive querying.
@@ -0,0 +1,110 @@
+import json # Import json to persist cached results.
+import re # Import re to normalize queries.
+import threading # Import threading to guard the cache and in-flight fetches.
+import time # Import time for TTL handling.
+from collections import OrderedDict # Import OrderedDict for LRU ordering.
+from concurrent.futures import ThreadPoolExecutor # Import a pool for parallel and background fetches.
+from pathlib import Path # Import Path for the cache file.
+
+
+def NormalizeSearchQuery(query: str) -> str:
+    """Lowercase and drop punctuation: "Today's News?" -> "todays news"."""
+    text = (query or "").lower().replace("'", "")
+    return " ".join(re.sub(r"[^\w ]+", " ", text).split())
+
+
+class SearchCache:
+    """
+    TTL cache in front of a search function with stale-while-revalidate.
+    Fresh entries (younger than `ttl`) are returned directly. Stale entries
+    (younger than `stale_ttl`) are returned immediately while a background
+    refresh runs. Anything older is fetched on the spot. Concurrent requests
+    for the same query share one fetch.
+    """
+
+    def __init__(self, fetch, path, ttl: float = 900, stale_ttl: float = 6 * 3600,
+                 max_entries: int = 300, workers: int = 4):
+        self.fetch       = fetch # fetch(query) -> list of {"title", "description"}
+        self.path        = Path(path)
+        self.ttl         = ttl
+        self.stale_ttl   = stale_ttl
+        self.max_entries = max_entries
+        self._lock       = threading.Lock()
+        self._entries    = OrderedDict() # key -> {"results": [...], "fetched_at": float}
+        self._inflight   = {}            # key -> Future
+        self._pool       = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="search")
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"[SearchCache] Could not read cache: {e}")
+            return
+        now = time.time()
+        for key, entry in entries:
+            if now - entry.get("fetched_at", 0) < self.stale_ttl:
+                self._entries[key] = entry
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(list(self._entries.items()), f, ensure_ascii=False)
+            tmp.replace(self.path)
+        except Exception as e:
+            print(f"[SearchCache] Could not save cache: {e}")
+
+    def _refresh(self, key: str, query: str):
+        try:
+            results = self.fetch(query)
+            with self._lock:
+                self._entries[key] = {"results": results, "fetched_at": time.time()}
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                self._save()
+            return results
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _submit(self, key: str, query: str):
+        # Caller holds the lock. Reuse an in-flight fetch for the same key.
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._pool.submit(self._refresh, key, query)
+            self._inflight[key] = future
+        return future
+
+    def _lookup(self, query: str):
+        """Return (results, None) on a cache hit or (None, future) when a fetch is needed."""
+        key = NormalizeSearchQuery(query)
+        with self._lock:
+            entry = self._entries.get(key)
+            age = time.time() - entry["fetched_at"] if entry else None
+            if entry and age < self.ttl:
+                self._entries.move_to_end(key)
+                return entry["results"], None
+            if entry and age < self.stale_ttl:
+                self._submit(key, query) # Revalidate in the background.
+                return entry["results"], None
+            return None, self._submit(key, query)
+
+    def get(self, query: str, cancel=None) -> list:
+        """Cached or freshly fetched results; raises Cancelled if `cancel` fires while waiting."""
+        results, future = self._lookup(query)
+        if future is None:
+            return results
+        return cancel.wait_future(future) if cancel else future.result()
+
+    def get_many(self, queries: list, cancel=None) -> list:
+        """Resolve several queries concurrently; results keep the input order."""
+        lookups = [self._lookup(q) for q in queries]
+        wait = cancel.wait_future if cancel else (lambda future: future.result())
+        # An abandoned fetch still finishes in the background and fills the cache.
+        return [results if future is None else wait(future) for results, future in lookups]
@@ -0,0 +1,98 @@
+"""
+Compare speech backends on recorded WAV fixtures.
+
+    python -m Backend.SPEECH_TO_TEXT.BenchmarkSpeech Data/SpeechFixtures/*.wav --backends chrome vosk
+
+For each backend this reports cold start (time until the backend is ready),
+resident memory of this process and its children (Chrome, chromedriver) after
+start, and per fixture the transcript, end-of-speech latency and, when a
+`<fixture>.txt` with the expected text exists, the word error rate.
+Memory is only reported when `psutil` is installed.
+"""
+import argparse # Import argparse for the command line.
+import os # Import os for the process id.
+import time # Import time for the measurements.
+from pathlib import Path # Import Path to find expected transcripts.
+
+from Backend.SPEECH_TO_TEXT.SpeechBackend import SelectSpeechBackend # Import the backend factory.
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def ProcessTreeRSS() -> int | None:
+    """Resident memory of this process and all of its children, in bytes."""
+    if psutil is None:
+        return None
+    process = psutil.Process(os.getpid())
+    total = process.memory_info().rss
+    for child in process.children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+
+def WordErrorRate(expected: str, actual: str) -> float:
+    """Word-level Levenshtein distance divided by the expected word count."""
+    ref, hyp = expected.lower().split(), actual.lower().split()
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        previous, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (r != h))
+    return row[-1] / max(1, len(ref))
+
+
+def Benchmark(name: str, fixtures: list):
+    baseline = ProcessTreeRSS()
+    started = time.perf_counter()
+    backend = SelectSpeechBackend(name)
+    backend.start().result()
+    cold_start = time.perf_counter() - started
+    memory = ProcessTreeRSS()
+    print(f"\n== {backend.name} ==")
+    print(f"cold start: {cold_start:.2f}s")
+    if memory is not None:
+        print(f"memory after start: {(memory - baseline) / 1e6:.0f} MB (+ baseline {baseline / 1e6:.0f} MB)")
+
+    latencies, errors = [], []
+    for path in fixtures:
+        try:
+            result = backend.transcribe_file(path)
+        except Exception as e:
+            print(f"{Path(path).name}: failed ({e})")
+            continue
+        line = f"{Path(path).name}: '{result.text}'"
+        if result.latency is not None:
+            latencies.append(result.latency)
+            line += f" end-of-speech latency {result.latency * 1000:.0f} ms"
+        expected = Path(path).with_suffix(".txt")
+        if expected.exists():
+            wer = WordErrorRate(expected.read_text(encoding="utf-8"), result.text)
+            errors.append(wer)
+            line += f" WER {wer:.0%}"
+        print(line)
+
+    if latencies:
+        latencies.sort()
+        print(f"latency median {latencies[len(latencies) // 2] * 1000:.0f} ms, max {latencies[-1] * 1000:.0f} ms")
+    if errors:
+        print(f"mean WER {sum(errors) / len(errors):.0%}")
+    backend.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark speech backends on WAV fixtures.")
+    parser.add_argument("fixtures", nargs="+", help="16-bit PCM WAV files")
+    parser.add_argument("--backends", nargs="+", default=["chrome", "vosk"])
+    args = parser.parse_args()
+    for name in args.backends:
+        Benchmark(name, args.fixtures)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+from Backend.SPEECH_TO_TEXT.Translator import Translate, TranslateMode, InputLanguage # Import the cached translator and its settings.
+from Backend.EVENT_BUS.EventBus import AssistantStatusChannel # Import the status channel for the "Translating..." notice.
+
+# Transcript clean-up shared by every speech backend. Kept free of Selenium so
+# the offline backend can finalize queries without the Chrome dependencies.
+
+# Function to set the assistant's status on the shared state bus.
+def SetAssistantStatus(Status):
+    AssistantStatusChannel.publish(Status)
+
+# Function to modify a query to ensure proper punctuation and formatting.
+def QueryModifier(Query):
+    new_query = Query.lower().strip()
+    query_words = new_query.split()
+    question_words = ["how", "what", "who", "where", "when", "why", "which", "whose", "whom", "can you", "what's", "where's", "how's", "can you"]
+
+    #Check if the query is a question and add a question mark if necessary
+    if any(word + " " in new_query for word in question_words):
+        if query_words[-1][-1] in ['.', '?', '!']:
+            new_query = new_query[:-1] + "?"
+        else:
+            new_query += "?"
+    else:
+        # Add a period if the query is not a question
+        if query_words[-1][-1] not in ['.', '?', '!']:
+            new_query = new_query + "."
+        else:
+            # If it already ends with punctuation, keep it as-is (don't duplicate)
+            if query_words[-1][-1] != '.':
+                new_query = new_query[:-1] + "."
+            # else leave as is
+
+    return new_query.capitalize()
+
+# Function to translate text into english (cached, with a timeout that falls back to the original text).
+def UniversalTranslator(Text):
+    english_translation = Translate(Text, "en", "auto")
+    return english_translation.capitalize()
+
+# Turn a raw transcript into the query passed to the decision model.
+def FinalizeQuery(Text):
+    # If the input language is English, return the modified query.
+    # In parallel mode the caller translates while the decision model runs (see main.ExecuteTurn).
+    if InputLanguage.lower() == "en" or "en" in InputLanguage.lower() or TranslateMode == "parallel":
+        return QueryModifier(Text)
+    else:
+        # If the input language is not English, translate the text and return it.
+        SetAssistantStatus("Translating...")
+        return QueryModifier(UniversalTranslator(Text))
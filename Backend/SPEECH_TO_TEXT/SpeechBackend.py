@@ -0,0 +1,293 @@
+import json # Import json to read Vosk results.
+import queue # Import queue to hand microphone frames to the recognizer.
+import threading # Import threading for background model loading.
+import time # Import time for latency measurements and real-time pacing.
+import wave # Import wave to read WAV fixtures.
+from abc import ABC, abstractmethod # Import ABC so backends missing a hook fail on construction.
+from collections import deque, namedtuple # Import deque for the VAD pre-roll and namedtuple for results.
+from concurrent.futures import Future # Import Future to expose backend readiness.
+from pathlib import Path # Import Path to resolve project root reliably.
+
+import numpy as np # Import numpy for resampling and the energy VAD.
+from dotenv import dotenv_values # Import dotenv_values to read the backend choice from .env.
+
+from Backend.PIPELINE.Cancellation import Cancelled # Import the turn cancellation error.
+
+# Use WebRTC's VAD when it is installed; otherwise fall back to an energy threshold.
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+# Resolve project root (two levels up from this file) and load environment variables.
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+env_vars = dotenv_values(str(PROJECT_ROOT / ".env"))
+
+# A recognized utterance and its end-of-speech latency in seconds (None when unknown).
+Transcript = namedtuple("Transcript", "text latency")
+
+
+class VoiceActivityDetector:
+    """
+    Classifies 10/20/30 ms frames of 16-bit mono PCM as speech or silence.
+    Uses webrtcvad when available, else the frame's RMS against `energy_threshold`.
+    """
+
+    def __init__(self, sample_rate: int = 16000, aggressiveness: int = 2, energy_threshold: float = 500.0):
+        self.sample_rate      = sample_rate
+        self.energy_threshold = energy_threshold
+        self._vad             = webrtcvad.Vad(aggressiveness) if webrtcvad else None
+
+    def is_speech(self, frame: bytes) -> bool:
+        if self._vad is not None:
+            return self._vad.is_speech(frame, self.sample_rate)
+        samples = np.frombuffer(frame, dtype=np.int16).astype(np.float32)
+        return bool(samples.size) and float(np.sqrt(np.mean(samples * samples))) >= self.energy_threshold
+
+
+def ReadWavFrames(path, sample_rate: int = 16000, frame_ms: int = 30) -> list:
+    """Read a WAV file as 16-bit mono frames of `frame_ms` at `sample_rate`."""
+    with wave.open(str(path), "rb") as f:
+        channels, width, rate = f.getnchannels(), f.getsampwidth(), f.getframerate()
+        raw = f.readframes(f.getnframes())
+    if width != 2:
+        raise ValueError(f"{path}: expected 16-bit PCM, got {width * 8}-bit")
+    samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    if rate != sample_rate:
+        positions = np.arange(0, len(samples), rate / sample_rate)
+        samples = np.interp(positions, np.arange(len(samples)), samples)
+    pcm = np.clip(samples, -32768, 32767).astype(np.int16).tobytes()
+    size = sample_rate * frame_ms // 1000 * 2
+    return [pcm[i:i + size] for i in range(0, len(pcm) - size + 1, size)]
+
+
+def SpeechEndOffset(frames: list, vad: VoiceActivityDetector, frame_ms: int = 30) -> float:
+    """Seconds from the start of `frames` to the end of the last voiced frame."""
+    last = 0
+    for i, frame in enumerate(frames):
+        if vad.is_speech(frame):
+            last = i + 1
+    return last * frame_ms / 1000
+
+
+class SpeechBackend(ABC):
+    """
+    Interface for speech recognizers used by the main loop.
+    start() begins loading in the background and returns a Future; recognize()
+    blocks until one utterance was heard and returns the query text.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self._future = None
+        self._lock   = threading.Lock()
+
+    @abstractmethod
+    def _load(self):
+        """Load models / launch processes; runs on a background thread."""
+
+    def start(self) -> Future:
+        with self._lock:
+            if self._future is None:
+                self._future = Future()
+                future = self._future
+
+                def run():
+                    try:
+                        future.set_result(self._load())
+                    except Exception as e:
+                        print(f"[{self.name}] Could not start speech backend: {e}")
+                        with self._lock:
+                            if self._future is future:
+                                self._future = None # Let the next start try again.
+                        future.set_exception(e)
+
+                threading.Thread(target=run, name=f"{self.name}-speech", daemon=True).start()
+            return self._future
+
+    def ready(self) -> bool:
+        future = self._future
+        return future is not None and future.done() and future.exception() is None
+
+    @abstractmethod
+    def recognize(self, cancel=None, on_partial=None) -> str:
+        """Listen for one utterance and return it as a query."""
+
+    @abstractmethod
+    def transcribe_file(self, path, on_partial=None) -> Transcript:
+        """Recognize the speech in a WAV file (used by BenchmarkSpeech)."""
+
+    def close(self):
+        pass
+
+
+class ChromeSpeechBackend(SpeechBackend):
+    """Web Speech API in headless Chrome (Backend/SPEECH_TO_TEXT/SpeechToText.py)."""
+
+    name = "chrome"
+
+    def __init__(self):
+        super().__init__()
+        # Imported here so the offline backend does not need Selenium.
+        from Backend.SPEECH_TO_TEXT import SpeechToText
+        self._stt = SpeechToText
+
+    def _load(self):
+        return self._stt.WaitForSpeechEngine()
+
+    # The driver is shared with SpeechToText, which starts it on its own thread.
+    def start(self) -> Future:
+        return self._stt.StartSpeechEngine()
+
+    def ready(self) -> bool:
+        return self._stt.SpeechEngineReady()
+
+    def recognize(self, cancel=None, on_partial=None) -> str:
+        return self._stt.SpeechRecognition(cancel=cancel, on_partial=on_partial)
+
+    def transcribe_file(self, path, on_partial=None) -> Transcript:
+        """
+        Launch a separate Chrome that captures `path` instead of the microphone.
+        Latency is measured from the end of speech in the file, assuming playback
+        starts when recognition does.
+        """
+        speech_end = SpeechEndOffset(ReadWavFrames(path), VoiceActivityDetector())
+        options = self._stt.ChromeOptions([f"--use-file-for-fake-audio-capture={Path(path).resolve()}%noloop"])
+        driver = self._stt.LaunchChrome(options)
+        try:
+            started = time.perf_counter()
+            text = self._stt.ListenOnce(driver, on_partial=on_partial)
+            return Transcript(text, time.perf_counter() - started - speech_end)
+        finally:
+            driver.quit()
+
+    def close(self):
+        if self._stt.driver is not None:
+            self._stt.driver.quit()
+
+
+class VoskSpeechBackend(SpeechBackend):
+    """
+    Offline recognition with a local Vosk model on microphone audio.
+    Frames are gated by voice-activity detection: recognition starts on the
+    first voiced frame (with a short pre-roll) and the utterance ends after
+    `silence_ms` of silence, so endpointing does not depend on the model.
+    Needs the optional `vosk` package (and `sounddevice` for the microphone),
+    listed in Requirements-Offline.txt.
+    """
+
+    name = "vosk"
+
+    def __init__(self, model_path, sample_rate: int = 16000, frame_ms: int = 30,
+                 silence_ms: int = 600, preroll_ms: int = 300, max_utterance_s: float = 15):
+        super().__init__()
+        self.model_path      = str(model_path)
+        self.sample_rate     = sample_rate
+        self.frame_ms        = frame_ms
+        self.silence_ms      = silence_ms
+        self.preroll_ms      = preroll_ms
+        self.max_utterance_s = max_utterance_s
+        self.vad             = VoiceActivityDetector(sample_rate)
+        self._model          = None
+
+    def _load(self):
+        from vosk import Model, SetLogLevel
+        SetLogLevel(-1)
+        self._model = Model(self.model_path)
+        return self._model
+
+    def _utterance(self, frames, cancel=None, on_partial=None, pace=False) -> Transcript:
+        """Run VAD-gated recognition over an iterable of frames until end of speech."""
+        from vosk import KaldiRecognizer
+        recognizer = KaldiRecognizer(self.start().result(), self.sample_rate)
+        preroll = deque(maxlen=max(1, self.preroll_ms // self.frame_ms))
+        segments, partial = [], ""
+        speaking, silence, spoken = False, 0, 0
+        speech_end = None
+        for frame in frames:
+            if cancel is not None and cancel.cancelled:
+                raise Cancelled(cancel.reason)
+            if pace:
+                time.sleep(self.frame_ms / 1000) # Feed a file at microphone speed.
+            voiced = self.vad.is_speech(frame)
+            if not speaking:
+                preroll.append(frame)
+                if not voiced:
+                    continue
+                speaking = True
+                frame = b"".join(preroll)
+            spoken += self.frame_ms
+            silence = 0 if voiced else silence + self.frame_ms
+            if voiced:
+                speech_end = time.perf_counter()
+            if recognizer.AcceptWaveform(frame):
+                text = json.loads(recognizer.Result()).get("text", "")
+                if text:
+                    segments.append(text)
+            elif on_partial:
+                current = json.loads(recognizer.PartialResult()).get("partial", "")
+                if current and current != partial:
+                    partial = current
+                    on_partial(" ".join(segments + [current]))
+            if silence >= self.silence_ms or spoken >= self.max_utterance_s * 1000:
+                break
+        final = json.loads(recognizer.FinalResult()).get("text", "")
+        text = " ".join(segments + [final]).strip()
+        latency = time.perf_counter() - speech_end if speech_end is not None else None
+        return Transcript(text, latency)
+
+    def _microphone_frames(self, stop: threading.Event):
+        import sounddevice
+        frames = queue.Queue()
+        block = self.sample_rate * self.frame_ms // 1000
+        with sounddevice.RawInputStream(samplerate=self.sample_rate, blocksize=block, dtype="int16",
+                                        channels=1, callback=lambda data, *_: frames.put(bytes(data))):
+            while not stop.is_set():
+                try:
+                    yield frames.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+
+    def recognize(self, cancel=None, on_partial=None) -> str:
+        from Backend.SPEECH_TO_TEXT.QueryText import FinalizeQuery
+        stop = threading.Event()
+        if cancel is not None:
+            unregister = cancel.on_cancel(stop.set)
+        try:
+            while True:
+                frames = self._microphone_frames(stop)
+                try:
+                    result = self._utterance(frames, cancel, on_partial)
+                finally:
+                    frames.close() # Close the input stream between utterances.
+                if cancel is not None:
+                    cancel.raise_if_cancelled()
+                if result.text:
+                    return FinalizeQuery(result.text)
+                # Noise without words; keep listening.
+        finally:
+            stop.set()
+            if cancel is not None:
+                unregister()
+
+    def transcribe_file(self, path, on_partial=None, realtime: bool = True) -> Transcript:
+        frames = ReadWavFrames(path, self.sample_rate, self.frame_ms)
+        return self._utterance(frames, on_partial=on_partial, pace=realtime)
+
+
+def SelectSpeechBackend(name=None) -> SpeechBackend:
+    """Backend named by `name` or the SpeechBackend .env setting ("chrome" or "vosk")."""
+    name = (name or env_vars.get("SpeechBackend") or "chrome").strip().lower()
+    if name == "vosk":
+        model_path = env_vars.get("VoskModelPath") or str(PROJECT_ROOT / "Data" / "vosk-model")
+        try:
+            import vosk # noqa: F401
+            return VoskSpeechBackend(model_path, silence_ms=int(env_vars.get("SpeechSilenceMs") or 600))
+        except ImportError:
+            print("[Speech] vosk is not installed; using the Chrome backend")
+    elif name != "chrome":
+        print(f"[Speech] Unknown SpeechBackend '{name}'; using the Chrome backend")
+    return ChromeSpeechBackend()
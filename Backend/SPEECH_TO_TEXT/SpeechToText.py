@@ -5,8 +5,12 @@ from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 from dotenv import dotenv_values
 import os
-import mtranslate as mt
+import time
+import threading
+from concurrent.futures import Future
+from Backend.SPEECH_TO_TEXT.QueryText import SetAssistantStatus, QueryModifier, UniversalTranslator, FinalizeQuery
 from pathlib import Path
+from Backend.PIPELINE.Cancellation import Cancelled
 
 # Load environment variables from the .env file.
 # Resolve project root (two levels up from this file)
@@ -29,24 +33,70 @@ HtmlCode = '''<!DOCTYPE html>
     <script>
         const output = document.getElementById('output');
         let recognition;
+        let listening = false;
+        // Recognition events ({type: "partial" | "final", text}) waiting to be collected by Python.
+        const events = [];
+        let waiter = null;
+
+        function pushEvent(type, text) {
+            events.push({type: type, text: text});
+            if (waiter) {
+                const resolve = waiter;
+                waiter = null;
+                resolve();
+            }
+        }
+
+        // Called through execute_async_script: resolves with the events after index `since`,
+        // as soon as one arrives or after `timeoutMs` with an empty list.
+        window.nextSpeechEvents = function(since, timeoutMs, done) {
+            if (events.length > since) {
+                done(events.slice(since));
+                return;
+            }
+            const timer = setTimeout(function() {
+                waiter = null;
+                done([]);
+            }, timeoutMs);
+            waiter = function() {
+                clearTimeout(timer);
+                done(events.slice(since));
+            };
+        };
 
         function startRecognition() {
             recognition = new webkitSpeechRecognition() || new SpeechRecognition();
             recognition.lang = '';
             recognition.continuous = true;
+            recognition.interimResults = true;
+            listening = true;
 
             recognition.onresult = function(event) {
-                const transcript = event.results[event.results.length - 1][0].transcript;
-                output.textContent += transcript;
+                let partial = "";
+                for (let i = event.resultIndex; i < event.results.length; i++) {
+                    const transcript = event.results[i][0].transcript;
+                    if (event.results[i].isFinal) {
+                        output.textContent += transcript;
+                        pushEvent("final", transcript);
+                    } else {
+                        partial += transcript;
+                    }
+                }
+                if (partial) {
+                    pushEvent("partial", partial);
+                }
             };
 
             recognition.onend = function() {
-                recognition.start();
+                if (listening) {
+                    recognition.start();
+                }
             };
             recognition.start();
         }
 
         function stopRecognition() {
+            listening = false;
             recognition.stop();
             output.innerHTML = "";
         }
@@ -57,102 +107,172 @@ HtmlCode = '''<!DOCTYPE html>
 # Replace the language setting in the HTML code with the input language from the environment variables.
 HtmlCode = str(HtmlCode).replace("recognition.lang = '';", f"recognition.lang = '{InputLanguage}';")
 
-# Write the modified HTML code to a file at project Data directory.
+# The HTML page and cached driver path live in the project Data directory.
 data_dir = PROJECT_ROOT / "Data"
-data_dir.mkdir(parents=True, exist_ok=True)
 voice_file = data_dir / "Voice.html"
-with open(voice_file, "w", encoding="utf-8") as f:
-    f.write(HtmlCode)
+driver_path_file = data_dir / "ChromeDriverPath.txt"
 
 # Set current_dir to project root to keep original path formatting below.
 current_dir = str(PROJECT_ROOT)
 # Generate the file path for the HTML file.
 Link = f"{current_dir}/Data/Voice.html"
 
-# Set Chrome options for the webDriver.
-chrome_options = Options()
-user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/89.0.142.86 Safari/537.36"
-chrome_options.add_argument(f"user-agent={user_agent}")
-chrome_options.add_argument("--use-fake-ui-for-media-stream")
-chrome_options.add_argument("--use-fake-device-for-media-stream")
-chrome_options.add_argument("--headless=new")
-# Reduce Chrome noise and disable push/notifications to avoid GCM-related errors
-chrome_options.add_argument("--disable-notifications")
-chrome_options.add_argument("--disable-background-networking")
-chrome_options.add_argument("--disable-features=Translate,PrivacySandboxAdsAPIs,InterestFeedContent,MediaRouter,OptimizationHints")
-chrome_options.add_argument("--log-level=3")  # Errors only
-chrome_options.add_argument("--disable-logging")
-chrome_options.add_experimental_option("excludeSwitches", ["enable-logging", "enable-automation"])
-chrome_options.add_experimental_option("useAutomationExtension", False)
-chrome_options.add_experimental_option("prefs", {"profile.default_content_setting_values.notifications": 2})
-
-# Initialize the Chrome WebDriver using the ChromeDriverManager.
-service = Service(ChromeDriverManager().install())
-driver = webdriver.Chrome(service=service, options=chrome_options)
+# Set Chrome options for the webDriver; `extra_args` are appended (e.g. a fake audio capture file).
+def ChromeOptions(extra_args=()):
+    chrome_options = Options()
+    user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/89.0.142.86 Safari/537.36"
+    chrome_options.add_argument(f"user-agent={user_agent}")
+    chrome_options.add_argument("--use-fake-ui-for-media-stream")
+    chrome_options.add_argument("--use-fake-device-for-media-stream")
+    chrome_options.add_argument("--headless=new")
+    # Reduce Chrome noise and disable push/notifications to avoid GCM-related errors
+    chrome_options.add_argument("--disable-notifications")
+    chrome_options.add_argument("--disable-background-networking")
+    chrome_options.add_argument("--disable-features=Translate,PrivacySandboxAdsAPIs,InterestFeedContent,MediaRouter,OptimizationHints")
+    chrome_options.add_argument("--log-level=3")  # Errors only
+    chrome_options.add_argument("--disable-logging")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-logging", "enable-automation"])
+    chrome_options.add_experimental_option("useAutomationExtension", False)
+    chrome_options.add_experimental_option("prefs", {"profile.default_content_setting_values.notifications": 2})
+    for arg in extra_args:
+        chrome_options.add_argument(arg)
+    return chrome_options
+
+chrome_options = ChromeOptions()
+
+# The Chrome WebDriver is created in the background by StartSpeechEngine().
+driver = None
+_engine_future = None
+_engine_lock = threading.Lock()
+
+# Write Voice.html only when its content changed since the last run.
+def WriteVoiceHtml():
+    data_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        if voice_file.read_text(encoding="utf-8") == HtmlCode:
+            return
+    except OSError:
+        pass
+    with open(voice_file, "w", encoding="utf-8") as f:
+        f.write(HtmlCode)
+
+# Resolve the chromedriver path, reusing the one found on a previous run to skip the network check.
+def ChromeDriverPath(refresh=False):
+    if not refresh:
+        try:
+            cached = driver_path_file.read_text(encoding="utf-8").strip()
+            if cached and os.path.exists(cached):
+                return cached
+        except OSError:
+            pass
+    path = ChromeDriverManager().install()
+    try:
+        driver_path_file.write_text(path, encoding="utf-8")
+    except OSError as e:
+        print(f"[SpeechToText] Could not cache driver path: {e}")
+    return path
+
+# Launch headless Chrome; if the cached driver no longer matches Chrome, resolve it again once.
+def LaunchChrome(options=None):
+    options = options or chrome_options
+    WriteVoiceHtml()
+    try:
+        new_driver = webdriver.Chrome(service=Service(ChromeDriverPath()), options=options)
+    except Exception as e:
+        print(f"[SpeechToText] Cached chromedriver failed ({e}); resolving it again")
+        new_driver = webdriver.Chrome(service=Service(ChromeDriverPath(refresh=True)), options=options)
+    # Let each wait block in the browser a little longer than it takes to time out there.
+    new_driver.set_script_timeout(SpeechEventWaitMs / 1000 + 5)
+    return new_driver
+
+def _launch_driver():
+    global driver
+    driver = LaunchChrome()
+    return driver
+
+# Start the speech engine on a background thread; returns a future resolving to the driver.
+def StartSpeechEngine() -> Future:
+    global _engine_future
+    with _engine_lock:
+        if _engine_future is None:
+            _engine_future = Future()
+            future = _engine_future
+
+            def run():
+                global _engine_future
+                try:
+                    future.set_result(_launch_driver())
+                except Exception as e:
+                    print(f"[SpeechToText] Could not start speech engine: {e}")
+                    with _engine_lock:
+                        if _engine_future is future:
+                            _engine_future = None # Let the next start try again.
+                    future.set_exception(e)
+
+            threading.Thread(target=run, name="speech-engine", daemon=True).start()
+        return _engine_future
+
+# Block until the speech engine is ready (starting it if needed) and return the driver.
+def WaitForSpeechEngine(timeout=None):
+    return StartSpeechEngine().result(timeout)
+
+# True once the driver is up, without blocking.
+def SpeechEngineReady():
+    return driver is not None
 
 # Define the path for temporary files.
 TempDirPath = rf"{current_dir}/Frontend/Files"
 os.makedirs(TempDirPath, exist_ok=True)
 
-# Function to set the assistant's status by writing it to a file.
-def SetAssistantStatus(Status):
-    with open(rf"{TempDirPath}/Status.data", "w", encoding="utf-8") as file:
-        file.write(Status)
+# How long one wait inside the page may block before Python checks for cancellation (ms).
+SpeechEventWaitMs = 100
 
-# Function to modify a query to ensure proper punctuation and formatting.
-def QueryModifier(Query):
-    new_query = Query.lower().strip()
-    query_words = new_query.split()
-    question_words = ["how", "what", "who", "where", "when", "why", "which", "whose", "whom", "can you", "what's", "where's", "how's", "can you"]
+# Script run with execute_async_script; the last argument is the WebDriver callback.
+WaitForSpeechScript = "window.nextSpeechEvents(arguments[0], arguments[1], arguments[arguments.length - 1]);"
 
-    #Check if the query is a question and add a question mark if necessary
-    if any(word + " " in new_query for word in question_words):
-        if query_words[-1][-1] in ['.', '?', '!']:
-            new_query = new_query[:-1] + "?"
-        else:
-            new_query += "?"
-    else:
-        # Add a period if the query is not a question
-        if query_words[-1][-1] not in ['.', '?', '!']:
-            new_query = new_query + "."
-        else:
-            # If it already ends with punctuation, keep it as-is (don't duplicate)
-            if query_words[-1][-1] != '.':
-                new_query = new_query[:-1] + "."
-            # else leave as is
-    
-    return new_query.capitalize()
-
-# Function to translate text into english usig the mtranslate library.
-def UniversalTranslator(Text):
-    english_translation = mt.translate(Text, "en", "auto")
-    return english_translation.capitalize()
-
-# Function to perform speech recognition using the webDriver
-def SpeechRecognition():
+# Listen on `driver` until Voice.html reports a final transcript and return it as spoken.
+# Blocks on recognition events pushed by the page; `on_partial(text)` receives interim transcripts.
+def ListenOnce(driver, cancel=None, on_partial=None):
     # Open the HTML file in the browser.
     driver.get("file:///" + Link)
     # Start speech recognition by clicking the start button.
     driver.find_element(by=By.ID, value="start").click()
 
+    seen = 0
     while True:
-        try:
-            # Get the recognized text from the HTML output element.
-            Text = driver.find_element(by=By.ID, value="output").text
-            if Text:
-                # Stop recognition by clicking the stop button.
+        # Stop listening if the turn was cancelled (e.g. the mic was switched off).
+        if cancel is not None and cancel.cancelled:
+            try:
                 driver.find_element(by=By.ID, value="end").click()
+            except Exception:
+                pass
+            raise Cancelled(cancel.reason)
 
-                # If the input language is English, return the modified query.
-                if InputLanguage.lower() == "en" or "en" in InputLanguage.lower():
-                    return QueryModifier(Text)
-                else:
-                    # If the input language is not English, translate the text and return it.
-                    SetAssistantStatus("Translating...")
-                    return QueryModifier(UniversalTranslator(Text))
-                
+        try:
+            # Wait inside the page until recognition produces something (or the wait times out).
+            events = driver.execute_async_script(WaitForSpeechScript, seen, SpeechEventWaitMs) or []
         except Exception as e:
-            pass
+            print(f"[SpeechToText] Waiting for speech failed: {e}")
+            time.sleep(0.1) # Avoid spinning if the page or driver is not responding.
+            continue
+        seen += len(events)
+
+        for event in events:
+            Text = event.get("text", "").strip()
+            if not Text:
+                continue
+            if event.get("type") == "partial":
+                if on_partial:
+                    on_partial(Text)
+                continue
+
+            # Stop recognition by clicking the stop button.
+            driver.find_element(by=By.ID, value="end").click()
+            return Text
+
+# Function to perform speech recognition using the webDriver.
+def SpeechRecognition(cancel=None, on_partial=None):
+    return FinalizeQuery(ListenOnce(WaitForSpeechEngine(), cancel, on_partial))
 
 # Main execution block.
 if __name__ == "__main__":
@@ -0,0 +1,106 @@
+import json # Import json to persist the cache.
+import threading # Import threading to guard the cache across threads.
+from collections import OrderedDict # Import OrderedDict for LRU ordering.
+from concurrent.futures import Future, ThreadPoolExecutor # Import a pool to bound translation calls with a timeout.
+from pathlib import Path # Import Path to resolve project root reliably.
+
+import mtranslate as mt # Import mtranslate for Google Translate lookups.
+from dotenv import dotenv_values # Import dotenv_values to read translation settings.
+
+# Resolve project root (two levels up from this file) and load environment variables.
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+env_vars = dotenv_values(str(PROJECT_ROOT / ".env"))
+
+InputLanguage = env_vars.get("InputLanguage") or "en"
+# Seconds to wait for a translation before using the untranslated text.
+TranslateTimeout = float(env_vars.get("TranslateTimeout") or 3)
+# "before": translate, then decide (default). "parallel": decide on the spoken text while translating.
+TranslateMode = (env_vars.get("TranslateMode") or "before").strip().lower()
+
+
+class TranslationCache:
+    """LRU of translations keyed on normalized text and language pair, mirrored to a JSON file."""
+
+    def __init__(self, path, max_entries: int = 1000):
+        self.path        = Path(path)
+        self.max_entries = max_entries
+        self._lock       = threading.Lock()
+        self._entries    = OrderedDict() # "src|dest|text" -> translation
+        self._load()
+
+    @staticmethod
+    def key(text: str, src: str, dest: str) -> str:
+        return f"{src}|{dest}|{' '.join(text.lower().split())}"
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._entries.update(json.load(f))
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"[Translator] Could not read cache: {e}")
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(list(self._entries.items()), f, ensure_ascii=False)
+            tmp.replace(self.path)
+        except Exception as e:
+            print(f"[Translator] Could not save cache: {e}")
+
+    def get(self, text: str, src: str, dest: str):
+        key = self.key(text, src, dest)
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, text: str, src: str, dest: str, translation: str):
+        key = self.key(text, src, dest)
+        with self._lock:
+            self._entries[key] = translation
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._save()
+
+
+Cache = TranslationCache(PROJECT_ROOT / "Data" / "TranslationCache.json",
+                         max_entries=int(env_vars.get("TranslationCacheSize") or 1000))
+_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="translate")
+
+
+def NeedsTranslation() -> bool:
+    return not ("en" in InputLanguage.lower())
+
+
+def _translate(text: str, dest: str, src: str) -> str:
+    translation = mt.translate(text, dest, src)
+    if translation:
+        Cache.put(text, src, dest, translation)
+    return translation
+
+
+def TranslateAsync(text: str, dest: str = "en", src: str = "auto") -> Future:
+    """Start translating `text`; the future resolves to the translation (or raises)."""
+    cached = Cache.get(text, src, dest)
+    if cached is not None:
+        future = Future()
+        future.set_result(cached)
+        return future
+    return _pool.submit(_translate, text, dest, src)
+
+
+def Translate(text: str, dest: str = "en", src: str = "auto", timeout: float | None = None) -> str:
+    """Translate `text`, falling back to it unchanged on error or after `timeout` seconds."""
+    try:
+        return TranslateAsync(text, dest, src).result(TranslateTimeout if timeout is None else timeout) or text
+    except Exception as e:
+        print(f"[Translator] Using untranslated text ({type(e).__name__}: {e})")
+        return text
@@ -0,0 +1,129 @@
+import hashlib # Import hashlib to derive content-addressed file names.
+import os # Import os for file handling.
+import threading # Import threading to guard the index across threads.
+import time # Import time to track last use.
+from collections import OrderedDict # Import OrderedDict for the in-memory LRU.
+
+
+def AudioKey(text: str, voice: str, pitch: str, rate: str) -> str:
+    """Stable key for one synthesized utterance."""
+    raw = "\x1f".join([" ".join(str(text).split()), voice, pitch, rate])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """
+    Content-addressed store of synthesized MP3 clips in `directory`.
+    Files are named after AudioKey() and evicted least-recently-used first
+    once their total size exceeds `max_bytes`. The most recent clips are also
+    kept in memory so repeated phrases are played without touching the disk.
+    """
+
+    def __init__(self, directory, max_bytes: int = 64 * 1024 * 1024, memory_items: int = 64):
+        self.directory    = str(directory)
+        self.max_bytes    = max_bytes
+        self.memory_items = memory_items
+        self.hits         = 0
+        self.misses       = 0
+        self._lock        = threading.Lock()
+        self._index       = {}            # key -> [size, last_used]
+        self._memory      = OrderedDict() # key -> bytes
+        self._total       = 0
+        self._scan()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.mp3")
+
+    def _scan(self):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and entry.name.endswith(".mp3"):
+                    stat = entry.stat()
+                    self._index[entry.name[:-4]] = [stat.st_size, stat.st_mtime]
+                    self._total += stat.st_size
+        except Exception as e:
+            print(f"[AudioCache] Could not scan cache: {e}")
+
+    def _remember(self, key: str, audio: bytes):
+        self._memory[key] = audio
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, text: str, voice: str, pitch: str, rate: str):
+        """Return the cached MP3 bytes, or None."""
+        key = AudioKey(text, voice, pitch, rate)
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            now = time.time()
+            entry[1] = now
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return audio
+        try:
+            with open(self._path(key), "rb") as f:
+                audio = f.read()
+            os.utime(self._path(key), (now, now)) # Last use survives restarts.
+        except OSError:
+            with self._lock:
+                entry = self._index.pop(key, None)
+                if entry:
+                    self._total -= entry[0]
+                self.misses += 1
+            return None
+        with self._lock:
+            self._remember(key, audio)
+            self.hits += 1
+        return audio
+
+    def put(self, text: str, voice: str, pitch: str, rate: str, audio: bytes):
+        if not audio:
+            return
+        key = AudioKey(text, voice, pitch, rate)
+        path = self._path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(audio)
+            os.replace(tmp, path)
+        except Exception as e:
+            print(f"[AudioCache] Could not store clip: {e}")
+            return
+        with self._lock:
+            old = self._index.get(key)
+            if old:
+                self._total -= old[0]
+            self._index[key] = [len(audio), time.time()]
+            self._total += len(audio)
+            self._remember(key, audio)
+            self._evict()
+
+    def _evict(self):
+        # Caller holds the lock.
+        if self._total <= self.max_bytes:
+            return
+        for key, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if self._total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            del self._index[key]
+            self._memory.pop(key, None)
+            self._total -= size
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._index
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"clips": len(self._index), "bytes": self._total, "hits": self.hits, "misses": self.misses}
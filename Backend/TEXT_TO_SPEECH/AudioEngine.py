@@ -0,0 +1,181 @@
+import io # Import io to decode clips from memory.
+import queue # Import queue to hand clips to the playback thread.
+import threading # Import threading for the long-lived playback thread.
+import time # Import time to pace polling while a clip is queued.
+
+import pygame # Import pygame for audio output.
+
+
+class Playback:
+    """Handle for one queued clip; `done` is set when it finished or was cancelled."""
+
+    def __init__(self):
+        self.started   = threading.Event()
+        self.done      = threading.Event()
+        self.cancelled = False
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self.done.wait(timeout)
+
+
+class AudioEngine:
+    """
+    One pygame mixer for the whole process, driven by a daemon thread.
+    Clips (MP3 bytes, or raw 16-bit PCM with namehint="pcm") are decoded on
+    that thread and queued on a reserved channel, so the next clip starts the
+    moment the current one ends. stop() drops everything queued and silences
+    the channel; duck() lowers the volume until unduck().
+    """
+
+    def __init__(self, frequency: int = 24000, channels: int = 1, buffer: int = 512, tick: float = 0.01):
+        self.frequency = frequency # edge-tts produces 24 kHz mono audio
+        self.channels  = channels
+        self.buffer    = buffer
+        self.tick      = tick
+        self.volume    = 1.0
+        self._ducked   = None
+        self._lock     = threading.Lock()
+        self._clips    = queue.Queue()
+        self._ready    = threading.Event()
+        self._thread   = None
+        self._channel  = None
+        self._current  = None # Playback on the channel
+        self._queued   = None # Playback queued behind it
+        self._generation = 0  # Bumped by stop(); clips queued before that are dropped
+
+    def start(self):
+        """Initialize the mixer once and start the playback thread."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audio-engine", daemon=True)
+                self._thread.start()
+        self._ready.wait()
+
+    def _init_mixer(self):
+        pygame.mixer.pre_init(self.frequency, -16, self.channels, self.buffer)
+        pygame.mixer.init()
+        pygame.mixer.set_reserved(1)
+        self._channel = pygame.mixer.Channel(0)
+        self._channel.set_volume(self.volume * (self._ducked if self._ducked is not None else 1.0))
+
+    def _decode(self, audio: bytes, namehint: str):
+        if namehint == "pcm":
+            return pygame.mixer.Sound(buffer=audio)
+        return pygame.mixer.Sound(file=io.BytesIO(audio))
+
+    def _advance(self):
+        # Caller holds the lock. Retire clips the channel has finished with.
+        if self._queued is not None and self._channel.get_queue() is None:
+            self._current.done.set()
+            self._current, self._queued = self._queued, None
+            self._current.started.set()
+        if self._current is not None and self._queued is None and not self._channel.get_busy():
+            self._current.done.set()
+            self._current = None
+
+    def _run(self):
+        try:
+            self._init_mixer()
+        except Exception as e:
+            print(f"[AudioEngine] Could not initialize mixer: {e}")
+            self._channel = None
+        finally:
+            self._ready.set()
+        while True:
+            with self._lock:
+                if self._channel is not None:
+                    self._advance()
+                idle = self._current is None
+                full = self._queued is not None
+            if full:
+                time.sleep(self.tick)
+                continue
+            try:
+                # Block while silent; poll while playing so finished clips are noticed.
+                audio, namehint, handle, generation = self._clips.get(timeout=None if idle else self.tick)
+            except queue.Empty:
+                continue
+            if handle.cancelled:
+                continue
+            if self._channel is None:
+                handle.cancelled = True
+                handle.done.set()
+                continue
+            try:
+                sound = self._decode(audio, namehint)
+            except Exception as e:
+                print(f"[AudioEngine] Could not decode clip: {e}")
+                handle.done.set()
+                continue
+            with self._lock:
+                if handle.cancelled or generation != self._generation:
+                    handle.cancelled = True
+                    handle.done.set()
+                    continue
+                # The current clip may have ended while this one was decoding.
+                self._advance()
+                if self._current is not None and self._channel.get_busy():
+                    self._channel.queue(sound) # Starts without a gap when the current clip ends.
+                    self._queued = handle
+                else:
+                    if self._current is not None:
+                        self._current.done.set()
+                    self._channel.play(sound)
+                    self._current = handle
+                    handle.started.set()
+
+    def play(self, audio: bytes, namehint: str = "mp3") -> Playback:
+        """Queue a clip behind whatever is playing and return its handle."""
+        self.start()
+        handle = Playback()
+        if not audio:
+            handle.done.set()
+            return handle
+        self._clips.put((audio, namehint, handle, self._generation))
+        return handle
+
+    def stop(self):
+        """Interrupt playback and drop every queued clip."""
+        while True:
+            try:
+                _, _, handle, _ = self._clips.get_nowait()
+            except queue.Empty:
+                break
+            handle.cancelled = True
+            handle.done.set()
+        with self._lock:
+            self._generation += 1
+            for handle in (self._current, self._queued):
+                if handle is not None:
+                    handle.cancelled = True
+                    handle.done.set()
+            self._current = self._queued = None
+            if self._channel is not None:
+                self._channel.stop()
+
+    def busy(self) -> bool:
+        with self._lock:
+            return self._current is not None or not self._clips.empty()
+
+    def set_volume(self, volume: float):
+        self.volume = max(0.0, min(1.0, volume))
+        with self._lock:
+            if self._channel is not None and self._ducked is None:
+                self._channel.set_volume(self.volume)
+
+    def duck(self, level: float = 0.3):
+        """Lower the output to `level` of the normal volume (e.g. while the user speaks)."""
+        with self._lock:
+            self._ducked = level
+            if self._channel is not None:
+                self._channel.set_volume(self.volume * level)
+
+    def unduck(self):
+        with self._lock:
+            self._ducked = None
+            if self._channel is not None:
+                self._channel.set_volume(self.volume)
+
+
+# Shared engine used by every speech path.
+Engine = AudioEngine()
@@ -1,9 +1,13 @@
-import pygame # Import pygame library for handling audio playback
 import random # Import random library for generating random choices
 import asyncio # Import asyncio for asynchronous operations
 import edge_tts # Import edge_tts for text-to-speech functionality
 import os # Import os for file path handling
+import re # Import re for sentence splitting of streamed text
+import queue # Import queue to hand sentences and audio between threads
+import threading # Import threading for the streaming synthesis/playback workers
 from dotenv import dotenv_values # Import dotenv_values for loading environment variables from a .env file
+from Backend.TEXT_TO_SPEECH.AudioCache import AudioCache, AudioKey # Import the on-disk cache of synthesized clips
+from Backend.TEXT_TO_SPEECH.AudioEngine import Engine # Import the shared, long-lived audio output engine
 
 # Load environment variables from the .env file.
 env_vars = dotenv_values(".env")
@@ -17,47 +21,34 @@ else:
 # Compute absolute path to the top-level Data directory (sibling of Backend)
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 DATA_DIR = os.path.join(BASE_DIR, "Data")
-DATA_MP3_PATH = os.path.join(DATA_DIR, "speech.mp3")
 
-# Asynchronous function to convert text to an audio.
-async def TextToAudio(text) -> None:
-    file_path = DATA_MP3_PATH # Define the path where the speech file will be saved
-
-    # Ensure the output directory exists
-    try:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    except Exception:
-        pass
+# Voice settings shared by every synthesis call (part of the audio cache key).
+VoicePitch = '+5Hz'
+VoiceRate = '+13%'
 
-    if os.path.exists(file_path): # Check if the file already exists
-        os.remove(file_path) # If it exists, remove it to avoid overwriting errors
-
-    # Create the communicate object to generate speech
-    communicate = edge_tts.Communicate(text, AssistantVoice, pitch='+5Hz', rate='+13%')
-    await communicate.save(DATA_MP3_PATH) # Save the generated speech as MP3 file
+# Synthesized clips are reused across runs; the least recently used are dropped beyond the size limit.
+Cache = AudioCache(
+    os.path.join(DATA_DIR, "TTSCache"),
+    max_bytes=int(float(env_vars.get("TTSCacheSizeMB") or 64) * 1024 * 1024),
+)
 
 # Function to manage Text-to-Speech (TTS) functionality
 def TTS(Text, func=lambda r=None: True):
     while True:
         try:
-            # Convert text to an audio file asynchronously
-            asyncio.run(TextToAudio(Text))
+            # Use the cached clip, or synthesize (and cache) it
+            audio = CachedAudio(Text) or asyncio.run(SynthesizeAudio(Text))
+            if not audio:
+                raise ValueError("No audio was synthesized.")
 
-            # Initialize pygame mixer for audio playback
-            pygame.mixer.init()
+            # Play it on the shared audio engine (mixer stays initialized between utterances)
+            playback = Engine.play(audio)
 
-            # Load the generated speech file into pygame mixer (only if it exists)
-            if os.path.exists(DATA_MP3_PATH):
-                pygame.mixer.music.load(DATA_MP3_PATH)
-            else:
-                raise FileNotFoundError("Generated speech file not found.")
-            pygame.mixer.music.play() # Play the audio
-
-            # Loop until the audio is done playing or the function stops
-            while pygame.mixer.music.get_busy():
+            # Wait until the audio is done playing or the function stops
+            while not playback.wait(0.1):
                 if func() == False: # Check if the external function returns False
+                    Engine.stop()
                     break
-                pygame.time.Clock().tick(10) # Limit the loop to 10 ticks per second
 
             return True # Return True if the audio played successfully
 
@@ -68,48 +59,37 @@ def TTS(Text, func=lambda r=None: True):
             try:
                 # Call the provided function with False to signal the end of TTS
                 func(False)
-                # Only attempt mixer operations if mixer was initialized
-                if pygame.mixer.get_init():
-                    try:
-                        pygame.mixer.music.stop() # Stop the music playback
-                    except Exception:
-                        pass
-                    try:
-                        pygame.mixer.quit() # Quit the pygame mixer to free up resources
-                    except Exception:
-                        pass
-
             except Exception as e: # Handle any exceptions during cleanup
                 print(f"Error in TTS finally block: {e}")
 
+# List of predefined responses for cases where the text is too long
+responses = [
+    "The rest of the result has been printed to the chat screen, kindly check it out sir.",
+    "The rest of the text is now on the chat screen, sir, please check it.",
+    "You can see the rest of the text on the chat screen, sir.",
+    "The remaining part of the text is now on the chat screen, sir.",
+    "Sir, you'll find more text on the chat screen for you to see.",
+    "The rest of the answer is now on the chat screen, sir.",
+    "Sir, please look at the chat screen, the rest of the answer is there.",
+    "You'll find the complete answer on the chat screen, sir.",
+    "The next part of the text is on the chat screen, sir.",
+    "Sir, please check the chat screen for more information.",
+    "There's more text on the chat screen for you, sir.",
+    "Sir, take a look at the chat screen for additional text.",
+    "You'll find more to read on the chat screen, sir.",
+    "Sir, check the chat screen for the rest of the text.",
+    "The chat screen has the rest of the text, sir.",
+    "There's more to see on the chat screen, sir, please look.",
+    "Sir, the chat screen holds the continuation of the text.",
+    "You'll find the complete answer on the chat screen, kindly check it out sir.",
+    "Please review the chat screen for the rest of the text, sir.",
+    "Sir, look at the chat screen for the complete answer."
+]
+
 # Function to manage Text-to-Speech with additional responses for long text
 def TextToSpeech(Text, func=lambda r=None: True):
     Data = str(Text).split(".") # Split the text by periods into a list of sentences
 
-    # List of predefined responses for cases where the text is too long
-    responses = [
-        "The rest of the result has been printed to the chat screen, kindly check it out sir.",
-        "The rest of the text is now on the chat screen, sir, please check it.",
-        "You can see the rest of the text on the chat screen, sir.",
-        "The remaining part of the text is now on the chat screen, sir.",
-        "Sir, you'll find more text on the chat screen for you to see.",
-        "The rest of the answer is now on the chat screen, sir.",
-        "Sir, please look at the chat screen, the rest of the answer is there.",
-        "You'll find the complete answer on the chat screen, sir.",
-        "The next part of the text is on the chat screen, sir.",
-        "Sir, please check the chat screen for more information.",
-        "There's more text on the chat screen for you, sir.",
-        "Sir, take a look at the chat screen for additional text.",
-        "You'll find more to read on the chat screen, sir.",
-        "Sir, check the chat screen for the rest of the text.",
-        "The chat screen has the rest of the text, sir.",
-        "There's more to see on the chat screen, sir, please look.",
-        "Sir, the chat screen holds the continuation of the text.",
-        "You'll find the complete answer on the chat screen, kindly check it out sir.",
-        "Please review the chat screen for the rest of the text, sir.",
-        "Sir, look at the chat screen for the complete answer."
-    ]
-
     # If the text is very long (more than 4 sentences and 250 character), add a response message
     if len(Data) > 4 and len(Text) >= 250:
         TTS(" ".join(Text.split(".")[0:2]) + "." + random.choice(responses), func)
@@ -118,6 +98,229 @@ def TextToSpeech(Text, func=lambda r=None: True):
     else:
         TTS(Text, func)
 
+# Asynchronous function to synthesize text into MP3 bytes kept in memory.
+async def TextToAudioBytes(text) -> bytes:
+    communicate = edge_tts.Communicate(text, AssistantVoice, pitch=VoicePitch, rate=VoiceRate)
+    audio = bytearray()
+    async for chunk in communicate.stream():
+        if chunk["type"] == "audio":
+            audio.extend(chunk["data"])
+    return bytes(audio)
+
+# Return the cached clip for `text` in the current voice, or None.
+def CachedAudio(text):
+    return Cache.get(text, AssistantVoice, VoicePitch, VoiceRate)
+
+# Asynchronous function returning MP3 bytes for `text`, synthesizing only on a cache miss.
+async def SynthesizeAudio(text) -> bytes:
+    audio = CachedAudio(text)
+    if audio is None:
+        audio = await TextToAudioBytes(text)
+        Cache.put(text, AssistantVoice, VoicePitch, VoiceRate, audio)
+    return audio
+
+async def _prewarm(phrases):
+    for phrase in phrases:
+        if AudioKey(phrase, AssistantVoice, VoicePitch, VoiceRate) in Cache:
+            continue
+        try:
+            await SynthesizeAudio(phrase)
+        except Exception as e:
+            print(f"[TTS] Could not pre-warm '{phrase}': {e}")
+            return # Most likely offline; try again next start.
+
+# Synthesize fixed phrases (plus the canned long-answer responses) in the background so they play instantly.
+def PrewarmSpeech(phrases=()):
+    pending = list(dict.fromkeys([*phrases, *responses]))
+    thread = threading.Thread(target=lambda: asyncio.run(_prewarm(pending)), daemon=True)
+    thread.start()
+    return thread
+
+class SpeechQueue:
+    """
+    Speaks short phrases (automation feedback) without blocking the caller.
+    One worker thread synthesizes phrases in the order they were queued and hands
+    them to the shared audio engine, so they never overlap and the caller carries
+    on while they play.
+    """
+
+    def __init__(self):
+        self._phrases    = queue.Queue()
+        self._lock       = threading.Lock()
+        self._thread     = None
+        self._last       = None # Playback handle of the most recently queued phrase
+        self._generation = 0    # Bumped by clear(); phrases queued before that are dropped
+
+    def say(self, text: str):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="speech-queue", daemon=True)
+                self._thread.start()
+            self._phrases.put((str(text), self._generation))
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        while True:
+            text, generation = self._phrases.get()
+            try:
+                audio = CachedAudio(text) or loop.run_until_complete(SynthesizeAudio(text))
+                if generation == self._generation:
+                    self._last = Engine.play(audio)
+            except Exception as e:
+                print(f"Error in TTS queue: {e}")
+            finally:
+                self._phrases.task_done()
+
+    def clear(self):
+        """Drop queued phrases and stop playback."""
+        with self._lock:
+            self._generation += 1
+        Engine.stop()
+
+    def wait(self):
+        """Block until every queued phrase has been played."""
+        self._phrases.join()
+        last = self._last
+        if last is not None:
+            last.wait()
+
+Phrases = SpeechQueue()
+
+# Queue `Text` to be spoken and return immediately.
+def Speak(Text):
+    Phrases.say(Text)
+
+# Sentence boundary: end punctuation followed by whitespace, or a line break.
+_sentence_end = re.compile(r"(?<=[.!?])\s+|\n+")
+
+class SentenceSplitter:
+    """
+    Accumulates streamed text and returns sentences as soon as they are complete.
+    Very short fragments are merged into the next sentence.
+    """
+
+    def __init__(self, min_chars: int = 12):
+        self.min_chars = min_chars
+        self.buffer    = ""
+
+    def feed(self, text: str) -> list[str]:
+        self.buffer += text
+        parts = _sentence_end.split(self.buffer)
+        self.buffer = parts.pop() # The last part may still be incomplete
+        sentences = []
+        pending = ""
+        for part in parts:
+            pending = f"{pending} {part}".strip() if pending else part.strip()
+            if len(pending) >= self.min_chars:
+                sentences.append(pending)
+                pending = ""
+        if pending:
+            self.buffer = f"{pending} {self.buffer}" if self.buffer else pending
+        return sentences
+
+    def flush(self) -> str:
+        rest, self.buffer = self.buffer.strip(), ""
+        return rest
+
+class SpeechStream:
+    """
+    Speaks an answer while it is still being generated.
+    Text fed in is split into sentences; each sentence is synthesized by edge_tts
+    on a worker thread as soon as it is complete and queued on the shared audio
+    engine, which plays the clips back to back while later sentences are still
+    being synthesized. Long answers keep TextToSpeech's behaviour: the first two
+    sentences are spoken, followed by a pointer to the chat screen.
+    """
+
+    SPOKEN_SENTENCES = 2 # Sentences spoken before the long-answer check applies
+
+    def __init__(self, func=lambda r=None: True):
+        self.func      = func
+        self.splitter  = SentenceSplitter()
+        self.text      = ""
+        self.spoken    = 0
+        self.held      = []
+        self._sentences = queue.Queue()
+        self._last      = None # Playback handle of the most recently queued clip
+        self._stopped   = threading.Event()
+        self._synth_thread = threading.Thread(target=self._synthesize_loop, daemon=True)
+        self._watch_thread = threading.Thread(target=self._watch_loop, daemon=True)
+        self._synth_thread.start()
+        self._watch_thread.start()
+
+    def feed(self, text: str):
+        text = str(text).replace("</s>", "")
+        self.text += text
+        for sentence in self.splitter.feed(text):
+            self._submit(sentence)
+
+    def _submit(self, sentence: str):
+        if self.spoken < self.SPOKEN_SENTENCES:
+            self.spoken += 1
+            self._sentences.put(sentence)
+        else:
+            self.held.append(sentence)
+
+    def finish(self, wait: bool = True):
+        """Speak whatever is left and optionally block until playback ends."""
+        rest = self.splitter.flush()
+        if rest:
+            self._submit(rest)
+        Data = self.text.split(".")
+        if len(Data) > 4 and len(self.text) >= 250:
+            self._sentences.put(random.choice(responses))
+        else:
+            for sentence in self.held:
+                self._sentences.put(sentence)
+        self.held = []
+        self._sentences.put(None)
+        if wait:
+            self._watch_thread.join()
+
+    def stop(self):
+        """Abort synthesis and playback."""
+        self._stopped.set()
+        self._sentences.put(None)
+        Engine.stop()
+
+    def _synthesize_loop(self):
+        loop = asyncio.new_event_loop()
+        try:
+            while not self._stopped.is_set():
+                sentence = self._sentences.get()
+                if sentence is None:
+                    break
+                try:
+                    audio = CachedAudio(sentence) or loop.run_until_complete(SynthesizeAudio(sentence))
+                    if not self._stopped.is_set():
+                        self._last = Engine.play(audio)
+                except Exception as e:
+                    print(f"Error in TTS stream synthesis: {e}")
+        finally:
+            loop.close()
+
+    def _watch_loop(self):
+        # Poll the caller's hook until everything queued has been played.
+        try:
+            while not self._stopped.is_set():
+                last = self._last
+                if not self._synth_thread.is_alive() and (last is None or last.done.is_set()):
+                    break
+                if self.func() == False:
+                    self.stop()
+                    break
+                if last is not None:
+                    last.wait(0.1)
+                else:
+                    self._stopped.wait(0.1)
+        except Exception as e:
+            print(f"Error in TTS stream playback: {e}")
+        finally:
+            try:
+                self.func(False)
+            except Exception as e:
+                print(f"Error in TTS stream cleanup: {e}")
+
 # Main execution loop
 if __name__ == "__main__":
     while True:
@@ -1,7 +1,16 @@
 from PyQt5.QtWidgets import QApplication, QMainWindow, QTextEdit, QStackedWidget, QWidget,QLineEdit, QGridLayout, QVBoxLayout, QHBoxLayout, QPushButton, QFrame, QLabel, QSizePolicy, QDialog, QScrollArea, QSpacerItem
 from PyQt5.QtGui import QIcon, QPainter, QColor, QMovie, QTextCharFormat, QFont, QPixmap, QTextBlockFormat
-from PyQt5.QtCore import Qt, QTimer, QSize
+from PyQt5.QtCore import Qt, QTimer, QSize, QObject, pyqtSignal
 from dotenv import dotenv_values
+from Backend.EVENT_BUS.EventBus import (
+    AssistantStatusChannel,
+    MicrophoneChannel,
+    ResponsesChannel,
+    ImageGenerationChannel,
+    FileChannelAdapter,
+)
+from Backend.CHAT_LOG.ChatLogStore import ChatLog
+from Backend.AUTOMATION.LinkIndex import Links, DefaultLinks
 import sys
 import os
 
@@ -39,23 +48,28 @@ def QueryModifier(Query):
 
     return new_query.capitalize()
 
+# Status, mic state and responses live on the in-process state bus
+# (Backend/EVENT_BUS/EventBus.py); only the image generation trigger is
+# mirrored to disk because ImageGeneration.py runs in its own process.
 def SetMicrophoneStatus(Command):
-    with open(rf'{TempDirPath}\Mic.data', "w", encoding="utf-8") as file:
-        file.write(Command)
+    MicrophoneChannel.publish(Command)
 
 def GetMicrophoneStatus():
-    with open(rf'{TempDirPath}\Mic.data', "r", encoding="utf-8") as file:
-        status = file.read()
-    return status
+    return str(MicrophoneChannel.get())
+
+def WaitForMicrophoneStatus(Command, timeout=None):
+    # Block the calling worker thread until the mic reaches the given state.
+    target = str(Command).strip().lower() == "true"
+    return MicrophoneChannel.wait_for(lambda value: value == target, timeout=timeout) is not None
 
 def SetAssistantStatus(Status):
-    with open(rf'{TempDirPath}\Status.data', "w", encoding="utf-8") as file:
-        file.write(Status)
+    AssistantStatusChannel.publish(Status)
 
 def GetAssistantStatus():
-    with open(rf'{TempDirPath}\Status.data', "r", encoding="utf-8") as file:
-        Status = file.read()
-    return Status
+    return AssistantStatusChannel.get()
+
+def SetImageGenerationStatus(Text):
+    ImageGenerationChannel.publish(Text)
 
 def MicButtonInitialed():
     SetMicrophoneStatus("False")
@@ -72,8 +86,32 @@ def TempDirectoryPath(Filename):
     return Path
 
 def ShowTextToScreen(Text):
-    with open(rf'{TempDirPath}\Responses.data', "w", encoding="utf-8") as file:
-        file.write(Text)
+    ResponsesChannel.publish(Text)
+
+ImageGenerationFile = FileChannelAdapter(ImageGenerationChannel, TempDirectoryPath('ImageGeneration.data'))
+
+class StateSignals(QObject):
+    """
+    Re-emits state bus updates as Qt signals so widgets are updated
+    in the GUI thread without polling.
+    """
+    statusChanged   = pyqtSignal(str)
+    responseChanged = pyqtSignal(str)
+    micChanged      = pyqtSignal(bool)
+
+    def __init__(self):
+        super().__init__()
+        AssistantStatusChannel.subscribe(self.statusChanged.emit)
+        ResponsesChannel.subscribe(self.responseChanged.emit)
+        MicrophoneChannel.subscribe(self.micChanged.emit)
+
+_state_signals = None
+
+def StateSignalsInstance():
+    global _state_signals
+    if _state_signals is None:
+        _state_signals = StateSignals()
+    return _state_signals
 
 # ------------- Web Links Persistence Helpers -------------
 def _links_file_path():
@@ -107,6 +145,7 @@ def SaveWebLinks(items: list):
     try:
         with open(path, 'w', encoding='utf-8') as f:
             json.dump(items, f, ensure_ascii=False, indent=2)
+        Links.invalidate() # Let OpenApp pick up the edited links immediately.
         return True
     except Exception:
         return False
@@ -119,41 +158,14 @@ def ResourcePath(filename: str) -> str:
     gfx_path = os.path.join(GraphicsDirPath, filename)
     return gfx_path
 
-# Seed Data/WebLinks.json by parsing Backend/AUTOMATION/Automation.py website_keywords
+# Seed Data/WebLinks.json with the built-in site names from Backend/AUTOMATION/LinkIndex.py
 def SeedLinksFromAutomationIfEmpty():
     items = LoadWebLinks()
     if items:
         return False
-    try:
-        auto_path = os.path.join(current_dir, 'Backend', 'AUTOMATION', 'Automation.py')
-        if not os.path.exists(auto_path):
-            return False
-        with open(auto_path, 'r', encoding='utf-8') as f:
-            src = f.read()
-        # Locate the website_keywords dict block
-        start = src.find('website_keywords = {')
-        if start == -1:
-            return False
-        end = src.find('\n    }', start)
-        if end == -1:
-            end = src.find('\n}', start)
-        block = src[start:end]
-        # Extract 'key': 'url' pairs with simple parsing
-        import re as _re
-        pairs = _re.findall(r"['\"]([^'\"]+)['\"]\s*:\s*['\"](https?://[^'\"]+)['\"]", block)
-        seen = set()
-        result = []
-        for k, u in pairs:
-            k_low = k.strip().lower()
-            if '.' in k_low or k_low in seen:
-                continue
-            seen.add(k_low)
-            result.append({'name': k_low, 'url': u})
-        if result:
-            SaveWebLinks(result)
-            return True
-    except Exception:
-        return False
+    result = DefaultLinks()
+    if result:
+        return SaveWebLinks(result)
     return False
 
 class ChatSection(QWidget):
@@ -215,24 +227,13 @@ class ChatSection(QWidget):
         self.chat_text_edit.setFont(font)
         # One-time previous chat history load flag
         self._history_loaded = False
-        # Ensure temp files exist to avoid first-run errors
-        try:
-            os.makedirs(TempDirPath, exist_ok=True)
-            resp_path = TempDirectoryPath('Responses.data')
-            if not os.path.exists(resp_path):
-                with open(resp_path, 'w', encoding='utf-8') as f:
-                    f.write("")
-            status_path = TempDirectoryPath('Status.data')
-            if not os.path.exists(status_path):
-                with open(status_path, 'w', encoding='utf-8') as f:
-                    f.write("")
-        except Exception:
-            pass
 
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.loadMessages)
-        self.timer.timeout.connect(self.SpeechRecogText)
-        self.timer.start(5)
+        # Update from state bus signals instead of polling files on a timer
+        signals = StateSignalsInstance()
+        signals.responseChanged.connect(self.loadMessages)
+        signals.statusChanged.connect(self.SpeechRecogText)
+        QTimer.singleShot(0, self.loadMessages)
+        self.SpeechRecogText(GetAssistantStatus())
         self.chat_text_edit.viewport().installEventFilter(self)
         self.setStyleSheet("""
                 QScrollBar:vertical{
@@ -272,7 +273,7 @@ class ChatSection(QWidget):
                 }
         """)
 
-    def loadMessages(self):
+    def loadMessages(self, messages=None):
 
         global old_chat_message
 
@@ -280,54 +281,44 @@ class ChatSection(QWidget):
         if not self._history_loaded:
             self._history_loaded = True
             try:
-                data_dir = os.path.join(current_dir, 'Data')
-                chatlog_path = os.path.join(data_dir, 'ChatLog.json')
-                if os.path.exists(chatlog_path):
-                    import json
-                    with open(chatlog_path, 'r', encoding='utf-8') as jf:
-                        logs = json.load(jf)
-                        # Render previous messages
-                        for item in logs:
-                            role = str(item.get('role', '')).lower().strip()
-                            content = str(item.get('content', '')).strip()
-                            if not content:
-                                continue
-                            # Color per role (user: cyan, assistant: white)
-                            if role == 'user':
-                                self.addMessage(message=f"You: {content}", color='Cyan')
-                            elif role == 'assistant':
-                                self.addMessage(message=f"{Assistantname or 'Assistant'}: {AnswerModifier(content)}", color='White')
-                            else:
-                                self.addMessage(message=content, color='White')
-                        # Set old_chat_message to the last line in Responses to avoid immediate duplicate append
-                        try:
-                            with open(TempDirectoryPath('Responses.data'), 'r', encoding='utf-8') as rf:
-                                old_chat_message = rf.read()
-                        except Exception:
-                            pass
+                # Render previous messages
+                for item in ChatLog.messages():
+                    role = str(item.get('role', '')).lower().strip()
+                    content = str(item.get('content', '')).strip()
+                    if not content:
+                        continue
+                    # Color per role (user: cyan, assistant: white)
+                    if role == 'user':
+                        self.addMessage(message=f"You: {content}", color='Cyan')
+                    elif role == 'assistant':
+                        self.addMessage(message=f"{Assistantname or 'Assistant'}: {AnswerModifier(content)}", color='White')
+                    else:
+                        self.addMessage(message=content, color='White')
+                # Set old_chat_message to the current response to avoid immediate duplicate append
+                old_chat_message = ResponsesChannel.get()
             except Exception:
                 pass
 
-        with open(TempDirectoryPath('Responses.data'), "r", encoding='utf-8') as file:
-            messages = file.read()
+        if messages is None:
+            messages = ResponsesChannel.get()
 
-            if None==messages:
-                pass
+        if None==messages:
+            pass
 
-            elif len(messages)<=1:
-                pass
-            
-            elif str(old_chat_message)==str(messages):
-                pass
+        elif len(messages)<=1:
+            pass
 
-            else:
-                self.addMessage(message=messages, color='White')
-                old_chat_message = messages
+        elif str(old_chat_message)==str(messages):
+            pass
 
-    def SpeechRecogText(self):
-        with open(TempDirectoryPath('Status.data'), "r", encoding='utf-8') as file:
-            messages = file.read()
-            self.label.setText(messages)
+        else:
+            self.addMessage(message=messages, color='White')
+            old_chat_message = messages
+
+    def SpeechRecogText(self, messages=None):
+        if messages is None:
+            messages = GetAssistantStatus()
+        self.label.setText(messages)
 
     def load_icon(self, path, width=60, height=60):
         pixmap = QPixmap(path)
@@ -410,19 +401,18 @@ class InitialScreen(QWidget):
             self.setFixedHeight(screen_height)
             self.setFixedWidth(screen_width)
             self.setStyleSheet("background-color: black;")
-            self.timer = QTimer(self)
-            self.timer.timeout.connect(self.SpeechRecogText)
-            self.timer.start(5)
+            StateSignalsInstance().statusChanged.connect(self.SpeechRecogText)
+            self.SpeechRecogText(GetAssistantStatus())
 
         def openWebLinksPopover(self):
             dlg = WebLinksManagerDialog(self)
             dlg.setAttribute(Qt.WA_DeleteOnClose, True)
             dlg.exec_()
 
-        def SpeechRecogText(self):
-            with open(TempDirectoryPath('Status.data'), "r", encoding='utf-8') as file:
-                messages = file.read()
-                self.label.setText(messages)
+        def SpeechRecogText(self, messages=None):
+            if messages is None:
+                messages = GetAssistantStatus()
+            self.label.setText(messages)
 
         def load_icon(self, path, width=60, height=60):
             pixmap = QPixmap(path)
@@ -8,13 +8,21 @@ SetMicrophoneStatus,
 AnswerModifier,
 QueryModifier,
 GetMicrophoneStatus,
-GetAssistantStatus )
+GetAssistantStatus,
+WaitForMicrophoneStatus,
+SetImageGenerationStatus )
 from Backend.MODEL.Model import FirstLayerDMM
 from Backend.REAL_TIME_SEARCH_ENGINE.RealTimeSearchEngine import RealTimeSearchEngine
-from Backend.AUTOMATION.Automation import Automation
-from Backend.SPEECH_TO_TEXT.SpeechToText import SpeechRecognition
+from Backend.AUTOMATION.Automation import Automation, SpokenPhrases
+from Backend.SPEECH_TO_TEXT.SpeechBackend import SelectSpeechBackend
+from Backend.SPEECH_TO_TEXT.Translator import TranslateAsync, NeedsTranslation, TranslateMode, TranslateTimeout
 from Backend.CHATBOT.Chatbot import ChatBot as Chatbot
-from Backend.TEXT_TO_SPEECH.TextToSpeech import TextToSpeech
+from Backend.TEXT_TO_SPEECH.TextToSpeech import TextToSpeech, SpeechStream, PrewarmSpeech
+from Backend.TEXT_TO_SPEECH.AudioEngine import Engine
+from Backend.CHAT_LOG.ChatLogStore import ChatLog
+from Backend.CLIENTS.ClientRegistry import WarmUp
+from Backend.PIPELINE.Cancellation import Turns, Cancelled
+from Backend.EVENT_BUS.EventBus import MicrophoneChannel
 from dotenv import dotenv_values, load_dotenv
 from asyncio import run
 from time import sleep
@@ -32,6 +40,8 @@ Assistantname = env_vars.get("Assistantname")
 DefaultMessage = f'''{Username} : Hello {Assistantname}, How are you?
 {Assistantname} : Welcome {Username}. I am doing well. How may I help you?'''
 subprocesses = []
+# Speech recognizer chosen by the SpeechBackend .env setting (Chrome Web Speech API or offline Vosk).
+Recognizer = SelectSpeechBackend()
 Functions = [
     # Core app actions
     "open", "close", "play", "system", "content",
@@ -45,21 +55,15 @@ Functions = [
 ]
 
 def ShowDefaultChatIfNoChats():
-    File = open(r'Data\ChatLog.json', "r", encoding='utf-8')
-    if len(File.read())<5:
+    if len(ChatLog) == 0:
         with open(TempDirectoryPath('Database.data'), "w", encoding='utf-8') as file:
             file.write("")
 
         with open(TempDirectoryPath('Response.data'), "w", encoding='utf-8') as file:
             file.write(DefaultMessage)
 
-def ReadChatLogJson():
-    with open(r'Data\ChatLog.json', "r", encoding='utf-8') as file:
-        chatlog_data = json.load(file)
-    return chatlog_data
-
 def ChatLogIntegration():
-    json_data = ReadChatLogJson()
+    json_data = ChatLog.messages()
     formatted_chatlog = ""
     for entry in json_data:
         if entry['role'] == 'user':
@@ -84,36 +88,96 @@ def ShowChatsOnGUI():
         File.close()
 
 def InitialExecution():
+    WarmUp() # Open API connections in the background so the first turn skips the handshakes.
+    PrewarmSpeech(SpokenPhrases) # Synthesize fixed phrases in the background so they play instantly.
+    Recognizer.start() # Start the speech engine in the background while the GUI comes up.
     SetMicrophoneStatus("False")
     ShowTextToScreen("")
     ShowDefaultChatIfNoChats()
     ChatLogIntegration()
     ShowChatsOnGUI()
 
-InitialExecution()
-
-def MainExecution():
+def AnswerAndSpeak(Function, Query, Turn, **kwargs):
+    # Speak the answer sentence by sentence while it is still being generated.
+    Speech = SpeechStream(func=lambda r=None: not Turn.cancelled)
+    Unregister = Turn.on_cancel(Speech.stop) # Silence speech the moment the turn is cancelled.
+    try:
+        Answer = Function(Query, on_token=Speech.feed, cancel=Turn, **kwargs)
+        ShowTextToScreen(f"{Assistantname} :  {Answer}")
+        SetAssistantStatus("Answering...")
+        Speech.finish()
+    except Exception:
+        Speech.stop()
+        raise
+    finally:
+        Unregister()
+    return Answer
+
+# Point a decision made on the spoken text at its English translation.
+# A lone general/realtime decision keeps its type and takes the translated query;
+# anything else is classified again on the translation (a repeat is a cache hit).
+def ApplyTranslation(Decision, Spoken, Translated):
+    if " ".join(Translated.lower().split()) == " ".join(Spoken.lower().split()):
+        return Decision
+    if not any(i.startswith(("general", "realtime")) for i in Decision):
+        return Decision
+    if len(Decision) == 1:
+        return [f"{Decision[0].split()[0]} {Translated.rstrip('.?!').lower()}"]
+    return FirstLayerDMM(Translated)
+
+def ExecuteTurn(Turn):
 
         TaskExecution = False
         ImageExecution = False
         ImageGenerationQuery = ""
 
+        # The first time the mic is enabled, wait for the speech engine started at launch.
+        if not Recognizer.ready():
+            SetAssistantStatus("Starting speech engine...")
+            try:
+                Turn.wait_future(Recognizer.start())
+            except Cancelled:
+                raise
+            except Exception as e:
+                raise RuntimeError(f"Speech engine failed to start: {e}") from e
+
         SetAssistantStatus("Listening...")
-        Query = SpeechRecognition()
+        # Show interim transcripts in the status line while the user is still speaking.
+        Engine.duck() # Keep any speech still playing from drowning out the user.
+        try:
+            Query = Recognizer.recognize(cancel=Turn, on_partial=lambda Text: SetAssistantStatus(f"Listening... {Text}"))
+        finally:
+            Engine.unduck()
         ShowTextToScreen(f"{Username} :  {Query}")
         SetAssistantStatus("Processing...")
+        # In parallel translation mode, translate while the decision model classifies the spoken text.
+        Translation = TranslateAsync(Query) if NeedsTranslation() and TranslateMode == "parallel" else None
         Decision = FirstLayerDMM(Query)
+        Turn.raise_if_cancelled()
+        if Translation is not None:
+            try:
+                Translated = QueryModifier(Translation.result(TranslateTimeout))
+                Decision = ApplyTranslation(Decision, Query, Translated)
+                Turn.raise_if_cancelled()
+                Query = Translated
+                ShowTextToScreen(f"{Username} :  {Query}")
+            except Cancelled:
+                raise
+            except Exception as e:
+                print(f"Translation skipped: {e}")
 
         print("")
         print(f"Decision: {Decision}")
         print("")
 
-        G = any([i for i in Functions if i.startswith("general")])
-        R = any([i for i in Functions if i.startswith("realtime")])
+        G = any([i for i in Decision if i.startswith("general")])
+        R = any([i for i in Decision if i.startswith("realtime")])
 
         Merged_query = " and ".join(
             [" ".join(i.split()[1:]) for i in Decision if i.startswith("general") or i.startswith("realtime")]
         )
+        # Each realtime part of a merged query is searched on its own, concurrently.
+        SearchQueries = [" ".join(i.split()[1:]) for i in Decision if i.startswith("realtime")]
 
         for queries in Decision:
             if "generate " in queries:
@@ -128,8 +192,7 @@ def MainExecution():
 
         if ImageExecution == True:
 
-                with open(r"Frontend\Files\ImageGeneration.data", "w") as file:
-                    file.write(f"{ImageGenerationQuery},True")
+                SetImageGenerationStatus(f"{ImageGenerationQuery},True")
 
                 try:
                     p1 = subprocesses.Popen(['python', r'Backend\IMAGE_GENERATION\ImageGeneration.py'],
@@ -143,10 +206,7 @@ def MainExecution():
         if G and R or R:
 
                 SetAssistantStatus("Searching...")
-                Answer = RealTimeSearchEngine(QueryModifier(Merged_query))
-                ShowTextToScreen(f"{Assistantname} :  {Answer}")
-                SetAssistantStatus("Answering...")
-                TextToSpeech(Answer)
+                AnswerAndSpeak(RealTimeSearchEngine, QueryModifier(Merged_query), Turn, sub_queries=SearchQueries)
                 return True
         
         else:
@@ -155,19 +215,13 @@ def MainExecution():
                 if "general" in Queries:
                     SetAssistantStatus("Thinking...")
                     QueryFinal = Queries.replace("general", "")
-                    Answer = Chatbot(QueryModifier(QueryFinal))
-                    ShowTextToScreen(f"{Assistantname} :  {Answer}")
-                    SetAssistantStatus("Answering...")
-                    TextToSpeech(Answer)
+                    AnswerAndSpeak(Chatbot, QueryModifier(QueryFinal), Turn)
                     return True
                 
                 elif "realtime" in Queries:
                     SetAssistantStatus("Searching...")
                     QueryFinal = Queries.replace("realtime", "")
-                    Answer = RealTimeSearchEngine(QueryModifier(QueryFinal))
-                    ShowTextToScreen(f"{Assistantname} :  {Answer}")
-                    SetAssistantStatus("Answering...")
-                    TextToSpeech(Answer)
+                    AnswerAndSpeak(RealTimeSearchEngine, QueryModifier(QueryFinal), Turn)
                     return True
                 
                 elif "exit" in Queries:
@@ -175,10 +229,27 @@ def MainExecution():
                     Answer = Chatbot(QueryModifier(QueryFinal))
                     ShowTextToScreen(f"{Assistantname} :  {Answer}")
                     SetAssistantStatus("Answering...")
-                    TextToSpeech(Answer)
+                    TextToSpeech(Answer, func=lambda r=None: not Turn.cancelled)
                     SetAssistantStatus("Answering...")
                     os._exit(1)
 
+def MainExecution():
+    # Run one listen -> decide -> answer -> speak turn that can be cancelled from the GUI.
+    Turn = Turns.begin()
+    try:
+        return ExecuteTurn(Turn)
+    except Cancelled as e:
+        print(f"[Cancel] Turn stopped: {e}")
+        return False
+    except Exception as e:
+        # Keep the worker alive: report the error and switch the mic off; turning it on again retries.
+        print(f"[Turn] Failed: {e}")
+        SetMicrophoneStatus("False")
+        SetAssistantStatus(f"Error: {str(e).splitlines()[0] if str(e) else type(e).__name__}")
+        return False
+    finally:
+        Turns.end(Turn)
+
 def FirstThread():
 
         while True:
@@ -191,17 +262,22 @@ def FirstThread():
                 else:
                      AIStatus = GetAssistantStatus()
 
-                     if "Available..." in AIStatus:
-                          sleep(1)
-
-                     else:
+                     # A failed turn's error stays on the status line until the mic is turned on again.
+                     if "Available..." not in AIStatus and not AIStatus.startswith("Error:"):
                          SetAssistantStatus("Available...")
 
+                     # Sleep until the mic is switched on instead of polling.
+                     WaitForMicrophoneStatus("True")
+
 def SecondThread():
      
         GraphicalUserInterface()
 
+# Start-up runs only in the launched process: OCR worker processes re-import this module.
 if __name__ == "__main__":
+     InitialExecution()
+     # Toggling the mic cancels the turn in progress: listening, the answer stream, searches and speech.
+     MicrophoneChannel.subscribe(lambda value: Turns.cancel("microphone toggled"))
      thread2 = threading.Thread(target=FirstThread, daemon=True)
      thread2.start()
      SecondThread()